@@ -0,0 +1,280 @@
+"""Async JSON API over every asset type and the change log.
+
+``GET api/<resource>/`` lists rows and ``GET api/<resource>/<pk>/`` returns
+one, where ``resource`` is an asset type (``server``, ``enduserdevice``,
+``networkdevice``, ``iotdevice``) or ``changelog``. Both take
+``fields=a,b,c``, which becomes the column list of the SELECT. Lists also
+take column filters such as ``status=ACTIVE``, ``environment__in=PROD,DR``
+or ``changed_at__gte=2026-01-01``. They are paged on the primary key with
+``limit`` and ``after=<next>``.
+
+Lists stream: rows come off a server-side cursor in chunks, and each chunk is
+encoded with a single C-accelerated ``json.dumps`` call once UUIDs, dates and
+decimals have been converted per column. Memory stays bounded for the
+largest ``limit``.
+
+``POST api/batch/`` resolves up to ``MAX_BATCH`` ids and asset tags of any
+asset type at once, with one ``IN`` query per asset type.
+"""
+import json
+import uuid
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_POST
+from asgiref.sync import sync_to_async
+
+from asset.export import aiter_chunks, parse_fields, resolve_fields
+from asset.models import ASSET_MODELS, AssetChangeLog
+
+API_MODELS = {**ASSET_MODELS, 'changelog': AssetChangeLog}
+FILTER_LOOKUPS = ('exact', 'in', 'gt', 'gte', 'lt', 'lte', 'isnull', 'icontains', 'istartswith')
+RESERVED_PARAMS = frozenset({'fields', 'limit', 'after'})
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 100_000
+CHUNK_SIZE = 2000
+MAX_BATCH = 5000
+
+# Column types the stdlib encoder cannot handle, converted the way DjangoJSONEncoder does.
+CONVERTED_TYPES = frozenset({'UUIDField', 'DateTimeField', 'DateField', 'TimeField', 'DecimalField', 'DurationField'})
+
+_encoder = DjangoJSONEncoder()
+
+
+def get_model(resource):
+    model = API_MODELS.get(resource)
+    if model is None:
+        raise Http404(f"Unknown resource '{resource}'.")
+    return model
+
+
+def _value_field(field):
+    """The field that determines how ``field``'s column values look."""
+    if field.is_relation:
+        return field.target_field
+    if field.generated:
+        return field.output_field
+    return field
+
+
+def to_python(field, value):
+    """Convert a query string ``value`` for ``field``; raises ``ValueError`` when invalid."""
+    try:
+        return _value_field(field).to_python(value)
+    except ValidationError:
+        raise ValueError(f"Invalid value '{value}' for {field.name}.")
+
+
+def parse_filters(model, params):
+    """Map of ORM lookups to values from the non-reserved query parameters.
+
+    Raises ``ValueError`` for unknown columns, unsupported lookups and
+    invalid values.
+    """
+    columns = {field.name: field for field in model._meta.concrete_fields}
+    filters = {}
+    for key, value in params.items():
+        if key in RESERVED_PARAMS:
+            continue
+        name, _, lookup = key.partition('__')
+        lookup = lookup or 'exact'
+        field = columns.get(name)
+        if field is None or lookup not in FILTER_LOOKUPS:
+            raise ValueError(f"Unsupported filter '{key}'.")
+        if field.get_internal_type() == 'JSONField' and lookup != 'isnull':
+            raise ValueError(f"JSON column '{name}' only supports __isnull.")
+        if lookup == 'in':
+            value = [to_python(field, item) for item in value.split(',')]
+        elif lookup == 'isnull':
+            value = value.lower() in ('1', 'true', 'yes')
+        elif lookup not in ('icontains', 'istartswith'):
+            value = to_python(field, value)
+        filters[f'{name}__{lookup}'] = value
+    return filters
+
+
+def parse_limit(value):
+    limit = int(value) if value else DEFAULT_LIMIT
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}.")
+    return limit
+
+
+class RowEncoder:
+    """Encodes value tuples of ``fields`` as JSON objects."""
+
+    def __init__(self, model, fields):
+        self.fields = fields
+        self.converted = [
+            index for index, name in enumerate(fields)
+            if _value_field(model._meta.get_field(name)).get_internal_type() in CONVERTED_TYPES
+        ]
+
+    def as_dict(self, row):
+        if self.converted:
+            row = list(row)
+            for index in self.converted:
+                if row[index] is not None:
+                    row[index] = _encoder.default(row[index])
+        return dict(zip(self.fields, row))
+
+    def encode(self, rows):
+        """Comma-separated JSON objects for ``rows``, without the enclosing brackets."""
+        return json.dumps([self.as_dict(row) for row in rows], separators=(',', ':'))[1:-1]
+
+
+def iter_list(queryset, fields, limit, chunk_size=CHUNK_SIZE):
+    """Yield ``{"results": [...], "count": n, "next": pk}`` in chunks, ordered by primary key.
+
+    ``next`` is the ``after=`` value of the following page, or null on the last one.
+    """
+    model = queryset.model
+    pk_name = model._meta.pk.name
+    columns = fields if pk_name in fields else [*fields, pk_name]
+    pk_index = columns.index(pk_name)
+    rows = queryset.order_by('pk').values_list(*columns)[:limit + 1]
+    encoder = RowEncoder(model, fields)
+    width = len(fields)
+
+    yield '{"results":['
+    batch, count, last_pk, more, separator = [], 0, None, False, ''
+    for row in rows.iterator(chunk_size=chunk_size):
+        if count == limit:
+            more = True
+            break
+        count += 1
+        last_pk = row[pk_index]
+        batch.append(row[:width])
+        if len(batch) >= chunk_size:
+            yield separator + encoder.encode(batch)
+            batch, separator = [], ','
+    if batch:
+        yield separator + encoder.encode(batch)
+    next_pk = None
+    if more:
+        next_pk = last_pk if isinstance(last_pk, int) else str(last_pk)
+    yield f'],"count":{count},"next":{json.dumps(next_pk)}}}'
+
+
+@login_required
+async def api_list(request, resource):
+    """Rows of ``resource`` matching the column filters, streamed as JSON."""
+    model = get_model(resource)
+    try:
+        fields = resolve_fields(model, parse_fields(request.GET.get('fields')))
+        filters = parse_filters(model, request.GET)
+        limit = parse_limit(request.GET.get('limit'))
+        queryset = model.objects.filter(**filters)
+        if request.GET.get('after'):
+            queryset = queryset.filter(pk__gt=to_python(model._meta.pk, request.GET['after']))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return StreamingHttpResponse(aiter_chunks(iter_list(queryset, fields, limit)), content_type='application/json')
+
+
+@login_required
+async def api_detail(request, resource, pk):
+    """One row of ``resource`` by primary key."""
+    model = get_model(resource)
+    try:
+        pk = to_python(model._meta.pk, pk)
+    except ValueError:
+        raise Http404(f"No {resource} with id {pk}.")
+    try:
+        fields = resolve_fields(model, parse_fields(request.GET.get('fields')))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    row = await model.objects.filter(pk=pk).values_list(*fields).afirst()
+    if row is None:
+        raise Http404(f"No {resource} with id {pk}.")
+    return JsonResponse(RowEncoder(model, fields).as_dict(row))
+
+
+def batch_fields(models, fields=None):
+    """Columns to fetch per model: ``fields`` where a model has them, else every column.
+
+    Raises ``ValueError`` for names that are a column of none of ``models``.
+    """
+    available = {model: resolve_fields(model) for model in models}
+    if not fields:
+        return available
+    unknown = [name for name in fields if not any(name in names for names in available.values())]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return {model: [name for name in names if name in fields] for model, names in available.items()}
+
+
+def fetch_batch(ids=(), asset_tags=(), asset_types=None, fields=None):
+    """Resolve assets by id or asset tag across asset types with one ``IN`` query per type.
+
+    Returns ``(results, missing_ids, missing_tags)``; ``results`` follows the
+    order of ``ids`` then ``asset_tags``, each asset listed once. Ids that are
+    not UUIDs are reported missing.
+    """
+    valid_ids = {}
+    for value in ids:
+        try:
+            valid_ids[str(value)] = uuid.UUID(str(value))
+        except ValueError:
+            continue
+    models = [ASSET_MODELS[name] for name in asset_types or ASSET_MODELS]
+    by_id, by_tag = {}, {}
+    for model, columns in batch_fields(models, fields).items():
+        columns = list(dict.fromkeys(['id', 'asset_tag', *columns]))
+        encoder = RowEncoder(model, columns)
+        rows = model.objects.filter(Q(pk__in=set(valid_ids.values())) | Q(asset_tag__in=set(asset_tags)))
+        for row in rows.values_list(*columns):
+            result = {'asset_type': model._meta.model_name, **encoder.as_dict(row)}
+            if fields and 'asset_tag' not in fields:
+                del result['asset_tag']
+            by_id[row[0]] = by_tag[row[1]] = result
+
+    results, listed, missing_ids, missing_tags = [], set(), [], []
+    for value in ids:
+        result = by_id.get(valid_ids.get(str(value)))
+        if result is None:
+            missing_ids.append(value)
+        elif id(result) not in listed:
+            listed.add(id(result))
+            results.append(result)
+    for tag in asset_tags:
+        result = by_tag.get(tag)
+        if result is None:
+            missing_tags.append(tag)
+        elif id(result) not in listed:
+            listed.add(id(result))
+            results.append(result)
+    return results, missing_ids, missing_tags
+
+
+@login_required
+@require_POST
+async def api_batch(request):
+    """Fetch many assets at once: ``{"ids": [...], "asset_tags": [...], "types": [...], "fields": [...]}``."""
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest("Request body must be JSON.")
+    if not isinstance(payload, dict):
+        return HttpResponseBadRequest("Expected a JSON object.")
+    ids, asset_tags = payload.get('ids') or [], payload.get('asset_tags') or []
+    asset_types, fields = payload.get('types') or None, payload.get('fields') or None
+    if not all(isinstance(value, list) for value in (ids, asset_tags, asset_types or [], fields or [])):
+        return HttpResponseBadRequest("ids, asset_tags, types and fields must be lists.")
+    if not all(isinstance(name, str) for name in (*(asset_types or ()), *(fields or ()))):
+        return HttpResponseBadRequest("types and fields must be lists of names.")
+    if len(ids) + len(asset_tags) > MAX_BATCH:
+        return HttpResponseBadRequest(f"At most {MAX_BATCH} ids and asset tags per request.")
+    unknown = [name for name in asset_types or () if name not in ASSET_MODELS]
+    if unknown:
+        return HttpResponseBadRequest(f"Unknown asset type(s): {', '.join(unknown)}")
+    try:
+        results, missing_ids, missing_tags = await sync_to_async(fetch_batch)(
+            [str(value) for value in ids], [str(value) for value in asset_tags], asset_types, fields,
+        )
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse({'results': results, 'missing': {'ids': missing_ids, 'asset_tags': missing_tags}})
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AssetConfig(AppConfig):
     name = 'asset'
+
+    def ready(self):
+        from asset.signals import connect_signals
+        connect_signals()
@@ -0,0 +1,119 @@
+"""In-process buffering of writes that can be batched off the request path.
+
+A :class:`BackgroundBatcher` collects items from any thread and hands them to
+a flush callback in batches, from a daemon thread, either when ``max_size``
+items are waiting or every ``interval`` seconds. A failed flush puts its
+items back so the next flush retries them; they are only dropped, with the
+error logged, after ``retries`` failures in a row. Whatever is still buffered
+is flushed at interpreter exit. A :class:`CoalescingBatcher` keeps only one
+item per key, merging repeats as they arrive.
+"""
+import atexit
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundBatcher:
+    def __init__(self, flush_callback, *, max_size=500, interval=1.0, retries=3, name='batcher'):
+        self.flush_callback = flush_callback
+        self.max_size = max_size
+        self.interval = interval
+        self.retries = retries
+        self.name = name
+        self._failures = 0
+        self._items = self._new_buffer()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _new_buffer(self):
+        return []
+
+    def _merge(self, buffer, items):
+        buffer.extend(items)
+
+    def _drain(self, buffer):
+        return buffer
+
+    def add(self, item):
+        self.extend([item])
+
+    def extend(self, items):
+        with self._lock:
+            self._merge(self._items, items)
+            pending = len(self._items)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        if pending >= self.max_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+    def flush(self):
+        """Hand every buffered item to the flush callback; returns how many were flushed."""
+        with self._flush_lock:
+            with self._lock:
+                items, self._items = self._drain(self._items), self._new_buffer()
+            if not items:
+                return 0
+            try:
+                self.flush_callback(items)
+            except Exception:
+                self._failures += 1
+                if self._failures > self.retries:
+                    self._failures = 0
+                    logger.exception("%s: dropped %d buffered items after %d failed flushes",
+                                     self.name, len(items), self.retries + 1)
+                    return 0
+                logger.warning("%s: flush of %d items failed; retrying with the next flush",
+                               self.name, len(items), exc_info=True)
+                with self._lock:
+                    self._merge(self._items, items)
+                return 0
+            self._failures = 0
+            return len(items)
+
+
+class CoalescingBatcher(BackgroundBatcher):
+    """A batcher holding one item per ``key(item)``.
+
+    A repeated key replaces the buffered item with ``combine(old, new)``, so
+    memory and flush size grow with the number of distinct keys only.
+    ``merged`` counts the items absorbed that way.
+    """
+
+    def __init__(self, flush_callback, *, key, combine, **kwargs):
+        self.key = key
+        self.combine = combine
+        self.merged = 0
+        super().__init__(flush_callback, **kwargs)
+
+    def _new_buffer(self):
+        return {}
+
+    def _merge(self, buffer, items):
+        for item in items:
+            key = self.key(item)
+            if key in buffer:
+                buffer[key] = self.combine(buffer[key], item)
+                self.merged += 1
+            else:
+                buffer[key] = item
+
+    def _drain(self, buffer):
+        return list(buffer.values())
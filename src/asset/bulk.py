@@ -0,0 +1,174 @@
+"""Set-based bulk updates and deletes of assets.
+
+Assets are selected by id list and/or column filters. The whole operation
+runs in one transaction with a handful of statements per chunk of
+``CHUNK_SIZE`` rows:
+
+- one ``SELECT`` of the old values;
+- one ``UPDATE`` or ``DELETE`` per chunk;
+- the change-log entries, written in bulk.
+
+``save()``, ``delete()`` and the per-row signals are bypassed, so the
+derived tables the signals maintain are refreshed here in bulk: lookup and
+search rows, capacity rollups and the table's change counter.
+``dry_run=True`` only counts the selected rows.
+"""
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connections, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from asset import capacity, changelog, lookup, search, versions
+from asset.models import Server
+
+# Fields a bulk update may set.
+BULK_FIELDS = (
+    'status', 'environment', 'owner',
+    'physical_location', 'building', 'floor', 'room', 'rack_location', 'rack_unit', 'geographic_location', 'site',
+)
+CHUNK_SIZE = 2000
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def select(model, ids=None, filters=None):
+    """Assets of ``model`` with a pk in ``ids`` and matching the ORM ``filters``.
+
+    Raises ``ValueError`` when neither is given, so a bulk change can never
+    hit a whole table by accident.
+    """
+    if ids is None and not filters:
+        raise ValueError("Select assets with 'ids' or 'filters'.")
+    queryset = model.objects.filter(**(filters or {}))
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    return queryset
+
+
+def clean_changes(model, changes):
+    """Validate ``changes`` and map them to attnames; raises ``ValueError``."""
+    unknown = [name for name in changes if name not in BULK_FIELDS]
+    if unknown or not changes:
+        raise ValueError(f"Changes must set some of: {', '.join(BULK_FIELDS)}")
+    cleaned = {}
+    for name, value in changes.items():
+        field = model._meta.get_field(name)
+        if value == '' and field.null:
+            value = None
+        try:
+            if field.is_relation:
+                # Coerced like the stored ids, so "3" and 3 compare equal when diffing.
+                value = field.target_field.to_python(value)
+            else:
+                value = field.clean(value, None)
+        except ValidationError as exc:
+            raise ValueError(f"{name}: {' '.join(exc.messages)}")
+        if field.is_relation and value is not None and not User.objects.filter(pk=value).exists():
+            raise ValueError(f"No user with id {value} for {name}.")
+        cleaned[field.attname] = value
+    return cleaned
+
+
+def bulk_update(queryset, changes, dry_run=False, notes=None):
+    """Apply ``changes`` (field name -> value) to every asset in ``queryset``.
+
+    Returns ``{'matched': n, 'updated': n, 'dry_run': bool}``; rows already
+    holding the new values are matched but not updated or logged.
+    """
+    model = queryset.model
+    changes = clean_changes(model, changes)
+    if dry_run:
+        return {'matched': queryset.count(), 'updated': 0, 'dry_run': True}
+
+    asset_type = model._meta.model_name
+    context = changelog.request_context()
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().order_by('pk').values('id', 'name', *changes))
+        entries, ids = [], []
+        for row in rows:
+            diff = {name: (row[name], value) for name, value in changes.items() if row[name] != value}
+            if diff:
+                ids.append(row['id'])
+                entries.append(changelog.build_entry(asset_type, row['id'], row['name'], changelog.UPDATED,
+                                                     changelog.field_diff(diff), context, notes))
+
+        deltas = capacity.RollupDeltas()
+        tracks_capacity = model is Server and any(name in capacity.TRACKED_FIELDS for name in changes)
+        values = {**changes, 'updated_at': timezone.now()}
+        if context.get('changed_by_id'):
+            values['updated_by_id'] = context['changed_by_id']
+        for chunk in _chunks(ids):
+            if tracks_capacity:
+                deltas.add_queryset(Server.objects.filter(pk__in=chunk), -1)
+            model.objects.filter(pk__in=chunk).update(**values)
+            if tracks_capacity:
+                deltas.add_queryset(Server.objects.filter(pk__in=chunk))
+        deltas.apply()
+        changelog.enqueue(entries)
+        if ids:
+            versions.bump(model)
+    return {'matched': len(rows), 'updated': len(ids), 'dry_run': False}
+
+
+def _clear_references(model, ids):
+    """Null out ``SET_NULL`` foreign keys pointing at ``ids``, as ``delete()`` would."""
+    for relation in model._meta.related_objects:
+        if relation.on_delete is models.SET_NULL:
+            relation.related_model._base_manager.filter(
+                **{f'{relation.field.name}__in': ids}
+            ).update(**{relation.field.name: None})
+
+
+def _delete_rows(model, ids, using):
+    """One ``DELETE`` of ``ids``; returns the number of rows deleted.
+
+    The delete signals are handled by the caller in bulk; ``QuerySet.delete()``
+    would load and signal every row instead, as the asset models have receivers.
+    """
+    connection = connections[using]
+    pk = model._meta.pk
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(pk.column)} IN ({', '.join(['%s'] * len(ids))})",
+            [pk.get_db_prep_value(value, connection) for value in ids],
+        )
+        return cursor.rowcount
+
+
+def bulk_delete(queryset, dry_run=False, notes=None):
+    """Delete every asset in ``queryset``; returns ``{'matched': n, 'deleted': n, 'dry_run': bool}``."""
+    model = queryset.model
+    if dry_run:
+        return {'matched': queryset.count(), 'deleted': 0, 'dry_run': True}
+
+    asset_type = model._meta.model_name
+    context = changelog.request_context()
+    deleted = 0
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().order_by('pk').values_list('id', 'name'))
+        deltas = capacity.RollupDeltas()
+        for chunk in _chunks([pk for pk, _ in rows]):
+            if model is Server:
+                # Deleting a host also moves its virtual machines out of its rollup.
+                affected_ids = list(Server.objects.filter(Q(pk__in=chunk) | Q(hypervisor_host__in=chunk))
+                                    .values_list('pk', flat=True))
+                deltas.add_queryset(Server.objects.filter(pk__in=affected_ids), -1)
+            _clear_references(model, chunk)
+            deleted += _delete_rows(model, chunk, queryset.db)
+            if model is Server:
+                deltas.add_queryset(Server.objects.filter(pk__in=affected_ids))
+            lookup.unindex_assets(model, chunk)
+            search.unindex_assets(model, chunk)
+        deltas.apply()
+        changelog.enqueue([
+            changelog.build_entry(asset_type, pk, name, changelog.DELETED, context=context, notes=notes)
+            for pk, name in rows
+        ])
+        if rows:
+            versions.bump(model)
+    return {'matched': len(rows), 'deleted': deleted, 'dry_run': False}
@@ -0,0 +1,169 @@
+"""Server capacity rollups per site, cluster and hypervisor host.
+
+``CapacityRollup`` keeps one row of running totals per site, cluster name and
+hypervisor host. Every server write applies the difference between the
+server's old and new contribution as ``F()`` increments, so a capacity report
+is a single-row lookup instead of a SUM over every server. The old
+contribution is read from the stored row under a row lock in the same
+transaction, so concurrent saves of one server queue up instead of both
+subtracting the same old values. Saves that change none of the tracked fields
+take no lock and leave those columns out of their ``UPDATE``. Bulk paths
+that skip the save signals compute their deltas per chunk, and
+``manage.py rebuild_capacity_rollups`` recomputes everything to repair drift.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from asset.models import CapacityRollup, Server
+
+Dimension = CapacityRollup.Dimension
+
+# Rollup dimension to the Server attribute it groups by.
+DIMENSIONS = {
+    Dimension.SITE: 'site',
+    Dimension.CLUSTER: 'cluster_name',
+    Dimension.HYPERVISOR_HOST: 'hypervisor_host_id',
+}
+# Server attribute to the rollup column summing it.
+METRICS = {
+    'number_of_cores': 'total_cores',
+    'ram_gb': 'total_ram_gb',
+    'storage_capacity_gb': 'total_storage_capacity_gb',
+    'storage_used_gb': 'total_storage_used_gb',
+}
+TRACKED_FIELDS = tuple(DIMENSIONS.values()) + tuple(METRICS)
+COUNT_COLUMN = 'server_count'
+
+
+class RollupDeltas:
+    """Accumulates per-row column deltas so each rollup row is updated once."""
+
+    def __init__(self):
+        self.rows = defaultdict(lambda: defaultdict(int))
+
+    def __bool__(self):
+        return any(any(columns.values()) for columns in self.rows.values())
+
+    def add(self, values, sign=1):
+        """Add (``sign=1``) or remove (``sign=-1``) one server's contribution.
+
+        ``values`` maps the attributes in ``TRACKED_FIELDS`` to their values.
+        """
+        for dimension, attname in DIMENSIONS.items():
+            key = values.get(attname)
+            if key in (None, ''):
+                continue
+            columns = self.rows[(dimension, str(key))]
+            columns[COUNT_COLUMN] += sign
+            for name, column in METRICS.items():
+                columns[column] += sign * (values.get(name) or 0)
+
+    def add_queryset(self, queryset, sign=1):
+        for values in queryset.order_by().values(*TRACKED_FIELDS):
+            self.add(values, sign)
+
+    def apply(self):
+        """Write the accumulated deltas: one insert for new rows, one UPDATE per changed row."""
+        rows = {key: columns for key, columns in self.rows.items() if any(columns.values())}
+        if not rows:
+            return 0
+        with transaction.atomic():
+            CapacityRollup.objects.bulk_create(
+                [CapacityRollup(dimension=dimension, key=key) for dimension, key in rows],
+                ignore_conflicts=True,
+            )
+            for (dimension, key), columns in rows.items():
+                CapacityRollup.objects.filter(dimension=dimension, key=key).update(**{
+                    column: F(column) + delta for column, delta in columns.items() if delta
+                })
+        self.rows.clear()
+        return len(rows)
+
+
+def writes_tracked_fields(instance, update_fields=None):
+    """Whether saving the existing server ``instance`` may change a tracked field.
+
+    True when one of them changed since the instance was loaded, or when it
+    was not loaded from the database and there is nothing to compare against.
+    """
+    if not getattr(instance, '_loaded_values', None):
+        return True
+    names = TRACKED_FIELDS
+    if update_fields is not None:
+        names = [name for name in TRACKED_FIELDS if name in update_fields or name.removesuffix('_id') in update_fields]
+    return any(name in instance._changed_fields for name in names)
+
+
+def tracked_values(instance):
+    return {name: getattr(instance, name) for name in TRACKED_FIELDS}
+
+
+def stored_values(instance):
+    """The tracked values of ``instance`` as they are in the database, locking its row.
+
+    Must run inside the transaction that writes the server; the load-time
+    snapshot is not used, since another save may have changed the row since.
+    """
+    return Server.objects.select_for_update().filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+
+
+def capture_stored_values(instance):
+    """Keep the stored values for :func:`record_save` or :func:`record_delete` (pre_save / pre_delete)."""
+    if not instance._state.adding:
+        instance._capacity_before = stored_values(instance)
+
+
+def record_save(instance, created, update_fields=None):
+    """Apply the capacity change of one saved server.
+
+    The previous values are taken by :func:`capture_stored_values` in pre_save.
+    """
+    deltas = RollupDeltas()
+    new = tracked_values(instance)
+    if not created:
+        old = instance.__dict__.pop('_capacity_before', None)
+        if old is None:
+            return
+        if update_fields is not None:
+            # Attributes that were not written keep their stored value.
+            new = {name: new[name] if name in update_fields or name.removesuffix('_id') in update_fields
+                   else old[name] for name in TRACKED_FIELDS}
+        deltas.add(old, -1)
+    deltas.add(new)
+    deltas.apply()
+
+
+def record_delete(instance):
+    """Remove a deleted server's contribution, as read by :func:`capture_stored_values` in pre_delete."""
+    old = instance.__dict__.pop('_capacity_before', None)
+    if old is not None:
+        deltas = RollupDeltas()
+        deltas.add(old, -1)
+        deltas.apply()
+    # on_delete=SET_NULL detaches the VMs without signals; the host's row goes with it.
+    CapacityRollup.objects.filter(dimension=Dimension.HYPERVISOR_HOST, key=str(instance.pk)).delete()
+
+
+def rebuild_rollups():
+    """Recompute every rollup row from the servers table; returns the number of rows."""
+    rows = []
+    sums = {column: Sum(name) for name, column in METRICS.items()}
+    for dimension, attname in DIMENSIONS.items():
+        groups = (Server.objects.order_by().exclude(**{f'{attname}__isnull': True})
+                  .values(attname).annotate(server_count=Count('pk'), **sums))
+        rows.extend(
+            CapacityRollup(dimension=dimension, key=str(group.pop(attname)),
+                           **{column: value or 0 for column, value in group.items()})
+            for group in groups if group[attname] != ''
+        )
+    with transaction.atomic():
+        CapacityRollup.objects.all().delete()
+        CapacityRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def capacity_for(dimension, key):
+    """The rollup row for one site, cluster or host, or ``None``."""
+    return CapacityRollup.objects.filter(dimension=dimension, key=str(key)).first()
@@ -0,0 +1,167 @@
+"""Automatic change capture into ``AssetChangeLog``.
+
+Saves and deletes of every asset model produce a log entry with field-level
+``{"field": {"old": ..., "new": ...}}`` diffs for the fields that actually
+changed. Entries are queued once the surrounding transaction commits and
+written with ``bulk_create`` by a background thread, so a request only pays
+for building the entry. Set ``ASSET_CHANGELOG_BUFFERED = False`` to write
+entries synchronously at commit instead (useful in tests and scripts).
+
+Bulk writers that bypass ``save()`` (imports, bulk changes, seeding) build
+their entries with :func:`build_entry` or :func:`update_entries` from the
+values they read before writing. The machine-maintained columns in
+``UNTRACKED_FIELDS`` are never logged: heartbeats and telemetry rewrite them
+every few seconds, and an audit row per asset per scan would bury the real
+changes.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from asset.batching import BackgroundBatcher
+from asset.middleware import current_request
+from asset.models import AssetChangeLog
+
+CREATED = 'Created'
+UPDATED = 'Updated'
+DELETED = 'Deleted'
+
+# Maintained by Django on every save; logging them would only add noise.
+IGNORED_FIELDS = frozenset({'updated_at', 'created_at', 'first_discovered'})
+# Written by scanners and monitoring agents rather than people.
+UNTRACKED_FIELDS = frozenset({'last_seen', 'last_scanned', 'cpu_utilization', 'memory_utilization',
+                              'disk_utilization', 'utilization_recorded_at'})
+
+logger = logging.getLogger(__name__)
+_encoder = DjangoJSONEncoder()
+
+
+def jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool, dict, list)):
+        return value
+    return _encoder.default(value)
+
+
+def field_diff(changed_fields):
+    """Turn ``{attname: (old, new)}`` into the JSON stored in ``changed_fields``."""
+    return {
+        name: {'old': jsonable(old), 'new': jsonable(new)}
+        for name, (old, new) in changed_fields.items()
+        if name not in IGNORED_FIELDS and name not in UNTRACKED_FIELDS
+    }
+
+
+def request_context(request=None):
+    """``changed_by_id``, ``ip_address`` and ``user_agent`` for the current request.
+
+    The user id is read from the session so no user query is needed.
+    """
+    request = request or current_request.get()
+    if request is None:
+        return {}
+    session = getattr(request, 'session', None)
+    user_id = session.get(SESSION_KEY) if session is not None else None
+    return {
+        'changed_by_id': user_id,
+        'ip_address': request.META.get('REMOTE_ADDR') or None,
+        'user_agent': (request.META.get('HTTP_USER_AGENT') or '')[:500] or None,
+    }
+
+
+def build_entry(asset_type, asset_id, asset_name, change_type, changed_fields=None, context=None, notes=None):
+    return AssetChangeLog(
+        asset_type=asset_type,
+        asset_id=asset_id,
+        asset_name=(asset_name or '')[:255],
+        change_type=change_type,
+        changed_fields=changed_fields or {},
+        changed_at=timezone.now(),
+        notes=notes,
+        **(request_context() if context is None else context),
+    )
+
+
+def update_entries(model, old_rows, new_values, notes=None):
+    """``UPDATED`` entries of a bulk write to ``model``, one per asset with a real change.
+
+    ``old_rows`` maps pk to the stored ``name`` and old field values, read
+    before the write; ``new_values`` maps pk to ``{field: new value}``.
+    """
+    asset_type = model._meta.model_name
+    context = request_context()
+    entries = []
+    for pk, values in new_values.items():
+        old = old_rows.get(pk)
+        if old is None:
+            continue
+        diff = field_diff({name: (old[name], value) for name, value in values.items() if old[name] != value})
+        if diff:
+            name = values.get('name', old['name'])
+            entries.append(build_entry(asset_type, pk, name, UPDATED, diff, context, notes))
+    return entries
+
+
+def write_entries(entries):
+    """Insert ``entries`` in bulk, falling back to one insert per entry if the batch fails.
+
+    A single bad entry then only loses itself. Raises when every entry
+    fails, e.g. while the database is down, so the batch gets retried.
+    """
+    try:
+        with transaction.atomic():
+            AssetChangeLog.objects.bulk_create(entries, batch_size=1000)
+        return
+    except DatabaseError:
+        if len(entries) == 1:
+            raise
+        logger.warning("Bulk insert of %d change log entries failed; inserting them one by one",
+                       len(entries), exc_info=True)
+    failed = []
+    for entry in entries:
+        try:
+            with transaction.atomic():
+                AssetChangeLog.objects.bulk_create([entry])
+        except DatabaseError as exc:
+            failed.append((entry, exc))
+    if len(failed) == len(entries):
+        raise failed[-1][1]
+    for entry, exc in failed:
+        logger.error("Dropped change log entry for %s %s: %s", entry.asset_type, entry.asset_id, exc)
+
+
+buffer = BackgroundBatcher(
+    write_entries,
+    max_size=getattr(settings, 'ASSET_CHANGELOG_BATCH_SIZE', 500),
+    interval=getattr(settings, 'ASSET_CHANGELOG_FLUSH_INTERVAL', 1.0),
+    name='asset-changelog',
+)
+
+
+def enqueue(entries):
+    """Queue ``entries`` for writing once the current transaction commits."""
+    if not entries:
+        return
+    if getattr(settings, 'ASSET_CHANGELOG_BUFFERED', True):
+        transaction.on_commit(lambda: buffer.extend(entries))
+    else:
+        transaction.on_commit(lambda: write_entries(entries))
+
+
+def record_save(instance, created, changed_fields):
+    """Log a save; ``changed_fields`` is ``instance.get_changed_fields()`` before the save."""
+    if created:
+        entry = build_entry(instance._meta.model_name, instance.pk, instance.name, CREATED)
+    else:
+        diff = field_diff(changed_fields)
+        if not diff:
+            return
+        entry = build_entry(instance._meta.model_name, instance.pk, instance.name, UPDATED, diff)
+    enqueue([entry])
+
+
+def record_delete(instance):
+    enqueue([build_entry(instance._meta.model_name, instance.pk, instance.name, DELETED)])
@@ -0,0 +1,88 @@
+"""Conditional GET for asset pages: ETag and Last-Modified validators.
+
+A repeat reader sends back the validators of the copy it holds and gets a
+``304 Not Modified`` before the page's rows are fetched or its template
+rendered. ``django.views.decorators.http.condition`` cannot be used: it
+calls its validator functions synchronously, and these read the database
+or the cache.
+
+Detail pages are validated with one primary key query on the asset's
+``updated_at`` and the columns heartbeats and telemetry write with plain
+``UPDATE`` statements that leave ``updated_at`` alone
+(``changelog.UNTRACKED_FIELDS``). The newest of those timestamps is the
+page's ``Last-Modified``.
+
+List pages are validated on the table counters of :mod:`asset.versions`
+without touching the database: the table's own counter, which every save,
+create, bulk change and delete bumps, and its ``READINGS`` counter when the
+list shows telemetry columns. A date cannot express a delete, so lists are
+validated by ETag only and send no ``Last-Modified``.
+"""
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from asset import versions
+from asset.changelog import UNTRACKED_FIELDS
+
+
+def make_etag(*parts):
+    """Weak ETag over ``parts``; pages are rendered per user, so the user is always one of them."""
+    return 'W/"%s"' % hashlib.md5('|'.join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+
+
+async def asset_validators(request, model, pk):
+    """``(etag, last_modified)`` of one asset, or ``(None, None)`` if it does not exist."""
+    names = {field.name for field in model._meta.concrete_fields}
+    fields = ['updated_at', *sorted(name for name in UNTRACKED_FIELDS if name in names)]
+    row = await model.objects.filter(pk=pk).values_list(*fields).afirst()
+    if row is None:
+        return None, None
+    user = await request.auser()
+    last_modified = max(value for value in row if isinstance(value, datetime))
+    return make_etag(model._meta.model_name, pk, user.pk, *row), last_modified
+
+
+def _list_versions(model):
+    counters = [versions.get_version(model)]
+    if UNTRACKED_FIELDS.intersection(model.LIST_FIELDS):
+        counters.append(versions.get_version(model, versions.READINGS))
+    return counters
+
+
+async def list_validators(request, queryset):
+    """``(etag, None)`` of a keyset list page over ``queryset``, from the table counters alone."""
+    model = queryset.model
+    counters = await sync_to_async(_list_versions)(model)
+    user = await request.auser()
+    return make_etag(model._meta.model_name, request.GET.urlencode(), user.pk, *counters), None
+
+
+def conditional(validators):
+    """Answer conditional GETs of an async view with 304 before the view runs.
+
+    ``validators`` is an async callable taking the view's arguments and
+    returning ``(etag, last_modified)``; either may be ``None``.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await validators(request, *args, **kwargs)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD') and response.status_code in (200, 304):
+                if timestamp and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(timestamp)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+                # Revalidate every time instead of trusting a heuristic freshness lifetime.
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return inner
+    return decorator
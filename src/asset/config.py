@@ -0,0 +1,68 @@
+"""Filtering assets on their ``configuration_items`` JSON.
+
+Key/value filters become one JSON containment test (``@>``), which
+PostgreSQL answers from the ``jsonb_path_ops`` GIN index of each asset table
+(migration 0012). Hot keys are promoted further to generated columns with
+a b-tree index of their own (``config_patch_group``), so "all servers in
+patch group A" is a plain equality probe. To promote another key, add a
+``GeneratedField`` on ``BaseAsset`` with an index and list it in
+``PROMOTED_KEYS``. Databases without JSON containment (SQLite) filter
+on each key instead, taking the key literally as ``@>`` does: ``os__name``
+is one key, not a path or a lookup.
+"""
+from django.db import connections
+from django.db.models.fields.json import KeyTransform
+
+from asset.models import ASSET_MODELS
+
+# Configuration keys copied into indexed generated columns: key -> field name.
+PROMOTED_KEYS = {
+    'patch_group': 'config_patch_group',
+}
+
+
+def filter_config(queryset, pairs):
+    """Narrow ``queryset`` to assets whose configuration contains every pair of ``pairs``."""
+    rest = {}
+    for key, value in pairs.items():
+        # Promoted columns hold the text form of the value, so only strings can use them.
+        if key in PROMOTED_KEYS and isinstance(value, str):
+            queryset = queryset.filter(**{PROMOTED_KEYS[key]: value})
+        else:
+            rest[key] = value
+    if not rest:
+        return queryset
+    if connections[queryset.db].features.supports_json_field_contains:
+        return queryset.filter(configuration_items__contains=rest)
+    for index, (key, value) in enumerate(rest.items()):
+        alias = f'_config_{index}'
+        queryset = queryset.alias(**{alias: KeyTransform(key, 'configuration_items')}).filter(**{alias: value})
+    return queryset
+
+
+def filter_config_keys(queryset, keys):
+    """Narrow ``queryset`` to assets whose configuration has every one of ``keys``.
+
+    Only promoted keys are index-backed: ``jsonb_path_ops`` serves
+    containment, not key existence.
+    """
+    for key in keys:
+        if key in PROMOTED_KEYS:
+            queryset = queryset.filter(**{f'{PROMOTED_KEYS[key]}__isnull': False})
+        else:
+            queryset = queryset.filter(configuration_items__has_key=key)
+    return queryset
+
+
+def assets_with_config(pairs=None, keys=(), asset_types=None, limit=None):
+    """Return ``(asset_type, asset_id, asset_tag)`` of matching assets across asset types."""
+    results = []
+    for asset_type in asset_types or ASSET_MODELS:
+        queryset = filter_config_keys(filter_config(ASSET_MODELS[asset_type].objects.all(), pairs or {}), keys)
+        rows = queryset.order_by('asset_tag').values_list('id', 'asset_tag')
+        if limit is not None:
+            rows = rows[:limit - len(results)]
+        results.extend((asset_type, asset_id, asset_tag) for asset_id, asset_tag in rows)
+        if limit is not None and len(results) >= limit:
+            break
+    return results
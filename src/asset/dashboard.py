@@ -0,0 +1,83 @@
+"""Fleet statistics for the landing page.
+
+Each asset table is aggregated with a single grouped query over
+``(status, environment, risk_level)`` that also counts the non-compliant,
+unauthorized and unencrypted assets in every group; the per-dimension totals
+are rolled up from those few rows in Python. The result for each table is
+cached under the table's change counter from :mod:`asset.versions`, which
+every save, delete, bulk change, import and seed bumps, so a page view
+normally costs two cache reads and no query.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from asset import versions
+from asset.models import ASSET_MODELS, BaseAsset
+
+DIMENSIONS = ('status', 'environment', 'risk_level')
+FLAGS = {
+    'non_compliant': Q(compliance_status=False),
+    'unauthorized': Q(authorized=False),
+    'unencrypted': Q(encrypted=False),
+}
+CACHE_PREFIX = 'asset:dashboard:'
+CACHE_TIMEOUT = 60 * 60
+
+
+def cache_key(model, version):
+    return f'{CACHE_PREFIX}{model._meta.model_name}:{version}'
+
+
+def aggregate(model):
+    """Group counts for one asset table, computed with one query."""
+    rows = (model.objects.order_by()
+            .values(*DIMENSIONS)
+            .annotate(total=Count('pk'), **{flag: Count('pk', filter=q) for flag, q in FLAGS.items()}))
+    return [
+        (tuple(row[name] for name in DIMENSIONS), row['total'], tuple(row[flag] for flag in FLAGS))
+        for row in rows
+    ]
+
+
+def summarize(groups):
+    """Roll grouped counts up into totals per dimension value and per flag."""
+    summary = {'total': 0, **{name: {} for name in DIMENSIONS}, **{flag: 0 for flag in FLAGS}}
+    for key, total, flags in groups:
+        summary['total'] += total
+        for name, value in zip(DIMENSIONS, key):
+            summary[name][value] = summary[name].get(value, 0) + total
+        for flag, count in zip(FLAGS, flags):
+            summary[flag] += count
+    return summary
+
+
+def type_groups(models=None):
+    """``{model_name: groups}``, from the cache where possible."""
+    models = list(models or ASSET_MODELS.values())
+    keys = {model: cache_key(model, version) for model, version in versions.get_versions(models).items()}
+    cached = cache.get_many(keys.values())
+    result = {}
+    for model, key in keys.items():
+        if key not in cached:
+            cached[key] = aggregate(model)
+            cache.set(key, cached[key], CACHE_TIMEOUT)
+        result[model._meta.model_name] = cached[key]
+    return result
+
+
+def fleet_summary(models=None):
+    """Fleet-wide and per-type counts by status, environment and risk level."""
+    groups = type_groups(models)
+    return {
+        'fleet': summarize([group for type_group in groups.values() for group in type_group]),
+        'by_type': {name: summarize(type_group) for name, type_group in groups.items()},
+    }
+
+
+def labelled_counts(summary):
+    """``{dimension: [(label, count), ...]}`` in choice order, for templates."""
+    table = {}
+    for name in DIMENSIONS:
+        counts = summary[name]
+        table[name] = [(label, counts.get(value, 0)) for value, label in BaseAsset._meta.get_field(name).choices]
+    return table
@@ -0,0 +1,105 @@
+"""Upcoming warranty, support, lease, end-of-life, certificate and license expiries.
+
+Every expiry date column is indexed, so each (table, column) pair is read as
+an index range scan already ordered by date; the streams are merged with
+``heapq.merge`` into one list ordered across all asset types. A daily
+``ExpirySnapshot`` (``manage.py expiry_snapshot``) stores the result so the
+alert page and the daily email read one small table instead, as long as the
+requested window fits inside the snapshot's own.
+"""
+import heapq
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from asset.models import ASSET_MODELS, BaseAsset, ExpirySnapshot
+
+EXPIRY_FIELDS = ('warranty_expiration', 'support_expiration', 'lease_expiration', 'end_of_life_date',
+                 'ssl_certificate_expiration', 'license_expiration')
+# Assets in these states no longer need renewals.
+INACTIVE_STATUSES = (BaseAsset.Status.RETIRED, BaseAsset.Status.DISPOSED)
+DEFAULT_WINDOW_DAYS = 90
+SNAPSHOT_KEEP_DAYS = 30
+
+Expiry = namedtuple('Expiry', 'expires_on asset_type asset_id asset_tag asset_name field')
+
+
+def expiry_fields(model):
+    names = {field.name for field in model._meta.concrete_fields}
+    return [name for name in EXPIRY_FIELDS if name in names]
+
+
+def _stream(model, field, start, end):
+    rows = (model.objects
+            .filter(**{f'{field}__gte': start, f'{field}__lte': end})
+            .exclude(status__in=INACTIVE_STATUSES)
+            .order_by(field)
+            .values_list(field, 'id', 'asset_tag', 'name'))
+    asset_type = model._meta.model_name
+    for expires_on, asset_id, asset_tag, name in rows.iterator(chunk_size=2000):
+        yield Expiry(expires_on, asset_type, asset_id, asset_tag, name, field)
+
+
+def upcoming(days=30, today=None, overdue_days=0, models=None):
+    """Expiries from ``overdue_days`` ago up to ``days`` ahead, ordered by date across all types."""
+    today = today or timezone.localdate()
+    start, end = today - timedelta(days=overdue_days), today + timedelta(days=days)
+    streams = [
+        _stream(model, field, start, end)
+        for model in (models or ASSET_MODELS.values())
+        for field in expiry_fields(model)
+    ]
+    return list(heapq.merge(*streams, key=lambda expiry: expiry.expires_on))
+
+
+def build_snapshot(today=None, days=None):
+    """Store today's expiry list, replacing any earlier snapshot of today; returns the rows written."""
+    today = today or timezone.localdate()
+    days = days or getattr(settings, 'ASSET_EXPIRY_WINDOW_DAYS', DEFAULT_WINDOW_DAYS)
+    rows = [
+        ExpirySnapshot(snapshot_date=today, asset_type=expiry.asset_type, asset_id=expiry.asset_id,
+                       asset_tag=expiry.asset_tag, asset_name=(expiry.asset_name or '')[:255],
+                       field=expiry.field, expires_on=expiry.expires_on, window_days=days)
+        for expiry in upcoming(days, today)
+    ]
+    with transaction.atomic():
+        ExpirySnapshot.objects.filter(snapshot_date=today).delete()
+        ExpirySnapshot.objects.filter(snapshot_date__lt=today - timedelta(days=SNAPSHOT_KEEP_DAYS)).delete()
+        ExpirySnapshot.objects.bulk_create(rows, batch_size=2000)
+    return len(rows)
+
+
+def snapshot_expiries(days=30, today=None):
+    """Expiries within ``days`` from today's snapshot.
+
+    Returns ``None`` if today's snapshot has not been built yet or covers
+    fewer than ``days`` days.
+    """
+    today = today or timezone.localdate()
+    latest = (ExpirySnapshot.objects.order_by('-snapshot_date')
+              .values_list('snapshot_date', 'window_days').first())
+    if latest is None or latest[0] != today or latest[1] < days:
+        return None
+    rows = (ExpirySnapshot.objects
+            .filter(snapshot_date=today, expires_on__lte=today + timedelta(days=days))
+            .order_by('expires_on', 'asset_tag')
+            .values_list('expires_on', 'asset_type', 'asset_id', 'asset_tag', 'asset_name', 'field'))
+    return [Expiry(*row) for row in rows]
+
+
+def expiries(days=30, today=None):
+    """Today's snapshot when available, otherwise the live index-backed query."""
+    result = snapshot_expiries(days, today)
+    return upcoming(days, today) if result is None else result
+
+
+def email_body(items, days):
+    lines = [f"{len(items)} asset lifecycle dates expire within {days} days:", ""]
+    for item in items:
+        label = item.field.replace('_', ' ')
+        lines.append(f"{item.expires_on:%Y-%m-%d}  {item.asset_type:<14} {item.asset_tag:<24} "
+                     f"{label}  {item.asset_name}")
+    return '\n'.join(lines)
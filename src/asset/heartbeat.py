@@ -0,0 +1,199 @@
+"""Coalesced ``last_seen`` / ``last_scanned`` updates from discovery scanners.
+
+Scanners report the identifiers (asset tag, IP, MAC, hostname, serial) of
+every asset they see. Reports are merged in memory per identifier for a short
+window, then resolved to assets through ``AssetLookup`` with one query and
+written with a single ``UPDATE`` per chunk of each asset table that sets every
+asset's own newest timestamp of the window. Timestamps never move backwards,
+and the UPDATE touches no other column, so a heartbeat does not rewrite the
+whole asset row through ``save()``. These columns are machine-maintained
+and kept out of ``AssetChangeLog`` (see ``changelog.UNTRACKED_FIELDS``).
+"""
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from asset import versions
+from asset.batching import CoalescingBatcher
+from asset.lookup import IP_FIELDS, LOOKUP_FIELDS, normalize
+from asset.models import ASSET_MODELS, AssetLookup
+
+# Identifier keys accepted in a heartbeat and the lookup kinds they match.
+IDENTIFIER_KINDS = {
+    'asset_tag': ('asset_tag',),
+    'serial_number': ('serial_number',),
+    'hostname': ('hostname', 'fqdn'),
+    'ip': IP_FIELDS,
+    'mac': ('mac_address',),
+    'any': LOOKUP_FIELDS,
+}
+UPDATE_CHUNK_SIZE = 5000
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+class InvalidHeartbeat(ValueError):
+    pass
+
+
+def _later(a, b):
+    if a is None or b is None:
+        return a or b
+    return max(a, b)
+
+
+def combine(old, new):
+    """Merge two heartbeats for the same identifier, keeping the newest times."""
+    return old[0], old[1], _later(old[2], new[2]), _later(old[3], new[3])
+
+
+def parse_heartbeats(heartbeats, seen_at=None, scanned=False):
+    """Turn posted heartbeats into ``(identifier, value, seen_at, scanned_at)`` tuples.
+
+    A heartbeat is either a bare identifier string, matched against every
+    identifier kind, or an object with one key of ``IDENTIFIER_KINDS`` and
+    optional ``seen_at`` and ``scanned``. ``seen_at`` and ``scanned`` give the
+    defaults for the whole batch. Returns ``(items, errors)``.
+    """
+    default_seen = seen_at or timezone.now()
+    items, errors = [], []
+    for index, heartbeat in enumerate(heartbeats):
+        try:
+            items.append(_parse_heartbeat(heartbeat, default_seen, scanned))
+        except InvalidHeartbeat as exc:
+            errors.append({'index': index, 'error': str(exc)})
+    return items, errors
+
+
+def _parse_heartbeat(heartbeat, default_seen, default_scanned):
+    if isinstance(heartbeat, str):
+        heartbeat = {'any': heartbeat}
+    if not isinstance(heartbeat, dict):
+        raise InvalidHeartbeat("Each heartbeat must be a string or an object.")
+    identifiers = [key for key in heartbeat if key in IDENTIFIER_KINDS]
+    if len(identifiers) != 1 or not str(heartbeat[identifiers[0]]).strip():
+        raise InvalidHeartbeat(f"Expected exactly one of: {', '.join(IDENTIFIER_KINDS)}.")
+    identifier = identifiers[0]
+    seen = default_seen
+    if heartbeat.get('seen_at'):
+        try:
+            seen = parse_datetime(str(heartbeat['seen_at']))
+        except ValueError:
+            seen = None
+        if seen is None:
+            raise InvalidHeartbeat("Invalid seen_at.")
+        if timezone.is_naive(seen):
+            seen = timezone.make_aware(seen)
+    scanned = heartbeat.get('scanned', default_scanned)
+    value = str(heartbeat[identifier]).strip()
+    if identifier != 'any':
+        value = normalize(IDENTIFIER_KINDS[identifier][0], value)
+    return identifier, value, seen, seen if scanned else None
+
+
+def resolve(items):
+    """Map each item to the assets it identifies: ``{(asset_type, asset_id): (seen, scanned)}``.
+
+    Also returns the number of items that matched no asset.
+    """
+    candidates = defaultdict(list)
+    for item in items:
+        identifier, value = item[0], item[1]
+        for kind in IDENTIFIER_KINDS[identifier]:
+            candidates[(kind, normalize(kind, value))].append(item)
+    rows = AssetLookup.objects.filter(
+        value__in={value for _, value in candidates}, kind__in={kind for kind, _ in candidates},
+    ).values_list('asset_type', 'asset_id', 'kind', 'value')
+
+    assets, matched = {}, set()
+    for asset_type, asset_id, kind, value in rows.iterator(chunk_size=UPDATE_CHUNK_SIZE):
+        for item in candidates.get((kind, value), ()):
+            matched.add(item[:2])
+            key = (asset_type, asset_id)
+            seen, scanned = assets.get(key, (None, None))
+            assets[key] = (_later(seen, item[2]), _later(scanned, item[3]))
+    return assets, len(items) - len(matched)
+
+
+def _newest(column, times):
+    """``CASE`` moving ``column`` forward to each asset's time in ``times`` ({asset_id: time})."""
+    by_time = defaultdict(list)
+    for pk, time in times.items():
+        by_time[time].append(pk)
+    # One WHEN per distinct timestamp; a window's heartbeats mostly share a few.
+    return Case(
+        *(When(Q(pk__in=ids) & (Q(**{f'{column}__isnull': True}) | Q(**{f'{column}__lt': time})), then=Value(time))
+          for time, ids in by_time.items()),
+        default=F(column),
+    )
+
+
+def apply_heartbeats(model, assets):
+    """One ``UPDATE`` per chunk of ``assets`` ({asset_id: (seen, scanned)}) of ``model``."""
+    updated = 0
+    ids = list(assets)
+    for start in range(0, len(ids), UPDATE_CHUNK_SIZE):
+        chunk = ids[start:start + UPDATE_CHUNK_SIZE]
+        changes = {'last_seen': _newest('last_seen', {pk: assets[pk][0] for pk in chunk})}
+        scanned = {pk: assets[pk][1] for pk in chunk if assets[pk][1] is not None}
+        if scanned:
+            changes['last_scanned'] = _newest('last_scanned', scanned)
+        updated += model.objects.filter(pk__in=chunk).update(**changes)
+    versions.bump(model, versions.READINGS)
+    return updated
+
+
+def write_heartbeats(items):
+    """Resolve and apply a window of coalesced heartbeats; returns the flush counters."""
+    assets, unresolved = resolve(items)
+    by_type = defaultdict(dict)
+    for (asset_type, asset_id), times in assets.items():
+        by_type[asset_type][asset_id] = times
+    updated = 0
+    with transaction.atomic():
+        for asset_type, type_assets in by_type.items():
+            updated += apply_heartbeats(ASSET_MODELS[asset_type], type_assets)
+    counts = {'identifiers': len(items), 'unresolved': unresolved, 'rows_updated': updated, 'flushes': 1}
+    with _stats_lock:
+        _stats.update(counts)
+    return counts
+
+
+buffer = CoalescingBatcher(
+    write_heartbeats,
+    key=lambda item: item[:2],
+    combine=combine,
+    max_size=getattr(settings, 'ASSET_HEARTBEAT_BATCH_SIZE', 50000),
+    interval=getattr(settings, 'ASSET_HEARTBEAT_FLUSH_INTERVAL', 5.0),
+    name='asset-heartbeat',
+)
+
+
+def record(items):
+    """Queue heartbeats; repeats of one identifier within a window are merged."""
+    with _stats_lock:
+        _stats['received'] += len(items)
+    if getattr(settings, 'ASSET_HEARTBEAT_BUFFERED', True):
+        buffer.extend(items)
+    else:
+        coalesced = {}
+        for item in items:
+            coalesced[item[:2]] = combine(coalesced[item[:2]], item) if item[:2] in coalesced else item
+        with _stats_lock:
+            _stats['merged'] += len(items) - len(coalesced)
+        write_heartbeats(list(coalesced.values()))
+
+
+def stats():
+    """Counters since the process started, including how many heartbeats were merged."""
+    with _stats_lock:
+        counts = dict(_stats)
+    counts['merged'] = counts.get('merged', 0) + buffer.merged
+    counts['pending'] = len(buffer)
+    return counts
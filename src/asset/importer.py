@@ -0,0 +1,209 @@
+"""Bulk import and upsert of asset inventories keyed on ``asset_tag``.
+
+Rows are validated and written in chunks. Each chunk costs one query to find
+which tags already exist and one ``INSERT ... ON CONFLICT (asset_tag) DO
+UPDATE`` per distinct column set, never a round trip per row. Derived tables
+such as the lookup and search indexes are refreshed per chunk in bulk as well,
+and the change log gets one entry per created or changed asset, diffed
+against the values read before the upsert.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import transaction
+
+from asset import capacity, changelog, search, versions
+from asset.lookup import reindex_assets
+from asset.models import Server
+
+IMPORT_FORMATS = ('csv', 'json', 'ndjson')
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Columns that are never taken from input files: the primary key, the
+# timestamps maintained by auto_now / auto_now_add and the one telemetry keeps.
+PROTECTED_FIELDS = frozenset({'id', 'created_at', 'updated_at', 'first_discovered', 'utilization_recorded_at'})
+
+
+def importable_fields(model):
+    """Map of column name to field for every column an import may set.
+
+    Foreign keys are excluded: validating them would cost a query per row.
+    Generated columns are computed by the database and cannot be set.
+    """
+    return {
+        f.name: f for f in model._meta.concrete_fields
+        if not f.is_relation and not f.generated and f.name not in PROTECTED_FIELDS
+    }
+
+
+def format_from_filename(filename):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return {'jsonl': 'ndjson'}.get(extension, extension)
+
+
+def read_rows(fh, fmt):
+    """Yield one dict per asset from a text file in ``fmt``."""
+    if fmt == 'csv':
+        yield from csv.DictReader(fh)
+    elif fmt == 'ndjson':
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == 'json':
+        data = json.load(fh)
+        yield from (data if isinstance(data, list) else [data])
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}'.")
+
+
+@dataclass
+class RowError:
+    row: int
+    asset_tag: str | None
+    errors: dict
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    rows_written: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def add_error(self, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def as_dict(self):
+        return {
+            'rows_read': self.rows_read,
+            'rows_written': self.rows_written,
+            'error_count': self.error_count,
+            'errors': [
+                {'row': e.row, 'asset_tag': e.asset_tag, 'errors': e.errors} for e in self.errors
+            ],
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+def build_instance(model, fields, row, existing_tags):
+    """Turn an input row into a validated, unsaved instance.
+
+    New assets are validated completely. Rows for existing tags only need to
+    be valid for the columns they provide, since only those get updated.
+    Raises ``ValidationError`` on invalid input.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError({NON_FIELD_ERRORS: ["Each row must be an object."]})
+    unknown = [name for name in row if name not in fields]
+    if unknown:
+        raise ValidationError({name: ["Unknown or read-only column."] for name in unknown})
+
+    values = {}
+    for name, value in row.items():
+        if value == '' and fields[name].null:
+            value = None
+        values[name] = value
+    instance = model(**values)
+
+    exclude = None
+    if isinstance(values.get('asset_tag'), str) and values['asset_tag'] in existing_tags:
+        exclude = [name for name in fields if name not in values]
+    instance.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+    return instance
+
+
+def _chunks(rows, size):
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_chunk(model, fields, chunk, first_row, result):
+    """Validate and upsert one chunk of rows."""
+    tags = {row['asset_tag'] for row in chunk if isinstance(row, dict) and isinstance(row.get('asset_tag'), str)}
+    existing_tags = set(model.objects.filter(asset_tag__in=tags).values_list('asset_tag', flat=True))
+
+    # Later rows win when a file repeats an asset_tag; PostgreSQL refuses to
+    # update the same row twice within one INSERT ... ON CONFLICT.
+    valid = {}
+    for offset, row in enumerate(chunk):
+        try:
+            instance = build_instance(model, fields, row, existing_tags)
+        except ValidationError as exc:
+            asset_tag = row.get('asset_tag') if isinstance(row, dict) else None
+            result.add_error(RowError(first_row + offset, asset_tag, exc.message_dict))
+            continue
+        valid[instance.asset_tag] = (instance, frozenset(row))
+
+    # Rows providing different columns must not overwrite each other's
+    # missing columns with defaults, so each column set is upserted apart.
+    groups = {}
+    for instance, columns in valid.values():
+        groups.setdefault(columns, []).append(instance)
+
+    written = model.objects.filter(asset_tag__in=list(valid))
+    deltas = capacity.RollupDeltas()
+    with transaction.atomic():
+        read = {'id', 'name', 'asset_tag'}.union(*(columns for _, columns in valid.values()))
+        old_rows = {row['asset_tag']: row for row in written.values(*read)}
+        if model is Server:
+            deltas.add_queryset(written, -1)
+        for columns, instances in groups.items():
+            model.objects.bulk_create(
+                instances,
+                update_conflicts=True,
+                unique_fields=['asset_tag'],
+                update_fields=sorted(columns - {'asset_tag'}) + ['updated_at'],
+            )
+            result.rows_written += len(instances)
+        changelog.enqueue(import_entries(model, valid, old_rows))
+        # bulk_create skips the save signals; refresh derived tables in bulk.
+        if valid:
+            reindex_assets(written)
+            search.reindex_assets(written)
+            versions.bump(model)
+        if model is Server:
+            deltas.add_queryset(written)
+            deltas.apply()
+    return valid
+
+
+def import_entries(model, valid, old_rows):
+    """Change log entries of an upserted chunk: ``Created`` for new tags, ``Updated`` with a diff otherwise."""
+    asset_type = model._meta.model_name
+    context = changelog.request_context()
+    entries, new_values, by_pk = [], {}, {}
+    for tag, (instance, columns) in valid.items():
+        old = old_rows.get(tag)
+        if old is None:
+            entries.append(changelog.build_entry(asset_type, instance.pk, instance.name, changelog.CREATED,
+                                                 context=context, notes="Import"))
+        else:
+            new_values[old['id']] = {name: getattr(instance, name) for name in columns}
+            by_pk[old['id']] = old
+    return entries + changelog.update_entries(model, by_pk, new_values, notes="Import")
+
+
+def import_assets(model, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Upsert ``rows`` (an iterable of dicts) into ``model``; returns an :class:`ImportResult`."""
+    fields = importable_fields(model)
+    result = ImportResult()
+    started = time.perf_counter()
+    for chunk in _chunks(rows, chunk_size):
+        import_chunk(model, fields, chunk, result.rows_read + 1, result)
+        result.rows_read += len(chunk)
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,211 @@
+"""Cross-type asset lookup on hostname, IP, MAC, serial number and asset tag.
+
+``AssetLookup`` holds one row per identifier of every asset, so "which asset
+owns 10.10.4.7" is a single indexed query instead of one query per asset
+table. IP rows also carry a sortable ``ip_key``, turning "everything in
+10.10.0.0/16" into an index range scan on any database. Rows are maintained
+from the asset save/delete signals, refreshed in bulk by the importer and
+rebuilt by ``manage.py rebuild_asset_lookup``.
+
+The comma-separated list fields (tags, DNS servers, listening ports and
+connected VLANs) are split into one row per normalized member as well, so
+"servers listening on 3389" is an index probe on ``(value, kind)`` rather
+than a ``LIKE '%3389%'`` scan of every asset table.
+"""
+import ipaddress
+import re
+
+from django.db import transaction
+
+from asset.models import AssetLookup
+
+LOOKUP_FIELDS = (
+    'asset_tag', 'serial_number', 'hostname', 'fqdn',
+    'primary_ip_address', 'secondary_ip_address', 'management_ip', 'mac_address',
+)
+IP_FIELDS = ('primary_ip_address', 'secondary_ip_address', 'management_ip')
+# Comma-separated fields indexed one row per member.
+LIST_FIELDS = ('tags', 'dns_servers', 'listening_ports', 'connected_vlans')
+NUMERIC_LIST_FIELDS = ('listening_ports', 'connected_vlans')
+INDEXED_FIELDS = LOOKUP_FIELDS + LIST_FIELDS
+REBUILD_CHUNK_SIZE = 5000
+
+_MAC_SEPARATORS = re.compile(r'[^0-9a-f]')
+
+
+def lookup_fields(model):
+    """The indexed fields ``model`` actually has (only some have management_ip or listening_ports)."""
+    names = {field.name for field in model._meta.concrete_fields}
+    return [name for name in INDEXED_FIELDS if name in names]
+
+
+def normalize_ip(value):
+    try:
+        return ipaddress.ip_address(value.strip()).compressed
+    except ValueError:
+        return value.strip().lower()
+
+
+def ip_key(value):
+    """Fixed-width hex key of an address; string order equals numeric order.
+
+    IPv4 addresses are mapped into ``::ffff:0:0/96`` so both families share
+    one key space and every CIDR block is one contiguous key range.
+    """
+    try:
+        address = ipaddress.ip_address(str(value).strip())
+    except ValueError:
+        return None
+    if address.version == 4:
+        address = ipaddress.IPv6Address(f'::ffff:{address}')
+    return f'{int(address):032x}'
+
+
+def subnet_bounds(cidr):
+    """Inclusive ``(low, high)`` ``ip_key`` range covering ``cidr``.
+
+    Raises ``ValueError`` for an invalid network.
+    """
+    network = ipaddress.ip_network(cidr.strip(), strict=False)
+    return ip_key(network.network_address), ip_key(network.broadcast_address)
+
+
+def normalize_mac(value):
+    digits = _MAC_SEPARATORS.sub('', value.lower())
+    if len(digits) != 12:
+        return value.strip().lower()
+    return ':'.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+def normalize(kind, value):
+    """Canonical form of an identifier, so lookups are case and format insensitive."""
+    value = str(value)
+    if kind in IP_FIELDS:
+        return normalize_ip(value)
+    if kind == 'mac_address':
+        return normalize_mac(value)
+    if kind in ('hostname', 'fqdn'):
+        return value.strip().lower().rstrip('.')
+    if kind == 'dns_servers':
+        return normalize_ip(value)
+    if kind in NUMERIC_LIST_FIELDS and value.strip().isdigit():
+        return str(int(value))
+    return value.strip().lower()
+
+
+def split_list(kind, value):
+    """Normalized, de-duplicated members of a comma-separated list field, in order."""
+    members = (normalize(kind, member) for member in str(value or '').split(','))
+    return list(dict.fromkeys(member for member in members if member))
+
+
+def build_entries(asset_type, asset_id, values):
+    """``AssetLookup`` rows for one asset given a mapping of field to value."""
+    entries = []
+    for kind, value in values.items():
+        if value in (None, ''):
+            continue
+        if kind in LIST_FIELDS:
+            entries.extend(AssetLookup(asset_type=asset_type, asset_id=asset_id, kind=kind, value=member[:500])
+                           for member in split_list(kind, value))
+        elif kind in LOOKUP_FIELDS:
+            entries.append(AssetLookup(asset_type=asset_type, asset_id=asset_id, kind=kind,
+                                       value=normalize(kind, value),
+                                       ip_key=ip_key(value) if kind in IP_FIELDS else None))
+    return entries
+
+
+def index_asset(instance):
+    """Replace the lookup rows of a single asset."""
+    asset_type = instance._meta.model_name
+    values = {name: getattr(instance, name) for name in lookup_fields(type(instance))}
+    with transaction.atomic():
+        AssetLookup.objects.filter(asset_type=asset_type, asset_id=instance.pk).delete()
+        AssetLookup.objects.bulk_create(build_entries(asset_type, instance.pk, values))
+
+
+def unindex_assets(model, asset_ids):
+    AssetLookup.objects.filter(asset_type=model._meta.model_name, asset_id__in=asset_ids).delete()
+
+
+def reindex_assets(queryset):
+    """Replace the lookup rows of every asset in ``queryset`` with a few bulk statements."""
+    model = queryset.model
+    asset_type = model._meta.model_name
+    rows = list(queryset.values('id', *lookup_fields(model)))
+    asset_ids = [row['id'] for row in rows]
+    entries = [entry for row in rows for entry in build_entries(asset_type, row.pop('id'), row)]
+    with transaction.atomic():
+        unindex_assets(model, asset_ids)
+        AssetLookup.objects.bulk_create(entries, batch_size=REBUILD_CHUNK_SIZE)
+    return len(rows)
+
+
+def rebuild_lookup(model, chunk_size=REBUILD_CHUNK_SIZE):
+    """Rebuild every lookup row of ``model`` from scratch; returns the number of assets indexed."""
+    asset_type = model._meta.model_name
+    fields = lookup_fields(model)
+    indexed = 0
+    with transaction.atomic():
+        AssetLookup.objects.filter(asset_type=asset_type).delete()
+        entries = []
+        for row in model.objects.order_by().values('id', *fields).iterator(chunk_size=chunk_size):
+            entries.extend(build_entries(asset_type, row.pop('id'), row))
+            indexed += 1
+            if len(entries) >= chunk_size:
+                AssetLookup.objects.bulk_create(entries)
+                entries = []
+        AssetLookup.objects.bulk_create(entries)
+    return indexed
+
+
+def _lookup_queryset(value, kinds=None):
+    kinds = kinds or LOOKUP_FIELDS
+    candidates = {normalize(kind, value) for kind in kinds}
+    return (AssetLookup.objects
+            .filter(value__in=candidates, kind__in=kinds)
+            .values_list('asset_type', 'asset_id', 'kind'))
+
+
+def find_assets(value, kinds=None):
+    """Return ``(asset_type, asset_id, kind)`` for every asset carrying ``value``.
+
+    ``kinds`` restricts the search to some identifier fields, e.g.
+    ``('hostname', 'fqdn')``.
+    """
+    return list(_lookup_queryset(value, kinds))
+
+
+async def afind_assets(value, kinds=None):
+    return [row async for row in _lookup_queryset(value, kinds)]
+
+
+def subnet_lookups(cidr, fields=None):
+    """Lookup rows whose address lies in ``cidr``, across every asset type."""
+    low, high = subnet_bounds(cidr)
+    return AssetLookup.objects.filter(ip_key__gte=low, ip_key__lte=high, kind__in=fields or IP_FIELDS)
+
+
+def assets_in_subnet(cidr, fields=None):
+    """Return ``(asset_type, asset_id, kind, address)`` for every address in ``cidr``."""
+    return list(subnet_lookups(cidr, fields).order_by('ip_key')
+                .values_list('asset_type', 'asset_id', 'kind', 'value'))
+
+
+def members_lookups(kind, values):
+    """Lookup rows of list field ``kind`` holding any of ``values``.
+
+    Raises ``ValueError`` for a field that is not a list field.
+    """
+    if kind not in LIST_FIELDS:
+        raise ValueError(f"'{kind}' is not a list field; expected one of: {', '.join(LIST_FIELDS)}")
+    return AssetLookup.objects.filter(kind=kind, value__in={normalize(kind, value) for value in values})
+
+
+def assets_with(kind, *values):
+    """Return ``(asset_type, asset_id, value)`` for every asset whose ``kind`` list holds any of ``values``.
+
+    E.g. ``assets_with('listening_ports', 3389)`` or ``assets_with('tags', 'pci')``.
+    """
+    return list(members_lookups(kind, values).order_by('asset_type', 'asset_id')
+                .values_list('asset_type', 'asset_id', 'value'))
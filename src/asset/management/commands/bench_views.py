@@ -0,0 +1,92 @@
+import asyncio
+import time
+import uuid
+from contextlib import contextmanager
+from unittest import mock
+
+from asgiref.sync import SyncToAsync
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+
+from asset.models import Server
+
+DEFAULT_PATHS = ('/', '/overview_servers', '/assets/lookup/?q={asset_tag}')
+
+
+@contextmanager
+def count_thread_hops():
+    """Count every ``sync_to_async`` call made while the block runs."""
+    counter = {'hops': 0}
+    original = SyncToAsync.__call__
+
+    async def counting_call(self, *args, **kwargs):
+        counter['hops'] += 1
+        return await original(self, *args, **kwargs)
+
+    with mock.patch.object(SyncToAsync, '__call__', counting_call):
+        yield counter
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+class Command(BaseCommand):
+    help = "Measure thread-pool hops per request and latency percentiles of the async asset views."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help="Paths to request; '{asset_tag}' and '{server_id}' are filled in from a sample server.")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per path.")
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--username', help="Existing user to log in as; a throwaway user is used otherwise.")
+
+    def handle(self, *args, paths, requests, concurrency, username, **options):
+        server = Server.objects.order_by().values('id', 'asset_tag').first()
+        if server is None:
+            raise CommandError("No servers to benchmark against; run seed_assets first.")
+        paths = [path.format(server_id=server['id'], asset_tag=server['asset_tag'])
+                 for path in paths or DEFAULT_PATHS]
+
+        created = None
+        if username:
+            user = User.objects.get(username=username)
+        else:
+            user = created = User.objects.create_user(f'bench-{uuid.uuid4().hex[:12]}')
+        try:
+            results = asyncio.run(self.run(paths, user, requests, concurrency))
+        finally:
+            if created is not None:
+                created.delete()
+
+        self.stdout.write(f"{'path':40} {'status':>6} {'hops/req':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for path, status, hops, latencies in results:
+            self.stdout.write(
+                f"{path[:40]:40} {status:>6} {hops / len(latencies):>9.2f} "
+                f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}"
+            )
+
+    async def run(self, paths, user, requests, concurrency):
+        client = AsyncClient(raise_request_exception=False, headers={'host': 'localhost'})
+        await client.aforce_login(user)
+        semaphore = asyncio.Semaphore(concurrency)
+        results = []
+        for path in paths:
+            latencies = []
+            statuses = set()
+
+            async def fetch():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    statuses.add(response.status_code)
+
+            await client.get(path)  # warm up caches, templates and connections
+            with count_thread_hops() as counter:
+                await asyncio.gather(*(fetch() for _ in range(requests)))
+            status = ','.join(str(code) for code in sorted(statuses))
+            results.append((path, status, counter['hops'], latencies))
+        return results
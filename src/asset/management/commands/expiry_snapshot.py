@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.mail import send_mail
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from asset.expiry import build_snapshot, email_body, expiries
+
+
+class Command(BaseCommand):
+    help = "Precompute today's ExpirySnapshot and optionally email the upcoming expiries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="Snapshot window; defaults to settings.ASSET_EXPIRY_WINDOW_DAYS.")
+        parser.add_argument('--email', nargs='*', metavar='ADDRESS',
+                            help="Email the expiries within --alert-days; without addresses, "
+                                 "settings.ASSET_EXPIRY_ALERT_RECIPIENTS is used.")
+        parser.add_argument('--alert-days', type=int, default=30)
+
+    def handle(self, *args, days, email, alert_days, **options):
+        rows = build_snapshot(days=days)
+        self.stdout.write(self.style.SUCCESS(f"Snapshot of {timezone.localdate()}: {rows} expiries"))
+        if email is None:
+            return
+        recipients = email or getattr(settings, 'ASSET_EXPIRY_ALERT_RECIPIENTS', [])
+        if not recipients:
+            raise CommandError("No recipients given and ASSET_EXPIRY_ALERT_RECIPIENTS is empty.")
+        items = expiries(alert_days)
+        send_mail(
+            subject=f"[Asset Management] {len(items)} expiries in the next {alert_days} days",
+            message=email_body(items, alert_days),
+            from_email=None,
+            recipient_list=recipients,
+        )
+        self.stdout.write(f"Emailed {len(items)} expiries to {', '.join(recipients)}")
@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from asset.export import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_queryset, iter_export, parse_fields, resolve_fields
+from asset.models import ASSET_MODELS
+
+
+class Command(BaseCommand):
+    help = "Stream the full inventory of one asset type as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('asset_type', choices=sorted(ASSET_MODELS))
+        parser.add_argument('--format', dest='fmt', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--fields', default='', help="Comma-separated columns to export (default: all)")
+        parser.add_argument('--output', '-o', help="File to write to (default: stdout)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, asset_type, fmt, fields, output, chunk_size, **options):
+        model = ASSET_MODELS[asset_type]
+        try:
+            fields = resolve_fields(model, parse_fields(fields))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        chunks = iter_export(export_queryset(model, fields), fmt, fields, chunk_size)
+        if output:
+            with open(output, 'w', newline='', encoding='utf-8') as fh:
+                fh.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
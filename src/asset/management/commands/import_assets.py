@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from asset.importer import DEFAULT_CHUNK_SIZE, IMPORT_FORMATS, format_from_filename, import_assets, read_rows
+from asset.models import ASSET_MODELS
+
+
+class Command(BaseCommand):
+    help = "Bulk import or update assets from a CSV, JSON or NDJSON file, keyed on asset_tag."
+
+    def add_arguments(self, parser):
+        parser.add_argument('asset_type', choices=sorted(ASSET_MODELS))
+        parser.add_argument('path')
+        parser.add_argument('--format', dest='fmt', choices=IMPORT_FORMATS,
+                            help="Input format (default: derived from the file extension)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, asset_type, path, fmt, chunk_size, **options):
+        fmt = fmt or format_from_filename(path)
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError(f"Cannot tell the format of '{path}'; pass --format.")
+
+        try:
+            with open(path, newline='', encoding='utf-8') as fh:
+                result = import_assets(ASSET_MODELS[asset_type], read_rows(fh, fmt), chunk_size)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            self.stderr.write(f"row {error.row} ({error.asset_tag or '-'}): {json.dumps(error.errors)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.rows_written} of {result.rows_read} rows written, {result.error_count} errors "
+            f"in {result.seconds:.1f}s ({result.rows_per_second:,.0f} rows/s)"
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from asset.partitions import ensure_partitions, is_partitioned, prune_changelog
+
+
+class Command(BaseCommand):
+    help = "Create upcoming AssetChangeLog partitions and archive entries past the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-months', type=int, default=None,
+                            help="Defaults to settings.ASSET_CHANGELOG_RETENTION_MONTHS.")
+        parser.add_argument('--archive-dir', default=None,
+                            help="Defaults to settings.ASSET_CHANGELOG_ARCHIVE_DIR.")
+        parser.add_argument('--months-ahead', type=int, default=None,
+                            help="Defaults to settings.ASSET_CHANGELOG_PARTITION_MONTHS_AHEAD.")
+        parser.add_argument('--no-prune', action='store_true', help="Only create partitions.")
+
+    def handle(self, *args, retention_months, archive_dir, months_ahead, no_prune, **options):
+        if is_partitioned():
+            created = ensure_partitions(months_ahead)
+            self.stdout.write(f"Partitions present: {', '.join(created)}")
+        if no_prune:
+            return
+        result = prune_changelog(retention_months, archive_dir)
+        for path in result.archived:
+            self.stdout.write(f"Archived {path}")
+        self.stdout.write(self.style.SUCCESS(f"Removed {result.rows} change log entries"))
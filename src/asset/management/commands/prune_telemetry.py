@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from asset.telemetry import prune_telemetry
+
+
+class Command(BaseCommand):
+    help = "Delete raw telemetry samples and fine-grained rollups past ASSET_TELEMETRY_RETENTION_DAYS."
+
+    def handle(self, *args, **options):
+        for kind, rows in prune_telemetry().items():
+            self.stdout.write(f"{kind}: deleted {rows} rows")
+        self.stdout.write(self.style.SUCCESS("Telemetry pruned"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from asset.lookup import REBUILD_CHUNK_SIZE, rebuild_lookup
+from asset.models import ASSET_MODELS
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the cross-type AssetLookup table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--types', nargs='+', choices=sorted(ASSET_MODELS), default=sorted(ASSET_MODELS))
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE)
+
+    def handle(self, *args, types, chunk_size, **options):
+        for model_name in types:
+            indexed = rebuild_lookup(ASSET_MODELS[model_name], chunk_size)
+            self.stdout.write(self.style.SUCCESS(f"{model_name}: indexed {indexed} assets"))
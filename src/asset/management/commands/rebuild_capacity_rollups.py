@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from asset.capacity import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the CapacityRollup totals from the servers table to repair drift."
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} capacity rollup rows"))
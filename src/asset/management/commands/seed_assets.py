@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from asset.models import ASSET_MODELS
+from asset.seeding import DEFAULT_BATCH_SIZE, rebuild_derived, seed_assets, supports_copy
+
+
+class Command(BaseCommand):
+    help = "Generate large, reproducible synthetic asset datasets for load-testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help="Number of rows to generate per asset type")
+        parser.add_argument('--types', nargs='+', choices=sorted(ASSET_MODELS), default=sorted(ASSET_MODELS),
+                            help="Asset types to seed (default: all)")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed yields the same data")
+        parser.add_argument('--start', type=int, default=0,
+                            help="Index of the first generated row, to append to an existing dataset")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=1, help="Number of worker processes")
+        copy_group = parser.add_mutually_exclusive_group()
+        copy_group.add_argument('--copy', dest='use_copy', action='store_true', default=None,
+                                help="Load rows with PostgreSQL COPY (default on PostgreSQL)")
+        copy_group.add_argument('--no-copy', dest='use_copy', action='store_false',
+                                help="Always use bulk_create")
+        parser.add_argument('--log-changes', action='store_true',
+                            help="Write a Created entry to the asset change log for every generated row")
+        derived_group = parser.add_mutually_exclusive_group()
+        derived_group.add_argument('--skip-derived', action='store_true',
+                                   help="Do not index the new rows in derived tables such as the lookup index")
+        derived_group.add_argument('--rebuild', action='store_true',
+                                   help="Rebuild the derived tables of every seeded type from scratch afterwards")
+
+    def handle(self, *args, count, types, seed, start, batch_size, workers, use_copy, log_changes, skip_derived,
+               rebuild, **options):
+        if count < 1 or batch_size < 1 or workers < 1:
+            raise CommandError("count, --batch-size and --workers must be positive.")
+        if use_copy and not supports_copy():
+            raise CommandError("--copy requires a PostgreSQL database.")
+
+        user_id = User.objects.order_by('pk').values_list('pk', flat=True).first()
+        for model_name in types:
+            result = seed_assets(ASSET_MODELS[model_name], count, seed=seed, start=start,
+                                 batch_size=batch_size, workers=workers, use_copy=use_copy, user_id=user_id,
+                                 derived=not (skip_derived or rebuild), log_changes=log_changes)
+            self.stdout.write(self.style.SUCCESS(
+                f"{result.model_name}: {result.rows} rows in {result.seconds:.1f}s "
+                f"({result.rows_per_second:,.0f} rows/s)"
+            ))
+            if rebuild:
+                rebuild_derived(ASSET_MODELS[model_name])
@@ -0,0 +1,27 @@
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+# The request being handled, so model-level hooks can attribute changes.
+current_request = ContextVar('current_request', default=None)
+
+
+@sync_and_async_middleware
+def change_context_middleware(get_response):
+    """Expose the current request to the change log while it is handled."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = current_request.set(request)
+            try:
+                return await get_response(request)
+            finally:
+                current_request.reset(token)
+    else:
+        def middleware(request):
+            token = current_request.set(request)
+            try:
+                return get_response(request)
+            finally:
+                current_request.reset(token)
+    return middleware
@@ -0,0 +1,95 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='enduserdevice',
+            options={'ordering': ['-created_at'], 'verbose_name': 'End User Device', 'verbose_name_plural': 'End User Devices'},
+        ),
+        migrations.AlterModelOptions(
+            name='iotdevice',
+            options={'ordering': ['-created_at'], 'verbose_name': 'IoT Device', 'verbose_name_plural': 'IoT Devices'},
+        ),
+        migrations.AlterModelOptions(
+            name='networkdevice',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Network Device', 'verbose_name_plural': 'Network Devices'},
+        ),
+        migrations.AlterModelOptions(
+            name='server',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Server', 'verbose_name_plural': 'Servers'},
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['status', 'authorized'], name='asset_endus_status_3b98f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['primary_ip_address'], name='asset_endus_primary_8b4222_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['hostname'], name='asset_endus_hostnam_b11dc7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['created_at', 'id'], name='asset_endus_created_6a3a72_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['status', 'authorized'], name='asset_iotde_status_f302a0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['primary_ip_address'], name='asset_iotde_primary_de99f4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['hostname'], name='asset_iotde_hostnam_b38ab3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['created_at', 'id'], name='asset_iotde_created_16d83c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['status', 'authorized'], name='asset_netwo_status_922138_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['primary_ip_address'], name='asset_netwo_primary_89f6e6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['hostname'], name='asset_netwo_hostnam_6d6c9d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['created_at', 'id'], name='asset_netwo_created_e16e81_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['status', 'authorized'], name='asset_serve_status_a72f66_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['primary_ip_address'], name='asset_serve_primary_e86ed7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['hostname'], name='asset_serve_hostnam_b21587_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['created_at', 'id'], name='asset_serve_created_3e960d_idx'),
+        ),
+    ]
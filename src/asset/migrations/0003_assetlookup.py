@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetLookup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(max_length=100)),
+                ('asset_id', models.UUIDField()),
+                ('kind', models.CharField(help_text='Source field, e.g. hostname or mac_address', max_length=50)),
+                ('value', models.CharField(help_text='Normalized identifier value', max_length=500)),
+            ],
+            options={
+                'verbose_name': 'Asset Lookup',
+                'verbose_name_plural': 'Asset Lookups',
+                'indexes': [models.Index(fields=['value', 'kind'], name='asset_asset_value_cbfa17_idx'), models.Index(fields=['asset_type', 'asset_id'], name='asset_asset_asset_t_d156a9_idx')],
+            },
+        ),
+    ]
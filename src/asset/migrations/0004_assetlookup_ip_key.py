@@ -0,0 +1,49 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:48
+
+import ipaddress
+
+from django.db import migrations, models
+
+IP_FIELDS = ('primary_ip_address', 'secondary_ip_address', 'management_ip')
+
+
+def _ip_key(value):
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+    if address.version == 4:
+        address = ipaddress.IPv6Address(f'::ffff:{address}')
+    return f'{int(address):032x}'
+
+
+def backfill_ip_keys(apps, schema_editor):
+    AssetLookup = apps.get_model('asset', 'AssetLookup')
+    batch = []
+    for entry in AssetLookup.objects.filter(kind__in=IP_FIELDS).only('id', 'value').iterator(chunk_size=5000):
+        entry.ip_key = _ip_key(entry.value)
+        batch.append(entry)
+        if len(batch) >= 5000:
+            AssetLookup.objects.bulk_update(batch, ['ip_key'])
+            batch = []
+    AssetLookup.objects.bulk_update(batch, ['ip_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0003_assetlookup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetlookup',
+            name='ip_key',
+            field=models.CharField(blank=True, help_text='Sortable hex form of IP values, IPv4 mapped into IPv6 space', max_length=32, null=True),
+        ),
+        migrations.RunPython(backfill_ip_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='assetlookup',
+            index=models.Index(fields=['ip_key', 'asset_type'], name='asset_asset_ip_key_75aaac_idx'),
+        ),
+    ]
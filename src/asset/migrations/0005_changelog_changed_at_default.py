@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0004_assetlookup_ip_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assetchangelog',
+            name='changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:10
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = 'asset_assetchangelog'
+OLD_TABLE = f'{TABLE}_old'
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_changelog(apps, schema_editor):
+    """Rebuild the change log as a table range-partitioned by month on changed_at.
+
+    PostgreSQL only: other databases keep the plain table, and retention falls
+    back to deleting rows in chunks (see asset.partitions).
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(OLD_TABLE)}")
+        cursor.execute(
+            "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "WHERE i.indrelid = %s::regclass AND NOT i.indisprimary", [OLD_TABLE]
+        )
+        index_sql = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'", [OLD_TABLE]
+        )
+        foreign_keys = cursor.fetchall()
+
+        # The partition key has to be part of the primary key.
+        cursor.execute(
+            f"CREATE TABLE {quote(TABLE)} (LIKE {quote(OLD_TABLE)} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY) PARTITION BY RANGE (changed_at)"
+        )
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} ADD PRIMARY KEY (id, changed_at)")
+
+        cursor.execute(f"SELECT min(changed_at) FROM {quote(OLD_TABLE)}")
+        earliest = cursor.fetchone()[0]
+        today = datetime.date.today()
+        month = datetime.date((earliest or today).year, (earliest or today).month, 1)
+        last = _add_months(datetime.date(today.year, today.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {quote(f'{TABLE}_p{month:%Y%m}')} PARTITION OF {quote(TABLE)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [month.isoformat(), _add_months(month, 1).isoformat()],
+            )
+            month = _add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {quote(f'{TABLE}_default')} PARTITION OF {quote(TABLE)} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {quote(TABLE)} OVERRIDING SYSTEM VALUE SELECT * FROM {quote(OLD_TABLE)}")
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 0) + 1, false) "
+            f"FROM {quote(TABLE)}", [TABLE]
+        )
+
+        cursor.execute(f"DROP TABLE {quote(OLD_TABLE)}")
+        for sql in index_sql:
+            cursor.execute(sql.replace(OLD_TABLE, TABLE))
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(name)} {definition}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0005_changelog_changed_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_changelog, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='assetchangelog',
+            name='asset_asset_asset_t_781ef5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='assetchangelog',
+            index=models.Index(fields=['asset_type', 'asset_id', 'changed_at'], name='asset_asset_asset_t_36b47c_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0006_partition_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CapacityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('site', 'Site'), ('cluster', 'Cluster'), ('hypervisor_host', 'Hypervisor Host')], max_length=20)),
+                ('key', models.CharField(help_text='Site, cluster name or hypervisor host id', max_length=200)),
+                ('server_count', models.BigIntegerField(default=0)),
+                ('total_cores', models.BigIntegerField(default=0)),
+                ('total_ram_gb', models.BigIntegerField(default=0)),
+                ('total_storage_capacity_gb', models.BigIntegerField(default=0)),
+                ('total_storage_used_gb', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Capacity Rollup',
+                'verbose_name_plural': 'Capacity Rollups',
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key'), name='unique_capacity_rollup')],
+            },
+        ),
+    ]
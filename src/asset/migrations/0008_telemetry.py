@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0007_capacityrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelemetryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(max_length=100)),
+                ('asset_id', models.UUIDField()),
+                ('metric', models.CharField(max_length=50)),
+                ('resolution', models.CharField(choices=[('1m', '1 minute'), ('1h', '1 hour'), ('1d', '1 day')], max_length=2)),
+                ('bucket_start', models.DateTimeField()),
+                ('sample_count', models.IntegerField(default=0)),
+                ('value_sum', models.BigIntegerField(default=0)),
+                ('value_min', models.SmallIntegerField()),
+                ('value_max', models.SmallIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Telemetry Rollup',
+                'verbose_name_plural': 'Telemetry Rollups',
+                'indexes': [models.Index(fields=['resolution', 'bucket_start'], name='asset_telem_resolut_c45bb2_idx')],
+                'constraints': [models.UniqueConstraint(fields=('asset_type', 'asset_id', 'metric', 'resolution', 'bucket_start'), name='unique_telemetry_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TelemetrySample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(max_length=100)),
+                ('asset_id', models.UUIDField()),
+                ('metric', models.CharField(help_text='Utilization field, e.g. cpu_utilization', max_length=50)),
+                ('recorded_at', models.DateTimeField()),
+                ('value', models.SmallIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Telemetry Sample',
+                'verbose_name_plural': 'Telemetry Samples',
+                'indexes': [models.Index(fields=['asset_type', 'asset_id', 'metric', 'recorded_at'], name='asset_telem_asset_t_88a279_idx'), models.Index(fields=['recorded_at'], name='asset_telem_recorde_5bdcf5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0008_telemetry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpirySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot_date', models.DateField()),
+                ('asset_type', models.CharField(max_length=100)),
+                ('asset_id', models.UUIDField()),
+                ('asset_tag', models.CharField(max_length=100)),
+                ('asset_name', models.CharField(max_length=255)),
+                ('field', models.CharField(help_text='Expiring date field, e.g. warranty_expiration', max_length=50)),
+                ('expires_on', models.DateField()),
+            ],
+            options={
+                'verbose_name': 'Expiry Snapshot',
+                'verbose_name_plural': 'Expiry Snapshots',
+                'ordering': ['expires_on'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['warranty_expiration'], name='asset_endus_warrant_892c44_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['support_expiration'], name='asset_endus_support_324a28_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['lease_expiration'], name='asset_endus_lease_e_19b420_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['end_of_life_date'], name='asset_endus_end_of__71532e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['warranty_expiration'], name='asset_iotde_warrant_2a4317_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['support_expiration'], name='asset_iotde_support_c92e3b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['lease_expiration'], name='asset_iotde_lease_e_2271db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['end_of_life_date'], name='asset_iotde_end_of__86ee78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['warranty_expiration'], name='asset_netwo_warrant_82925c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['support_expiration'], name='asset_netwo_support_84146c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['lease_expiration'], name='asset_netwo_lease_e_d43ec4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['end_of_life_date'], name='asset_netwo_end_of__d19729_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['warranty_expiration'], name='asset_serve_warrant_9e56db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['support_expiration'], name='asset_serve_support_488ee7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['lease_expiration'], name='asset_serve_lease_e_1ab5c2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['end_of_life_date'], name='asset_serve_end_of__dc581f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['ssl_certificate_expiration'], name='asset_serve_ssl_cer_895426_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['license_expiration'], name='asset_serve_license_faddee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expirysnapshot',
+            index=models.Index(fields=['snapshot_date', 'expires_on'], name='asset_expir_snapsho_904851_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:10
+
+import ipaddress
+
+from django.db import migrations
+
+ASSET_MODELS = ('server', 'enduserdevice', 'networkdevice', 'iotdevice')
+LIST_FIELDS = ('tags', 'dns_servers', 'listening_ports', 'connected_vlans')
+
+
+def _normalize(kind, value):
+    value = value.strip()
+    if kind == 'dns_servers':
+        try:
+            return ipaddress.ip_address(value).compressed
+        except ValueError:
+            return value.lower()
+    if kind in ('listening_ports', 'connected_vlans') and value.isdigit():
+        return str(int(value))
+    return value.lower()
+
+
+def backfill_list_members(apps, schema_editor):
+    AssetLookup = apps.get_model('asset', 'AssetLookup')
+    AssetLookup.objects.filter(kind__in=LIST_FIELDS).delete()
+    for model_name in ASSET_MODELS:
+        model = apps.get_model('asset', model_name)
+        names = {field.name for field in model._meta.concrete_fields}
+        fields = [name for name in LIST_FIELDS if name in names]
+        batch = []
+        for row in model.objects.order_by().values('id', *fields).iterator(chunk_size=5000):
+            for kind in fields:
+                members = (_normalize(kind, member) for member in (row[kind] or '').split(','))
+                batch.extend(
+                    AssetLookup(asset_type=model_name, asset_id=row['id'], kind=kind, value=member[:500])
+                    for member in dict.fromkeys(member for member in members if member)
+                )
+            if len(batch) >= 5000:
+                AssetLookup.objects.bulk_create(batch)
+                batch = []
+        AssetLookup.objects.bulk_create(batch)
+
+
+def remove_list_members(apps, schema_editor):
+    apps.get_model('asset', 'AssetLookup').objects.filter(kind__in=LIST_FIELDS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0009_expiry_indexes_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_list_members, remove_list_members),
+    ]
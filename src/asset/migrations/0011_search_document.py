@@ -0,0 +1,100 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:20
+
+from django.db import migrations, models
+
+TABLE = 'asset_assetsearchdocument'
+FTS_TABLE = f'{TABLE}_fts'
+ASSET_MODELS = ('server', 'enduserdevice', 'networkdevice', 'iotdevice')
+BODY_FIELDS = ('model', 'description', 'notes', 'installed_software', 'installed_services', 'hosted_websites')
+
+
+def create_search_index(apps, schema_editor):
+    """Full-text index of the search documents.
+
+    PostgreSQL: a weighted ``tsvector`` generated column with a GIN index.
+    SQLite: an external-content FTS5 table kept in sync by triggers.
+    Other databases get no index and search falls back to ``icontains``.
+    """
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                f"ALTER TABLE {quote(TABLE)} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('simple', asset_tag), 'A') || "
+                f"setweight(to_tsvector('english', name), 'A') || "
+                f"setweight(to_tsvector('english', body), 'B')) STORED"
+            )
+            cursor.execute(f"CREATE INDEX {quote(f'{TABLE}_search_gin')} ON {quote(TABLE)} USING gin (search_vector)")
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {quote(FTS_TABLE)} USING fts5("
+                f"asset_tag, name, body, content={quote(TABLE)}, content_rowid='id', tokenize='porter unicode61')"
+            )
+            old = f"INSERT INTO {quote(FTS_TABLE)} ({quote(FTS_TABLE)}, rowid, asset_tag, name, body) " \
+                  f"VALUES ('delete', old.id, old.asset_tag, old.name, old.body);"
+            new = f"INSERT INTO {quote(FTS_TABLE)} (rowid, asset_tag, name, body) " \
+                  f"VALUES (new.id, new.asset_tag, new.name, new.body);"
+            for event, statements in (('INSERT', new), ('DELETE', old), ('UPDATE', old + ' ' + new)):
+                cursor.execute(
+                    f"CREATE TRIGGER {quote(f'{FTS_TABLE}_{event.lower()}')} AFTER {event} ON {quote(TABLE)} "
+                    f"BEGIN {statements} END"
+                )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"ALTER TABLE {quote(TABLE)} DROP COLUMN search_vector")
+        elif connection.vendor == 'sqlite':
+            for event in ('insert', 'delete', 'update'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {quote(f'{FTS_TABLE}_{event}')}")
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(FTS_TABLE)}")
+
+
+def backfill_documents(apps, schema_editor):
+    AssetSearchDocument = apps.get_model('asset', 'AssetSearchDocument')
+    for model_name in ASSET_MODELS:
+        model = apps.get_model('asset', model_name)
+        names = {field.name for field in model._meta.concrete_fields}
+        fields = [name for name in BODY_FIELDS if name in names]
+        batch = []
+        for row in model.objects.order_by().values('id', 'asset_tag', 'name', *fields).iterator(chunk_size=5000):
+            batch.append(AssetSearchDocument(
+                asset_type=model_name, asset_id=row['id'], asset_tag=row['asset_tag'], name=row['name'] or '',
+                body='\n'.join(str(row[name]) for name in fields if row[name]),
+            ))
+            if len(batch) >= 5000:
+                AssetSearchDocument.objects.bulk_create(batch)
+                batch = []
+        AssetSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0010_backfill_list_field_lookups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(max_length=100)),
+                ('asset_id', models.UUIDField()),
+                ('asset_tag', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=255)),
+                ('body', models.TextField(help_text='Model, description, notes, software, services and websites')),
+            ],
+            options={
+                'verbose_name': 'Asset Search Document',
+                'verbose_name_plural': 'Asset Search Documents',
+                'constraints': [models.UniqueConstraint(fields=('asset_type', 'asset_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
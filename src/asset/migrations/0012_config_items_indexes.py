@@ -0,0 +1,82 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:30
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+TABLES = ('asset_server', 'asset_enduserdevice', 'asset_networkdevice', 'asset_iotdevice')
+
+
+def _gin_index_name(table):
+    return f'{table}_config_items_gin'
+
+
+def create_config_gin_indexes(apps, schema_editor):
+    """GIN ``jsonb_path_ops`` index on configuration_items for ``@>`` containment (PostgreSQL only)."""
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(
+                f"CREATE INDEX {quote(_gin_index_name(table))} ON {quote(table)} "
+                f"USING gin (configuration_items jsonb_path_ops)"
+            )
+
+
+def drop_config_gin_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(_gin_index_name(table))}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0011_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enduserdevice',
+            name='config_patch_group',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('patch_group', 'configuration_items'), output_field=models.CharField(blank=True, max_length=100, null=True)),
+        ),
+        migrations.AddField(
+            model_name='iotdevice',
+            name='config_patch_group',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('patch_group', 'configuration_items'), output_field=models.CharField(blank=True, max_length=100, null=True)),
+        ),
+        migrations.AddField(
+            model_name='networkdevice',
+            name='config_patch_group',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('patch_group', 'configuration_items'), output_field=models.CharField(blank=True, max_length=100, null=True)),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='config_patch_group',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('patch_group', 'configuration_items'), output_field=models.CharField(blank=True, max_length=100, null=True)),
+        ),
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['config_patch_group'], name='asset_endus_config__fc8c4b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['config_patch_group'], name='asset_iotde_config__a35445_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['config_patch_group'], name='asset_netwo_config__44c78f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['config_patch_group'], name='asset_serve_config__523bec_idx'),
+        ),
+        migrations.RunPython(create_config_gin_indexes, drop_config_gin_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0012_config_items_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expirysnapshot',
+            name='window_days',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Days ahead the snapshot covers'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0013_expirysnapshot_window_days'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='networkdevice',
+            name='utilization_recorded_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Time of the reading behind the utilization fields', null=True),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='utilization_recorded_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Time of the reading behind the utilization fields', null=True),
+        ),
+    ]
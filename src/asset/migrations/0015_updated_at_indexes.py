@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0014_utilization_recorded_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enduserdevice',
+            index=models.Index(fields=['updated_at'], name='asset_endus_updated_6ab0f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iotdevice',
+            index=models.Index(fields=['updated_at'], name='asset_iotde_updated_250ea5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(fields=['updated_at'], name='asset_netwo_updated_79ed82_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['updated_at'], name='asset_serve_updated_522c6e_idx'),
+        ),
+    ]
@@ -1,9 +1,78 @@
-from django.db import models
+from django.db import DatabaseError, models, transaction
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
+from django.db.models.fields.json import KT
+from django.utils import timezone
+from asgiref.sync import sync_to_async
 import uuid
 
 
+class AssetQuerySet(models.QuerySet):
+    """QuerySet shared by all asset models."""
+
+    def list_rows(self, fields=None):
+        """Fetch only the model's list projection as lightweight named tuples.
+
+        ``fields`` overrides the model's ``LIST_FIELDS`` for callers that need
+        a different set of columns.
+        """
+        return self.values_list(*(fields or self.model.LIST_FIELDS), named=True)
+
+    def in_subnet(self, cidr, fields=None):
+        """Assets with an address inside ``cidr``, resolved through the lookup index.
+
+        ``fields`` limits the match to some IP fields, e.g. ``['management_ip']``.
+        """
+        from asset.lookup import subnet_lookups
+        matches = subnet_lookups(cidr, fields).filter(asset_type=self.model._meta.model_name)
+        return self.filter(pk__in=matches.values('asset_id'))
+
+    def with_config(self, items=None, /, **pairs):
+        """Assets whose ``configuration_items`` contain every given key/value pair.
+
+        E.g. ``Server.objects.with_config(patch_group='A')``; pass a dict for
+        keys that are not valid argument names.
+        """
+        from asset.config import filter_config
+        return filter_config(self, {**(items or {}), **pairs})
+
+    def with_config_keys(self, *keys):
+        """Assets whose ``configuration_items`` have every one of ``keys``."""
+        from asset.config import filter_config_keys
+        return filter_config_keys(self, keys)
+
+    def with_members(self, field, *values):
+        """Assets whose comma-separated ``field`` holds any of ``values``, resolved through the lookup index.
+
+        E.g. ``Server.objects.with_members('listening_ports', 3389)``.
+        """
+        from asset.lookup import members_lookups
+        matches = members_lookups(field, values).filter(asset_type=self.model._meta.model_name)
+        return self.filter(pk__in=matches.values('asset_id'))
+
+
+class ChangeLogQuerySet(models.QuerySet):
+    """QuerySet for ``AssetChangeLog``."""
+
+    def for_asset(self, asset_type, asset_id, since=None, until=None):
+        """History of one asset, newest first.
+
+        Bounding ``changed_at`` with ``since``/``until`` lets PostgreSQL skip
+        every monthly partition outside the window.
+        """
+        queryset = self.filter(asset_type=asset_type, asset_id=asset_id)
+        if since is not None:
+            queryset = queryset.filter(changed_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(changed_at__lt=until)
+        return queryset.order_by('-changed_at')
+
+
+class StaleAssetError(Exception):
+    """Raised by ``save_changes()`` when the asset was changed or deleted since it was loaded."""
+
+
 class BaseAsset(models.Model):
     """Abstract base model for all asset types with common attributes"""
 
@@ -117,6 +186,12 @@ class BaseAsset(models.Model):
     notes = models.TextField(blank=True, null=True)
     tags = models.CharField(max_length=500, blank=True, null=True, help_text="Comma-separated tags")
     configuration_items = models.JSONField(blank=True, null=True, help_text="Additional configuration data")
+    # Frequently filtered configuration keys, copied into indexed columns by the database (see asset.config)
+    config_patch_group = models.GeneratedField(
+        expression=KT('configuration_items__patch_group'),
+        output_field=models.CharField(max_length=100, blank=True, null=True),
+        db_persist=True,
+    )
 
     # Audit fields
     created_at = models.DateTimeField(auto_now_add=True)
@@ -126,6 +201,14 @@ class BaseAsset(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
                                    related_name='updated_%(class)s_assets')
 
+    objects = AssetQuerySet.as_manager()
+
+    # Columns shown on list and overview pages, fetched by AssetQuerySet.list_rows()
+    LIST_FIELDS = (
+        'id', 'asset_tag', 'name', 'hostname', 'primary_ip_address', 'status', 'environment',
+        'physical_location', 'created_at', 'updated_at',
+    )
+
     class Meta:
         abstract = True
         ordering = ['-created_at']
@@ -133,11 +216,97 @@ class BaseAsset(models.Model):
             models.Index(fields=['status', 'authorized']),
             models.Index(fields=['primary_ip_address']),
             models.Index(fields=['hostname']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['warranty_expiration']),
+            models.Index(fields=['support_expiration']),
+            models.Index(fields=['lease_expiration']),
+            models.Index(fields=['end_of_life_date']),
+            models.Index(fields=['config_patch_group']),
         ]
 
     def __str__(self):
         return f"{self.asset_tag} - {self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the values as loaded so saves can tell which fields changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Diffed once per save; the signal receivers read it from here.
+        self._changed_fields = {} if self._state.adding else self.get_changed_fields()
+        self._save_row(*args, **kwargs)
+        # Signal receivers have seen the old snapshot; later saves diff against this one.
+        self._loaded_values = {field.attname: getattr(self, field.attname)
+                               for field in self._meta.concrete_fields
+                               if field.attname in self.__dict__}
+
+    def _save_row(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+    def get_changed_fields(self):
+        """Map of attname to ``(old, new)`` for loaded fields whose value changed.
+
+        Only fields that were loaded from the database are compared; a fresh,
+        unsaved instance reports no changes.
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if not loaded:
+            return {}
+        changed = {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in loaded or field.attname not in self.__dict__:
+                continue
+            old, new = loaded[field.attname], getattr(self, field.attname)
+            if old != new:
+                try:
+                    new = field.to_python(new)
+                except ValidationError:
+                    pass
+                if old != new:
+                    changed[field.attname] = (old, new)
+        return changed
+
+    def save_changes(self, expected_updated_at=None):
+        """Write only the fields changed since the asset was loaded, if nobody else saved it meanwhile.
+
+        The ``UPDATE`` is conditional on ``updated_at`` still being
+        ``expected_updated_at`` (by default the value loaded with the row), so
+        a concurrent edit is detected without locking. Returns the attnames
+        written; raises :class:`StaleAssetError` on a conflict.
+        """
+        changed = [name for name in self.get_changed_fields() if name != 'updated_at']
+        if not changed:
+            return []
+        self._expected_updated_at = expected_updated_at or self._loaded_values.get('updated_at')
+        self._update_missed = False
+        try:
+            # A savepoint keeps a conflict from breaking the caller's transaction.
+            with transaction.atomic(using=self._state.db):
+                self.save(update_fields=[*changed, 'updated_at'])
+        except DatabaseError:
+            if self._update_missed:
+                raise StaleAssetError(f"{self} was changed or deleted by someone else.") from None
+            raise
+        finally:
+            del self._expected_updated_at
+        return changed
+
+    async def asave_changes(self, expected_updated_at=None):
+        return await sync_to_async(self.save_changes)(expected_updated_at)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update, *args, **kwargs):
+        expected = getattr(self, '_expected_updated_at', None)
+        if expected is not None:
+            base_qs = base_qs.filter(updated_at=expected)
+        updated = super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update, *args, **kwargs)
+        if expected is not None and not updated:
+            self._update_missed = True
+        return updated
+
 
 class EndUserDevice(BaseAsset):
     """Model for end-user devices: desktops, laptops, tablets, mobile devices"""
@@ -207,10 +376,12 @@ class EndUserDevice(BaseAsset):
                                          validators=[MinValueValidator(0), MaxValueValidator(100)])
     battery_cycle_count = models.IntegerField(blank=True, null=True)
 
-    class Meta:
+    LIST_FIELDS = BaseAsset.LIST_FIELDS + ('device_type', 'operating_system')
+
+    class Meta(BaseAsset.Meta):
         verbose_name = "End User Device"
         verbose_name_plural = "End User Devices"
-        indexes = [
+        indexes = BaseAsset.Meta.indexes + [
             models.Index(fields=['device_type', 'operating_system']),
             models.Index(fields=['imei']),
         ]
@@ -252,6 +423,8 @@ class NetworkDevice(BaseAsset):
                                           validators=[MinValueValidator(0), MaxValueValidator(100)])
     memory_utilization = models.IntegerField(blank=True, null=True,
                                              validators=[MinValueValidator(0), MaxValueValidator(100)])
+    utilization_recorded_at = models.DateTimeField(blank=True, null=True, editable=False,
+                                                   help_text="Time of the reading behind the utilization fields")
 
     # Redundancy
     redundant_power_supply = models.BooleanField(default=False)
@@ -284,10 +457,12 @@ class NetworkDevice(BaseAsset):
     max_clients = models.IntegerField(blank=True, null=True)
     current_clients = models.IntegerField(blank=True, null=True)
 
-    class Meta:
+    LIST_FIELDS = BaseAsset.LIST_FIELDS + ('device_type', 'management_ip', 'cpu_utilization')
+
+    class Meta(BaseAsset.Meta):
         verbose_name = "Network Device"
         verbose_name_plural = "Network Devices"
-        indexes = [
+        indexes = BaseAsset.Meta.indexes + [
             models.Index(fields=['device_type', 'status']),
             models.Index(fields=['management_ip']),
         ]
@@ -358,10 +533,12 @@ class IoTDevice(BaseAsset):
     api_enabled = models.BooleanField(default=False)
     integration_platform = models.CharField(max_length=200, blank=True, null=True)
 
-    class Meta:
+    LIST_FIELDS = BaseAsset.LIST_FIELDS + ('device_type', 'internet_accessible')
+
+    class Meta(BaseAsset.Meta):
         verbose_name = "IoT Device"
         verbose_name_plural = "IoT Devices"
-        indexes = [
+        indexes = BaseAsset.Meta.indexes + [
             models.Index(fields=['device_type', 'status']),
             models.Index(fields=['internet_accessible']),
         ]
@@ -442,6 +619,8 @@ class Server(BaseAsset):
                                              validators=[MinValueValidator(0), MaxValueValidator(100)])
     disk_utilization = models.IntegerField(blank=True, null=True,
                                            validators=[MinValueValidator(0), MaxValueValidator(100)])
+    utilization_recorded_at = models.DateTimeField(blank=True, null=True, editable=False,
+                                                   help_text="Time of the reading behind the utilization fields")
     network_throughput_mbps = models.IntegerField(blank=True, null=True)
 
     # Services and applications
@@ -497,15 +676,40 @@ class Server(BaseAsset):
     last_boot_time = models.DateTimeField(blank=True, null=True)
     uptime_days = models.IntegerField(blank=True, null=True)
 
-    class Meta:
+    LIST_FIELDS = (
+        'id', 'asset_tag', 'name', 'hostname', 'primary_ip_address', 'status', 'operating_system',
+        'cpu_utilization', 'ram_gb', 'disk_utilization', 'physical_location', 'created_at', 'updated_at',
+    )
+
+    class Meta(BaseAsset.Meta):
         verbose_name = "Server"
         verbose_name_plural = "Servers"
-        indexes = [
+        indexes = BaseAsset.Meta.indexes + [
             models.Index(fields=['server_type', 'operating_system']),
             models.Index(fields=['server_role', 'environment']),
             models.Index(fields=['cloud_provider', 'instance_id']),
+            models.Index(fields=['ssl_certificate_expiration']),
+            models.Index(fields=['license_expiration']),
         ]
 
+    def _save_row(self, *args, using=None, update_fields=None, **kwargs):
+        from asset.capacity import TRACKED_FIELDS, writes_tracked_fields
+        if self._state.adding:
+            return super()._save_row(*args, using=using, update_fields=update_fields, **kwargs)
+        if writes_tracked_fields(self, update_fields):
+            # Capacity rollups read the stored row under a lock in pre_save; the
+            # lock must be held until the new values are written and rolled up.
+            with transaction.atomic(using=using):
+                return super()._save_row(*args, using=using, update_fields=update_fields, **kwargs)
+        if update_fields is None and not args and not kwargs.get('force_insert'):
+            # Nothing tracked changed, so no lock is taken. Leave those columns
+            # out of the UPDATE as well: writing back the loaded values would
+            # revert a concurrent change without the rollups noticing.
+            update_fields = [field.name for field in self._meta.concrete_fields
+                             if not field.primary_key and field.attname not in TRACKED_FIELDS
+                             and field.attname in self.__dict__]
+        return super()._save_row(*args, using=using, update_fields=update_fields, **kwargs)
+
 
 class AssetChangeLog(models.Model):
     """Track all changes made to assets for audit purposes"""
@@ -516,19 +720,183 @@ class AssetChangeLog(models.Model):
     change_type = models.CharField(max_length=50, help_text="Created, Updated, Deleted")
     changed_fields = models.JSONField(help_text="Dictionary of changed fields and their old/new values")
     changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
-    changed_at = models.DateTimeField(auto_now_add=True)
+    changed_at = models.DateTimeField(default=timezone.now)
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     user_agent = models.CharField(max_length=500, blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
+    objects = ChangeLogQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Asset Change Log"
         verbose_name_plural = "Asset Change Logs"
         ordering = ['-changed_at']
         indexes = [
-            models.Index(fields=['asset_type', 'asset_id']),
+            models.Index(fields=['asset_type', 'asset_id', 'changed_at']),
             models.Index(fields=['changed_at']),
         ]
 
     def __str__(self):
-        return f"{self.change_type} - {self.asset_name} at {self.changed_at}"
\ No newline at end of file
+        return f"{self.change_type} - {self.asset_name} at {self.changed_at}"
+
+
+class AssetLookup(models.Model):
+    """Identifiers of every asset type in one table, for cross-type lookups"""
+
+    asset_type = models.CharField(max_length=100)
+    asset_id = models.UUIDField()
+    kind = models.CharField(max_length=50, help_text="Source field, e.g. hostname or mac_address")
+    value = models.CharField(max_length=500, help_text="Normalized identifier value")
+    ip_key = models.CharField(max_length=32, blank=True, null=True,
+                              help_text="Sortable hex form of IP values, IPv4 mapped into IPv6 space")
+
+    class Meta:
+        verbose_name = "Asset Lookup"
+        verbose_name_plural = "Asset Lookups"
+        indexes = [
+            models.Index(fields=['value', 'kind']),
+            models.Index(fields=['asset_type', 'asset_id']),
+            models.Index(fields=['ip_key', 'asset_type']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}={self.value} -> {self.asset_type} {self.asset_id}"
+
+
+class CapacityRollup(models.Model):
+    """Server capacity totals per site, cluster or hypervisor host, maintained with deltas"""
+
+    class Dimension(models.TextChoices):
+        SITE = 'site', 'Site'
+        CLUSTER = 'cluster', 'Cluster'
+        HYPERVISOR_HOST = 'hypervisor_host', 'Hypervisor Host'
+
+    dimension = models.CharField(max_length=20, choices=Dimension)
+    key = models.CharField(max_length=200, help_text="Site, cluster name or hypervisor host id")
+    server_count = models.BigIntegerField(default=0)
+    total_cores = models.BigIntegerField(default=0)
+    total_ram_gb = models.BigIntegerField(default=0)
+    total_storage_capacity_gb = models.BigIntegerField(default=0)
+    total_storage_used_gb = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Capacity Rollup"
+        verbose_name_plural = "Capacity Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='unique_capacity_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.key}: {self.server_count} servers"
+
+
+class TelemetrySample(models.Model):
+    """One raw utilization reading from a monitoring agent"""
+
+    asset_type = models.CharField(max_length=100)
+    asset_id = models.UUIDField()
+    metric = models.CharField(max_length=50, help_text="Utilization field, e.g. cpu_utilization")
+    recorded_at = models.DateTimeField()
+    value = models.SmallIntegerField()
+
+    class Meta:
+        verbose_name = "Telemetry Sample"
+        verbose_name_plural = "Telemetry Samples"
+        indexes = [
+            models.Index(fields=['asset_type', 'asset_id', 'metric', 'recorded_at']),
+            models.Index(fields=['recorded_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_type} {self.asset_id} {self.metric}={self.value} at {self.recorded_at}"
+
+
+class TelemetryRollup(models.Model):
+    """Downsampled utilization per asset, metric and time bucket"""
+
+    class Resolution(models.TextChoices):
+        MINUTE = '1m', '1 minute'
+        HOUR = '1h', '1 hour'
+        DAY = '1d', '1 day'
+
+    asset_type = models.CharField(max_length=100)
+    asset_id = models.UUIDField()
+    metric = models.CharField(max_length=50)
+    resolution = models.CharField(max_length=2, choices=Resolution)
+    bucket_start = models.DateTimeField()
+    sample_count = models.IntegerField(default=0)
+    value_sum = models.BigIntegerField(default=0)
+    value_min = models.SmallIntegerField()
+    value_max = models.SmallIntegerField()
+
+    class Meta:
+        verbose_name = "Telemetry Rollup"
+        verbose_name_plural = "Telemetry Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=['asset_type', 'asset_id', 'metric', 'resolution', 'bucket_start'],
+                                    name='unique_telemetry_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['resolution', 'bucket_start']),
+        ]
+
+    @property
+    def value_avg(self):
+        return self.value_sum / self.sample_count if self.sample_count else None
+
+    def __str__(self):
+        return f"{self.asset_type} {self.asset_id} {self.metric} {self.resolution}@{self.bucket_start}"
+
+
+class ExpirySnapshot(models.Model):
+    """Daily precomputed list of upcoming lifecycle expiries across all asset types"""
+
+    snapshot_date = models.DateField()
+    asset_type = models.CharField(max_length=100)
+    asset_id = models.UUIDField()
+    asset_tag = models.CharField(max_length=100)
+    asset_name = models.CharField(max_length=255)
+    field = models.CharField(max_length=50, help_text="Expiring date field, e.g. warranty_expiration")
+    expires_on = models.DateField()
+    window_days = models.PositiveSmallIntegerField(default=0, help_text="Days ahead the snapshot covers")
+
+    class Meta:
+        verbose_name = "Expiry Snapshot"
+        verbose_name_plural = "Expiry Snapshots"
+        ordering = ['expires_on']
+        indexes = [
+            models.Index(fields=['snapshot_date', 'expires_on']),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_tag} {self.field} on {self.expires_on}"
+
+
+class AssetSearchDocument(models.Model):
+    """Searchable text of every asset type in one table, backed by a full-text index.
+
+    The index itself is database specific and created by migration 0011: a
+    generated ``tsvector`` column with a GIN index on PostgreSQL, an FTS5
+    table kept in sync by triggers on SQLite. See ``asset.search``.
+    """
+
+    asset_type = models.CharField(max_length=100)
+    asset_id = models.UUIDField()
+    asset_tag = models.CharField(max_length=100)
+    name = models.CharField(max_length=255)
+    body = models.TextField(help_text="Model, description, notes, software, services and websites")
+
+    class Meta:
+        verbose_name = "Asset Search Document"
+        verbose_name_plural = "Asset Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=['asset_type', 'asset_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_type} {self.asset_tag}"
+
+
+# Concrete asset models keyed by their lowercase model name, e.g. ``ASSET_MODELS['server']``
+ASSET_MODELS = {model._meta.model_name: model for model in (Server, EndUserDevice, NetworkDevice, IoTDevice)}
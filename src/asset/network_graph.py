@@ -0,0 +1,133 @@
+"""In-memory graph of network devices for blast-radius questions.
+
+The graph is built from every ``NetworkDevice`` with one query: each device
+hangs below its ``uplink_device``, and a device and its ``failover_partner``
+back each other up, so a device stays connected as long as its uplink or one
+of the uplink's failover partners is connected. Each process keeps the last
+built graph and rebuilds it when the table's version changes. The version
+is the ``NetworkDevice`` change counter of :mod:`asset.versions`, one cache
+read per request, which saves, bulk changes, imports and seeding bump.
+"""
+import threading
+from collections import defaultdict, deque
+
+from asset import versions
+from asset.models import NetworkDevice
+
+_graph = None
+_lock = threading.Lock()
+
+
+class NetworkGraph:
+    def __init__(self, devices, version=None):
+        """``devices`` yields ``(id, name, uplink_device_id, failover_partner_id)`` tuples."""
+        self.version = version
+        self.names = {}
+        self.uplink = {}
+        self.children = defaultdict(list)
+        self.partners = defaultdict(set)
+        links = []
+        for pk, name, uplink_id, partner_id in devices:
+            self.names[pk] = name
+            links.append((pk, uplink_id, partner_id))
+        for pk, uplink_id, partner_id in links:
+            if uplink_id in self.names and uplink_id != pk:
+                self.uplink[pk] = uplink_id
+                self.children[uplink_id].append(pk)
+            if partner_id in self.names and partner_id != pk:
+                self.partners[pk].add(partner_id)
+                self.partners[partner_id].add(pk)
+        roots = [pk for pk in self.names if pk not in self.uplink]
+        # Devices caught in an uplink loop never reach a root and count as disconnected.
+        self.connected = self._propagate(roots, frozenset())
+
+    def __len__(self):
+        return len(self.names)
+
+    def group(self, pk):
+        """A device together with its failover partners."""
+        return {pk, *self.partners.get(pk, ())}
+
+    def dependents(self, pk):
+        """Devices that can reach the network through ``pk``."""
+        for member in self.group(pk):
+            yield from self.children.get(member, ())
+
+    def _propagate(self, seeds, failed, within=None):
+        connected = {pk for pk in seeds if pk not in failed}
+        queue = deque(connected)
+        while queue:
+            for pk in self.dependents(queue.popleft()):
+                if pk in connected or pk in failed or (within is not None and pk not in within):
+                    continue
+                connected.add(pk)
+                queue.append(pk)
+        return connected
+
+    def downstream(self, pk):
+        """Every device below ``pk`` in the uplink tree, ignoring failover."""
+        seen, queue = set(), deque([pk])
+        while queue:
+            for child in self.children.get(queue.popleft(), ()):
+                if child not in seen and child != pk:
+                    seen.add(child)
+                    queue.append(child)
+        return seen
+
+    def blast_radius(self, failed):
+        """Devices that lose connectivity when every device in ``failed`` goes down.
+
+        Only devices depending on a failed one are re-evaluated, so the cost
+        is proportional to the size of the affected part of the graph.
+        """
+        failed = frozenset(pk for pk in failed if pk in self.names)
+        region = set(failed)
+        queue = deque(failed)
+        while queue:
+            for pk in self.dependents(queue.popleft()):
+                if pk not in region:
+                    region.add(pk)
+                    queue.append(pk)
+        seeds = [
+            pk for pk in region
+            if pk not in failed and pk in self.connected and any(
+                member in self.connected and member not in region
+                for member in self.group(self.uplink[pk])
+            )
+        ]
+        still_connected = self._propagate(seeds, failed, within=region)
+        return {pk for pk in region - failed if pk in self.connected and pk not in still_connected}
+
+    def single_points_of_failure(self):
+        """``(device id, devices lost)`` for every device whose failure alone disconnects others."""
+        spofs = []
+        for pk in self.connected:
+            if not any(True for _ in self.dependents(pk)):
+                continue
+            lost = self.blast_radius([pk])
+            if lost:
+                spofs.append((pk, len(lost)))
+        return sorted(spofs, key=lambda item: (-item[1], str(item[0])))
+
+
+def load_graph(version=None):
+    rows = NetworkDevice.objects.order_by().values_list('id', 'name', 'uplink_device_id', 'failover_partner_id')
+    return NetworkGraph(rows.iterator(chunk_size=5000), version)
+
+
+def graph_version():
+    """The change counter of ``NetworkDevice``; advances whenever a device is added, removed or edited."""
+    return versions.get_version(NetworkDevice)
+
+
+def get_graph():
+    """The current graph; rebuilt from the database only when its version has changed."""
+    global _graph
+    version = graph_version()
+    graph = _graph
+    if graph is not None and graph.version == version:
+        return graph
+    with _lock:
+        if _graph is None or _graph.version != version:
+            _graph = load_graph(version)
+        return _graph
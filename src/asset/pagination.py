@@ -0,0 +1,94 @@
+"""Keyset (cursor) pagination for asset querysets.
+
+Pages are ordered on ``(created_at, id)`` descending, matching the default
+``-created_at`` ordering of ``BaseAsset`` with ``id`` as a tie-breaker. Each
+page is fetched with a range predicate on the ``(created_at, id)`` index, so
+the cost of a page does not depend on how deep the user has scrolled.
+"""
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+KEYSET_ORDERING = ('-created_at', '-id')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(created_at, pk):
+    """Build an opaque cursor token pointing just after the given row."""
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return the ``(created_at, id)`` pair stored in a cursor token."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(token) from exc
+
+
+def page_size_from_request(request, default=DEFAULT_PAGE_SIZE):
+    """Read ``page_size`` from the query string, clamped to ``MAX_PAGE_SIZE``."""
+    try:
+        page_size = int(request.GET.get('page_size', default))
+    except ValueError:
+        page_size = default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def keyset_queryset(queryset, cursor=None):
+    """Order ``queryset`` for keyset pagination and skip rows up to ``cursor``."""
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if not cursor:
+        return queryset
+    created_at, pk = decode_cursor(cursor)
+    # The leading created_at__lte bound lets the database seek straight into
+    # the (created_at, id) index instead of evaluating the OR row by row.
+    return queryset.filter(
+        Q(created_at__lte=created_at),
+        Q(created_at__lt=created_at) | Q(id__lt=pk),
+    )
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows plus the cursor for the following page."""
+    items: list
+    next_cursor: str | None
+    page_size: int
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def _build_page(rows, page_size):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return KeysetPage(items=rows, next_cursor=next_cursor, page_size=page_size)
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Fetch a single page from ``queryset`` starting after ``cursor``."""
+    rows = list(keyset_queryset(queryset, cursor)[:page_size + 1])
+    return _build_page(rows, page_size)
+
+
+async def akeyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Async variant of :func:`keyset_page` for async views."""
+    rows = [row async for row in keyset_queryset(queryset, cursor)[:page_size + 1]]
+    return _build_page(rows, page_size)
@@ -0,0 +1,189 @@
+"""Monthly range partitioning and retention of ``AssetChangeLog``.
+
+On PostgreSQL the change log is a table partitioned by month on
+``changed_at`` (see migration 0006). Partitions are created ahead of time by
+:func:`ensure_partitions`. When that runs late and the ``DEFAULT`` partition
+already holds rows of the new month, those rows are moved into the new
+partition in the same transaction. Partitions past the retention window are
+exported to gzip-compressed CSV and then detached and dropped by
+:func:`prune_changelog`, which is far cheaper than deleting rows. Expired rows
+left in the ``DEFAULT`` partition, and every expired row on databases without
+partitioning, are exported and deleted in chunks instead.
+"""
+import gzip
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from asset.export import encode_header, encode_rows, exportable_fields
+from asset.models import AssetChangeLog
+
+TABLE = AssetChangeLog._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+_PARTITION_NAME = re.compile(rf'^{TABLE}_p(\d{{4}})(\d{{2}})$')
+DELETE_CHUNK_SIZE = 10000
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def is_partitioned(using='default'):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)", [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def _table_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [cursor.db.ops.quote_name(name)])
+    return cursor.fetchone()[0]
+
+
+def create_partition(cursor, month):
+    """Create the partition of ``month`` unless it exists, moving its rows out of the default partition.
+
+    PostgreSQL refuses to create a partition whose range already has rows in
+    the ``DEFAULT`` partition, so then the default partition is detached, the
+    rows are re-inserted through the parent into the new partition, and the
+    default partition is attached again, all in one transaction.
+    """
+    quote = cursor.db.ops.quote_name
+    name = partition_name(month)
+    if _table_exists(cursor, name):
+        return
+    bounds = [month.isoformat(), add_months(month, 1).isoformat()]
+    create = f"CREATE TABLE {quote(name)} PARTITION OF {quote(TABLE)} FOR VALUES FROM (%s) TO (%s)"
+    in_range = f"{quote(DEFAULT_PARTITION)} WHERE changed_at >= %s AND changed_at < %s"
+    with transaction.atomic(using=cursor.db.alias):
+        stranded = False
+        if _table_exists(cursor, DEFAULT_PARTITION):
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {in_range})", bounds)
+            stranded = cursor.fetchone()[0]
+        if not stranded:
+            cursor.execute(create, bounds)
+            return
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(DEFAULT_PARTITION)}")
+        cursor.execute(create, bounds)
+        cursor.execute(f"INSERT INTO {quote(TABLE)} OVERRIDING SYSTEM VALUE SELECT * FROM {in_range}", bounds)
+        cursor.execute(f"DELETE FROM {in_range}", bounds)
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(DEFAULT_PARTITION)} DEFAULT")
+
+
+def ensure_partitions(months_ahead=None, using='default', today=None):
+    """Create the partitions for this month and ``months_ahead`` months after it."""
+    if months_ahead is None:
+        months_ahead = getattr(settings, 'ASSET_CHANGELOG_PARTITION_MONTHS_AHEAD', 3)
+    current = month_start(today or timezone.now())
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    with connections[using].cursor() as cursor:
+        for month in months:
+            create_partition(cursor, month)
+    return [partition_name(month) for month in months]
+
+
+def list_partitions(using='default'):
+    """``{month: partition name}`` for every monthly partition currently attached."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s", [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return dict(sorted(partitions.items()))
+
+
+@dataclass
+class PruneResult:
+    archived: list
+    rows: int
+
+
+def _archive_path(archive_dir, stem):
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    return archive_dir / f'{stem}.csv.gz'
+
+
+def archive_partition(name, archive_dir, using='default'):
+    """Export a partition to ``<archive_dir>/<name>.csv.gz``, then detach and drop it."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    path = _archive_path(archive_dir, name)
+    with connection.cursor() as cursor:
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as fh:
+            cursor.copy_expert(f"COPY (SELECT * FROM {quote(name)}) TO STDOUT WITH (FORMAT csv, HEADER)", fh)
+        cursor.execute(f"SELECT count(*) FROM {quote(name)}")
+        rows = cursor.fetchone()[0]
+        with transaction.atomic(using=using):
+            cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+            cursor.execute(f"DROP TABLE {quote(name)}")
+    return path, rows
+
+
+def _prune_rows(cutoff, archive_dir, using='default', stem=TABLE):
+    """Export and delete rows older than ``cutoff`` to ``<archive_dir>/<stem>_before_<cutoff>.csv.gz``."""
+    queryset = AssetChangeLog.objects.using(using).filter(changed_at__lt=cutoff)
+    fields = exportable_fields(AssetChangeLog)
+    path = _archive_path(archive_dir, f'{stem}_before_{cutoff:%Y%m%d}')
+    rows = 0
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as fh:
+        fh.write(encode_header('csv', fields))
+        while ids := list(queryset.order_by('pk').values_list('pk', flat=True)[:DELETE_CHUNK_SIZE]):
+            chunk = queryset.filter(pk__in=ids)
+            fh.write(encode_rows('csv', fields, chunk.order_by('pk').values_list(*fields)))
+            rows += chunk.delete()[0]
+    if not rows:
+        path.unlink()
+        return PruneResult([], 0)
+    return PruneResult([path], rows)
+
+
+def prune_changelog(retention_months=None, archive_dir=None, using='default', today=None):
+    """Archive and remove change log entries older than ``retention_months`` whole months."""
+    if retention_months is None:
+        retention_months = getattr(settings, 'ASSET_CHANGELOG_RETENTION_MONTHS', 24)
+    if archive_dir is None:
+        archive_dir = getattr(settings, 'ASSET_CHANGELOG_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'archive')
+    cutoff_month = add_months(month_start(today or timezone.now()), -retention_months)
+    cutoff = datetime.combine(cutoff_month, time.min, tzinfo=dt_timezone.utc)
+
+    if not is_partitioned(using):
+        return _prune_rows(cutoff, archive_dir, using)
+
+    archived, rows = [], 0
+    for month, name in list_partitions(using).items():
+        if month >= cutoff_month:
+            break
+        path, count = archive_partition(name, archive_dir, using)
+        archived.append(path)
+        rows += count
+    # Rows written before their month's partition existed went to the DEFAULT
+    # partition; with the old partitions gone, only those can still match.
+    stranded = _prune_rows(cutoff, archive_dir, using, stem=DEFAULT_PARTITION)
+    return PruneResult(archived + stranded.archived, rows + stranded.rows)
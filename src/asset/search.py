@@ -0,0 +1,159 @@
+"""Ranked full-text search across every asset type.
+
+Each asset has one ``AssetSearchDocument`` row holding its tag, name and the
+free text of its descriptive fields. Migration 0011 puts a full-text index on
+that table: a weighted ``tsvector`` column with a GIN index on PostgreSQL, an
+FTS5 table on SQLite. A search is one ranked index query instead of an
+``icontains`` scan over a dozen columns of four tables. Documents are
+maintained from the asset save/delete signals, refreshed in bulk by the
+importer and rebuilt by ``manage.py rebuild_search_index``.
+"""
+import re
+from collections import namedtuple
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from asset.models import AssetSearchDocument
+
+# Free-text fields folded into the document body; name and asset_tag are kept apart and weigh more.
+BODY_FIELDS = ('model', 'description', 'notes', 'installed_software', 'installed_services', 'hosted_websites')
+TRACKED_FIELDS = ('asset_tag', 'name') + BODY_FIELDS
+REBUILD_CHUNK_SIZE = 5000
+MAX_PAGE = 200
+
+TABLE = AssetSearchDocument._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+# FTS5 column weights for asset_tag, name and body.
+BM25_WEIGHTS = '10.0, 5.0, 1.0'
+
+SearchResult = namedtuple('SearchResult', 'asset_type asset_id asset_tag name rank')
+
+_TERMS = re.compile(r'\w+')
+
+
+def body_fields(model):
+    names = {field.name for field in model._meta.concrete_fields}
+    return [name for name in BODY_FIELDS if name in names]
+
+
+def build_document(asset_type, asset_id, values):
+    """``AssetSearchDocument`` of one asset given a mapping of field to value."""
+    return AssetSearchDocument(
+        asset_type=asset_type, asset_id=asset_id, asset_tag=values['asset_tag'], name=values.get('name') or '',
+        body='\n'.join(str(values[name]) for name in BODY_FIELDS if values.get(name)),
+    )
+
+
+def index_asset(instance):
+    """Replace the search document of a single asset."""
+    asset_type = instance._meta.model_name
+    values = {name: getattr(instance, name) for name in ('asset_tag', 'name', *body_fields(type(instance)))}
+    with transaction.atomic():
+        unindex_assets(type(instance), [instance.pk])
+        build_document(asset_type, instance.pk, values).save()
+
+
+def unindex_assets(model, asset_ids):
+    AssetSearchDocument.objects.filter(asset_type=model._meta.model_name, asset_id__in=asset_ids).delete()
+
+
+def reindex_assets(queryset):
+    """Replace the search documents of every asset in ``queryset`` with a few bulk statements."""
+    model = queryset.model
+    asset_type = model._meta.model_name
+    rows = list(queryset.values('id', 'asset_tag', 'name', *body_fields(model)))
+    with transaction.atomic():
+        unindex_assets(model, [row['id'] for row in rows])
+        AssetSearchDocument.objects.bulk_create(
+            [build_document(asset_type, row['id'], row) for row in rows], batch_size=REBUILD_CHUNK_SIZE,
+        )
+    return len(rows)
+
+
+def rebuild_search(model, chunk_size=REBUILD_CHUNK_SIZE):
+    """Rebuild every search document of ``model``; returns the number of assets indexed."""
+    asset_type = model._meta.model_name
+    indexed = 0
+    with transaction.atomic():
+        AssetSearchDocument.objects.filter(asset_type=asset_type).delete()
+        documents = []
+        rows = model.objects.order_by().values('id', 'asset_tag', 'name', *body_fields(model))
+        for row in rows.iterator(chunk_size=chunk_size):
+            documents.append(build_document(asset_type, row['id'], row))
+            indexed += 1
+            if len(documents) >= chunk_size:
+                AssetSearchDocument.objects.bulk_create(documents)
+                documents = []
+        AssetSearchDocument.objects.bulk_create(documents)
+    return indexed
+
+
+def _type_filter(column, asset_types):
+    if not asset_types:
+        return '', []
+    return f" AND {column} IN ({', '.join(['%s'] * len(asset_types))})", list(asset_types)
+
+
+def _postgresql_search(query, asset_types, limit, offset):
+    where = "search_vector @@ websearch_to_tsquery('english', %s)"
+    type_sql, type_params = _type_filter('asset_type', asset_types)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {TABLE} WHERE {where}{type_sql}", [query, *type_params])
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT asset_type, asset_id, asset_tag, name, "
+            f"ts_rank_cd(search_vector, websearch_to_tsquery('english', %s)) AS rank "
+            f"FROM {TABLE} WHERE {where}{type_sql} ORDER BY rank DESC, id LIMIT %s OFFSET %s",
+            [query, query, *type_params, limit, offset],
+        )
+        return cursor.fetchall(), total
+
+
+def _sqlite_search(query, asset_types, limit, offset):
+    # Quote every term so user input cannot inject FTS5 query syntax; terms are ANDed.
+    match = ' '.join(f'"{term}"' for term in _TERMS.findall(query))
+    if not match:
+        return [], 0
+    type_sql, type_params = _type_filter('d.asset_type', asset_types)
+    joined = f"FROM {FTS_TABLE} JOIN {TABLE} d ON d.id = {FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH %s{type_sql}"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) {joined}", [match, *type_params])
+        total = cursor.fetchone()[0]
+        # bm25() is lower for better matches.
+        cursor.execute(
+            f"SELECT d.asset_type, d.asset_id, d.asset_tag, d.name, -bm25({FTS_TABLE}, {BM25_WEIGHTS}) AS rank "
+            f"{joined} ORDER BY rank DESC, d.id LIMIT %s OFFSET %s",
+            [match, *type_params, limit, offset],
+        )
+        return cursor.fetchall(), total
+
+
+def _fallback_search(query, asset_types, limit, offset):
+    documents = AssetSearchDocument.objects.all()
+    for term in _TERMS.findall(query):
+        documents = documents.filter(Q(asset_tag__icontains=term) | Q(name__icontains=term) | Q(body__icontains=term))
+    if asset_types:
+        documents = documents.filter(asset_type__in=asset_types)
+    rows = documents.order_by('name', 'id').values_list('asset_type', 'asset_id', 'asset_tag', 'name')
+    return [(*row, 0.0) for row in rows[offset:offset + limit]], documents.count()
+
+
+def search(query, page=1, page_size=50, asset_types=None):
+    """Best matches of ``query`` across asset types, one page at a time.
+
+    Returns ``(results, total)`` with ``results`` a list of
+    :class:`SearchResult`, best match first. ``asset_types`` restricts the
+    search to some types, e.g. ``['server']``. Raises ``ValueError`` for a
+    page beyond ``MAX_PAGE``; ranked results are not meant to be paged deeply.
+    """
+    if not 1 <= page <= MAX_PAGE:
+        raise ValueError(f"page must be between 1 and {MAX_PAGE}")
+    query = query.strip()
+    if not query:
+        return [], 0
+    backend = {'postgresql': _postgresql_search, 'sqlite': _sqlite_search}.get(connection.vendor, _fallback_search)
+    rows, total = backend(query, asset_types, page_size, (page - 1) * page_size)
+    to_uuid = AssetSearchDocument._meta.get_field('asset_id').to_python
+    return [SearchResult(asset_type, to_uuid(asset_id), asset_tag, name, rank)
+            for asset_type, asset_id, asset_tag, name, rank in rows], total
@@ -0,0 +1,22 @@
+"""Entry points of the ``seed_assets`` worker processes.
+
+Worker processes may be started with ``forkserver`` or ``spawn`` (the
+default start methods on current Pythons), in which case they unpickle
+their tasks before Django is set up. This module therefore imports no
+models at import time; :func:`init_worker` sets Django up first and the
+seeding code is imported per task.
+"""
+import django
+from django.db import connections
+
+
+def init_worker():
+    # Workers may be forked from a process holding open connections, or
+    # started fresh without Django configured; handle both.
+    django.setup()
+    connections.close_all()
+
+
+def write_chunk_job(args):
+    from asset.seeding import write_chunk
+    return write_chunk(*args)
@@ -0,0 +1,392 @@
+"""Bulk generation of synthetic assets for load-testing.
+
+Rows are generated in fixed-size chunks. Every chunk derives its own random
+generator from ``(seed, model, chunk start)``, so the same seed always yields
+the same dataset regardless of the number of worker processes. Chunks are
+written with ``bulk_create`` or, on PostgreSQL, with ``COPY ... FROM STDIN``,
+together with their rows in the lookup and search indexes and the capacity
+rollups. ``Created`` entries in ``AssetChangeLog`` are only written on
+request: a benchmark dataset would otherwise double the rows written.
+"""
+import io
+import json
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from asset import capacity, changelog, search, seed_workers, versions
+from asset.lookup import rebuild_lookup, reindex_assets
+from asset.models import ASSET_MODELS, EndUserDevice, IoTDevice, NetworkDevice, Server
+
+DEFAULT_BATCH_SIZE = 5000
+
+TAG_PREFIXES = {
+    'server': 'SRV',
+    'enduserdevice': 'EUD',
+    'networkdevice': 'NET',
+    'iotdevice': 'IOT',
+}
+
+MANUFACTURERS = ['Dell', 'HP', 'Lenovo', 'Supermicro', 'Cisco', 'Apple', 'Microsoft']
+VENDORS = ['Insight', 'Bechtle', 'Softcat', 'Direct Vendor']
+BUILDINGS = ['Building A', 'Building B', 'HQ', 'West Wing']
+DEPARTMENTS = ['IT', 'Finance', 'HR', 'Engineering', 'Sales']
+SITES = ['Main Campus', 'DC-Amsterdam', 'DC-Frankfurt', 'Branch-Brussels']
+
+# Choices.values builds a new list on every access; resolve them once.
+STATUSES = Server.Status.values
+ENVIRONMENTS = Server.Environment.values
+RISK_LEVELS = Server.RiskLevel.values
+SERVER_TYPES = Server.ServerType.values
+SERVER_OPERATING_SYSTEMS = Server.OperatingSystem.values
+SERVER_ROLES = Server.ServerRole.values
+END_USER_DEVICE_TYPES = EndUserDevice.DeviceType.values
+END_USER_OPERATING_SYSTEMS = EndUserDevice.OperatingSystem.values
+NETWORK_DEVICE_TYPES = NetworkDevice.DeviceType.values
+IOT_DEVICE_TYPES = IoTDevice.DeviceType.values
+
+
+def base_asset_data(rng, model, index, seed, now, user_id=None):
+    """Generates random data for ALL BaseAsset attributes."""
+    prefix = TAG_PREFIXES[model._meta.model_name]
+    vendor_name = rng.choice(MANUFACTURERS)
+    asset_name = f"AST-{prefix}-{index:07d}"
+    today = now.date()
+
+    return {
+        # Unique identifiers
+        "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+        "asset_tag": f"TAG-{prefix}-{seed}-{index:09d}",
+        "serial_number": f"SN-{rng.getrandbits(40)}",
+
+        # Basic information
+        "name": asset_name,
+        "description": f"Generated asset for {asset_name} testing.",
+        "manufacturer": vendor_name,
+        "model": f"{vendor_name} Pro-Series v{rng.randint(1, 5)}",
+        "model_number": f"MN-{rng.randint(100, 999)}X",
+
+        # Network information
+        "hostname": asset_name.lower(),
+        "fqdn": f"{asset_name.lower()}.corp.internal",
+        "primary_ip_address": f"10.{rng.randint(0, 255)}.{rng.randint(1, 254)}.{rng.randint(1, 254)}",
+        "secondary_ip_address": f"192.168.{rng.randint(1, 254)}.{rng.randint(1, 254)}",
+        "mac_address": "%02x:%02x:%02x:%02x:%02x:%02x" % tuple(rng.randint(0, 255) for _ in range(6)),
+        "subnet_mask": "255.255.255.0",
+        "default_gateway": "10.10.1.1",
+        "dns_servers": "8.8.8.8, 1.1.1.1",
+        "vlan_id": rng.randint(10, 99),
+
+        # Location information
+        "physical_location": f"DataCenter-{rng.choice(['Alpha', 'Beta', 'Gamma'])}",
+        "building": rng.choice(BUILDINGS),
+        "floor": f"Floor {rng.randint(1, 5)}",
+        "room": f"Room {rng.randint(100, 500)}",
+        "rack_location": f"Rack-{rng.randint(1, 42)}",
+        "rack_unit": f"U{rng.randint(1, 20)}",
+        "geographic_location": "Amsterdam, NL",
+        "site": rng.choice(SITES),
+
+        # Organizational
+        "department": rng.choice(DEPARTMENTS),
+        "cost_center": f"CC-{rng.randint(1000, 9999)}",
+        "business_unit": "Enterprise Infrastructure",
+        "owner_id": user_id,
+        "custodian_id": user_id,
+        "assigned_to_id": user_id,
+
+        # Lifecycle
+        "purchase_date": today - timedelta(days=rng.randint(100, 1000)),
+        "purchase_price": Decimal(f"{rng.uniform(1000.0, 15000.0):.2f}"),
+        "warranty_expiration": today + timedelta(days=rng.randint(-100, 1000)),
+        "support_expiration": today + timedelta(days=rng.randint(-100, 1000)),
+        "end_of_life_date": today + timedelta(days=rng.randint(365, 2000)),
+        "vendor": rng.choice(VENDORS),
+        "purchase_order": f"PO-{rng.randint(10000, 99999)}",
+
+        # Status and compliance
+        "status": rng.choice(STATUSES),
+        "environment": rng.choice(ENVIRONMENTS),
+        "risk_level": rng.choice(RISK_LEVELS),
+        "compliance_status": rng.random() < 0.85,
+        "authorized": rng.random() < 0.97,
+        "managed": True,
+
+        # Security
+        "encrypted": rng.random() < 0.8,
+        "encryption_method": "AES-256",
+        "antivirus_installed": True,
+        "antivirus_version": "v12.4.2",
+        "firewall_enabled": True,
+        "vulnerability_score": rng.randint(0, 10),
+
+        # Discovery
+        "discovery_method": "Network Scan",
+        "monitoring_enabled": True,
+        "last_seen": now - timedelta(minutes=rng.randint(1, 10000)),
+
+        # Metadata
+        "notes": "Automatically seeded data for testing purposes.",
+        "tags": rng.choice(["testing, automated", "pci, critical", "legacy", "automated, dmz"]),
+        "configuration_items": {"last_audit": str(today), "patch_group": rng.choice("ABCD")},
+    }
+
+
+def server_data(rng, index, now):
+    """Server-specific attributes."""
+    is_virtual = rng.random() < 0.7
+    return {
+        # Server Info
+        "server_type": Server.ServerType.VIRTUAL if is_virtual else rng.choice(SERVER_TYPES),
+        "operating_system": rng.choice(SERVER_OPERATING_SYSTEMS),
+        "os_version": f"v{rng.randint(10, 22)}",
+        "server_role": rng.choice(SERVER_ROLES),
+
+        # Hardware
+        "processor": "Intel(R) Xeon(R) Platinum",
+        "number_of_processors": rng.choice([1, 2]),
+        "number_of_cores": rng.choice([8, 16, 32, 64]),
+        "ram_gb": rng.choice([32, 64, 128, 256, 512]),
+        "storage_type": rng.choice(["NVMe", "SSD", "SAN"]),
+        "storage_capacity_gb": rng.choice([500, 1000, 2000, 5000]),
+        "storage_used_gb": rng.randint(100, 400),
+
+        # Virtualization / Cloud
+        "is_virtual": is_virtual,
+        "hypervisor": "VMware ESXi" if index % 2 == 0 else "Hyper-V",
+        "cloud_provider": rng.choice(["AWS", "Azure", "GCP", None]),
+        "instance_id": f"i-{rng.getrandbits(68):017x}" if index % 3 == 0 else None,
+        "cluster_name": f"cluster-{rng.randint(1, 50):02d}",
+
+        # Performance
+        "cpu_utilization": rng.randint(5, 95),
+        "memory_utilization": rng.randint(10, 80),
+        "disk_utilization": rng.randint(20, 90),
+
+        # Services
+        "installed_services": "IIS, SQL Server, Monitoring Agent",
+        "listening_ports": rng.choice(["80, 443", "22, 443", "80, 443, 1433, 3389", "22, 5432"]),
+        "ssl_certificate_expiration": now.date() + timedelta(days=rng.randint(-30, 400)),
+        "license_expiration": now.date() + timedelta(days=rng.randint(-30, 1000)),
+
+        # Backup
+        "backup_enabled": True,
+        "last_backup": now - timedelta(hours=rng.randint(1, 24)),
+
+        # Management
+        "management_interface": "iDRAC",
+        "management_ip": f"10.20.{rng.randint(1, 254)}.{rng.randint(1, 254)}",
+
+        # Uptime
+        "last_boot_time": now - timedelta(days=rng.randint(1, 100)),
+        "uptime_days": rng.randint(1, 100),
+    }
+
+
+def end_user_device_data(rng, index, now):
+    """EndUserDevice-specific attributes."""
+    return {
+        "device_type": rng.choice(END_USER_DEVICE_TYPES),
+        "operating_system": rng.choice(END_USER_OPERATING_SYSTEMS),
+        "os_version": f"{rng.randint(10, 14)}.{rng.randint(0, 9)}",
+        "os_architecture": "64-bit",
+        "processor": rng.choice(["Intel Core i5", "Intel Core i7", "Apple M2", "AMD Ryzen 7"]),
+        "number_of_cores": rng.choice([4, 8, 12]),
+        "ram_gb": rng.choice([8, 16, 32]),
+        "storage_type": rng.choice(["SSD", "NVMe"]),
+        "storage_capacity_gb": rng.choice([256, 512, 1024]),
+        "storage_used_gb": rng.randint(50, 250),
+        "domain_joined": rng.random() < 0.9,
+        "domain_name": "corp.internal",
+        "mdm_enrolled": rng.random() < 0.6,
+        "installed_software": "Office 365, Chrome, Slack, Zoom",
+        "last_login": now - timedelta(hours=rng.randint(1, 500)),
+        "uptime_hours": rng.randint(1, 400),
+        "battery_health": rng.randint(60, 100),
+    }
+
+
+def network_device_data(rng, index, now):
+    """NetworkDevice-specific attributes."""
+    return {
+        "device_type": rng.choice(NETWORK_DEVICE_TYPES),
+        "firmware_version": f"{rng.randint(15, 17)}.{rng.randint(0, 12)}.{rng.randint(1, 9)}",
+        "number_of_ports": rng.choice([8, 24, 48]),
+        "port_speed": rng.choice(["1Gbps", "10Gbps", "40Gbps"]),
+        "poe_enabled": rng.random() < 0.5,
+        "throughput_mbps": rng.choice([1000, 10000, 40000]),
+        "cpu_utilization": rng.randint(5, 90),
+        "memory_utilization": rng.randint(10, 80),
+        "redundant_power_supply": rng.random() < 0.5,
+        "management_ip": f"10.30.{rng.randint(1, 254)}.{rng.randint(1, 254)}",
+        "snmp_enabled": True,
+        "connected_vlans": ", ".join(str(v) for v in sorted(rng.sample(range(10, 100), 4))),
+    }
+
+
+def iot_device_data(rng, index, now):
+    """IoTDevice-specific attributes."""
+    return {
+        "device_type": rng.choice(IOT_DEVICE_TYPES),
+        "firmware_version": f"{rng.randint(1, 5)}.{rng.randint(0, 20)}",
+        "protocol": rng.choice(["MQTT", "Modbus", "BACnet", "HTTP"]),
+        "power_source": rng.choice(["Battery", "PoE", "AC"]),
+        "wireless_type": rng.choice(["WiFi", "Zigbee", "Bluetooth", None]),
+        "default_password_changed": rng.random() < 0.7,
+        "internet_accessible": rng.random() < 0.05,
+        "segmented_network": rng.random() < 0.6,
+        "uptime_days": rng.randint(1, 365),
+    }
+
+
+TYPE_DATA = {
+    'server': server_data,
+    'enduserdevice': end_user_device_data,
+    'networkdevice': network_device_data,
+    'iotdevice': iot_device_data,
+}
+
+
+def build_assets(model, start, count, seed, now, user_id=None):
+    """Build ``count`` unsaved instances of ``model`` starting at index ``start``."""
+    model_name = model._meta.model_name
+    rng = random.Random(f"{seed}:{model_name}:{start}")
+    type_data = TYPE_DATA[model_name]
+    objs = []
+    for index in range(start, start + count):
+        data = base_asset_data(rng, model, index, seed, now, user_id)
+        data.update(type_data(rng, index, now))
+        objs.append(model(**data))
+    return objs
+
+
+def _copy_value(value):
+    """Render a Python value in PostgreSQL COPY text format."""
+    if value is None:
+        return r'\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_assets(model, objs, using='default'):
+    """Write ``objs`` with ``COPY ... FROM STDIN`` (PostgreSQL only)."""
+    conn = connections[using]
+    fields = [field for field in model._meta.concrete_fields if not field.generated]
+    columns = ', '.join(conn.ops.quote_name(field.column) for field in fields)
+    buffer = io.StringIO()
+    for obj in objs:
+        buffer.write('\t'.join(_copy_value(field.pre_save(obj, add=True)) for field in fields))
+        buffer.write('\n')
+    buffer.seek(0)
+    with conn.cursor() as cursor:
+        cursor.copy_expert(f"COPY {conn.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN", buffer)
+
+
+def supports_copy(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def index_written(model, objs):
+    """Add freshly inserted ``objs`` to the lookup and search indexes and the capacity rollups."""
+    written = model.objects.filter(pk__in=[obj.pk for obj in objs])
+    reindex_assets(written)
+    search.reindex_assets(written)
+    if model is Server:
+        deltas = capacity.RollupDeltas()
+        deltas.add_queryset(written)
+        deltas.apply()
+
+
+def write_chunk(model_name, start, count, seed, now, user_id=None, batch_size=DEFAULT_BATCH_SIZE, use_copy=False,
+                derived=True, log_changes=False):
+    """Generate and insert one chunk of rows; returns the number of rows written.
+
+    With ``derived`` the rows are also indexed like a save would, so the
+    derived tables never need a full rebuild after an incremental seed.
+    """
+    model = ASSET_MODELS[model_name]
+    context = {'changed_by_id': user_id}
+    written = 0
+    for batch_start in range(start, start + count, batch_size):
+        batch_count = min(batch_size, start + count - batch_start)
+        objs = build_assets(model, batch_start, batch_count, seed, now, user_id)
+        with transaction.atomic():
+            if use_copy:
+                copy_assets(model, objs)
+            else:
+                model.objects.bulk_create(objs, batch_size=batch_size)
+            if derived:
+                index_written(model, objs)
+            if log_changes:
+                # Worker processes exit without flushing a background buffer, so entries are written here.
+                changelog.write_entries([
+                    changelog.build_entry(model_name, obj.pk, obj.name, changelog.CREATED, context=context,
+                                          notes="Seeded")
+                    for obj in objs
+                ])
+        written += len(objs)
+    versions.bump(model)
+    return written
+
+
+@dataclass
+class SeedResult:
+    model_name: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def seed_assets(model, count, *, seed=0, start=0, batch_size=DEFAULT_BATCH_SIZE, workers=1,
+                use_copy=None, user_id=None, now=None, derived=True, log_changes=False):
+    """Seed ``count`` rows of ``model`` and return a :class:`SeedResult`.
+
+    Work is split into chunks of ``batch_size`` rows. With ``workers > 1``
+    chunks are written in parallel by separate processes, each with its own
+    database connection. ``use_copy`` defaults to ``True`` on PostgreSQL.
+    ``derived=False`` leaves the lookup, search and capacity tables alone;
+    ``log_changes=True`` adds a ``Created`` change log entry per row.
+    """
+    model_name = model._meta.model_name
+    if use_copy is None:
+        use_copy = supports_copy()
+    now = now or timezone.now()
+    jobs = [
+        (model_name, chunk_start, min(batch_size, start + count - chunk_start), seed, now,
+         user_id, batch_size, use_copy, derived, log_changes)
+        for chunk_start in range(start, start + count, batch_size)
+    ]
+
+    started = time.perf_counter()
+    if workers > 1:
+        # Never share the parent's connections with child processes.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=seed_workers.init_worker) as pool:
+            rows = sum(pool.map(seed_workers.write_chunk_job, jobs))
+    else:
+        rows = sum(write_chunk(*job) for job in jobs)
+    return SeedResult(model_name, rows, time.perf_counter() - started)
+
+
+def rebuild_derived(model):
+    """Rebuild every row of the tables derived from ``model``, e.g. after seeding with ``derived=False``."""
+    rebuild_lookup(model)
+    search.rebuild_search(model)
+    if model is Server:
+        capacity.rebuild_rollups()
@@ -0,0 +1,70 @@
+"""Signal receivers keeping the change log and derived tables in sync with assets.
+
+Receivers are connected for every model in ``ASSET_MODELS`` by
+``AssetConfig.ready()``.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from asset import capacity, changelog, lookup, search, versions
+from asset.models import ASSET_MODELS, Server
+
+
+def may_have_changed(instance, changed, fields):
+    """Whether any of ``fields`` may have changed in this save.
+
+    Instances that were not loaded from the database have no snapshot to
+    compare against, so they always count as changed.
+    """
+    if not getattr(instance, '_loaded_values', None):
+        return True
+    return any(name in changed for name in fields)
+
+
+def asset_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    changed = instance._changed_fields
+    changelog.record_save(instance, created, changed)
+    if created or may_have_changed(instance, changed, changed.keys() - changelog.IGNORED_FIELDS):
+        versions.bump(sender)
+    if created or may_have_changed(instance, changed, lookup.INDEXED_FIELDS):
+        lookup.index_asset(instance)
+    if created or may_have_changed(instance, changed, search.TRACKED_FIELDS):
+        search.index_asset(instance)
+
+
+def server_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and not instance._state.adding and capacity.writes_tracked_fields(instance, update_fields):
+        capacity.capture_stored_values(instance)
+
+
+def server_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if created or capacity.writes_tracked_fields(instance, update_fields):
+        capacity.record_save(instance, created, update_fields)
+
+
+def server_pre_delete(sender, instance, **kwargs):
+    capacity.capture_stored_values(instance)
+
+
+def server_deleted(sender, instance, **kwargs):
+    capacity.record_delete(instance)
+
+
+def asset_deleted(sender, instance, **kwargs):
+    changelog.record_delete(instance)
+    versions.bump(sender)
+    lookup.unindex_assets(sender, [instance.pk])
+    search.unindex_assets(sender, [instance.pk])
+
+
+def connect_signals():
+    for model in ASSET_MODELS.values():
+        post_save.connect(asset_saved, sender=model, dispatch_uid=f'asset_saved_{model._meta.model_name}')
+        post_delete.connect(asset_deleted, sender=model, dispatch_uid=f'asset_deleted_{model._meta.model_name}')
+    pre_save.connect(server_pre_save, sender=Server, dispatch_uid='server_pre_save')
+    post_save.connect(server_saved, sender=Server, dispatch_uid='server_saved')
+    pre_delete.connect(server_pre_delete, sender=Server, dispatch_uid='server_pre_delete')
+    post_delete.connect(server_deleted, sender=Server, dispatch_uid='server_deleted')
@@ -0,0 +1,294 @@
+"""Ingestion and downsampling of utilization telemetry.
+
+Agents post batches of readings. Readings are buffered in memory and written
+by a background thread in bulk. Each flush does three things:
+
+- inserts the raw samples into ``TelemetrySample``;
+- folds them into 1-minute, 1-hour and 1-day ``TelemetryRollup`` buckets
+  with multi-row ``INSERT ... ON CONFLICT DO UPDATE`` increments;
+- copies the newest reading of each asset onto its ``*_utilization`` fields
+  with one conditional ``UPDATE`` per model, skipping readings older than
+  the asset's ``utilization_recorded_at``. These columns are
+  machine-maintained and kept out of ``AssetChangeLog``.
+
+The asset rows therefore change once per flush, not once per sample. Set
+``ASSET_TELEMETRY_BUFFERED = False`` to write synchronously instead.
+"""
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from asset import versions
+from asset.batching import BackgroundBatcher
+from asset.models import ASSET_MODELS, TelemetryRollup, TelemetrySample
+
+Resolution = TelemetryRollup.Resolution
+
+# Metrics accepted per asset type; each one is also a field of that model.
+TELEMETRY_FIELDS = {
+    'server': ('cpu_utilization', 'memory_utilization', 'disk_utilization'),
+    'networkdevice': ('cpu_utilization', 'memory_utilization'),
+}
+IDENTITY_KEYS = frozenset({'asset_type', 'asset_id', 'recorded_at'})
+ROLLUP_KEY = ('asset_type', 'asset_id', 'metric', 'resolution', 'bucket_start')
+ROLLUP_VALUES = ('sample_count', 'value_sum', 'value_min', 'value_max')
+DEFAULT_RETENTION_DAYS = {'raw': 7, Resolution.MINUTE: 30, Resolution.HOUR: 400}
+UPSERT_CHUNK_SIZE = 1000
+UPDATE_CHUNK_SIZE = 1000
+
+
+class InvalidSample(ValueError):
+    pass
+
+
+def bucket_starts(moment):
+    """``(resolution, bucket start)`` of every UTC bucket containing ``moment``."""
+    minute = moment.astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+    return (
+        (Resolution.MINUTE, minute),
+        (Resolution.HOUR, minute.replace(minute=0)),
+        (Resolution.DAY, minute.replace(hour=0, minute=0)),
+    )
+
+
+def _parse_reading(reading, now):
+    if not isinstance(reading, dict):
+        raise InvalidSample("Each reading must be an object.")
+    asset_type = reading.get('asset_type')
+    if asset_type not in TELEMETRY_FIELDS:
+        raise InvalidSample(f"Unsupported asset_type '{asset_type}'.")
+    metrics = TELEMETRY_FIELDS[asset_type]
+    unknown = [key for key in reading if key not in IDENTITY_KEYS and key not in metrics]
+    if unknown:
+        raise InvalidSample(f"Unknown metric(s) for {asset_type}: {', '.join(unknown)}")
+    try:
+        asset_id = ASSET_MODELS[asset_type]._meta.pk.to_python(reading.get('asset_id'))
+    except Exception:
+        raise InvalidSample("Invalid asset_id.")
+    recorded_at = now
+    if reading.get('recorded_at'):
+        try:
+            recorded_at = parse_datetime(str(reading['recorded_at']))
+        except ValueError:
+            recorded_at = None
+        if recorded_at is None:
+            raise InvalidSample("Invalid recorded_at.")
+        if timezone.is_naive(recorded_at):
+            recorded_at = timezone.make_aware(recorded_at, dt_timezone.utc)
+    samples = []
+    for metric in metrics:
+        if reading.get(metric) is None:
+            continue
+        value = reading[metric]
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or not 0 <= value <= 100:
+            raise InvalidSample(f"{metric} must be a number between 0 and 100.")
+        samples.append(TelemetrySample(asset_type=asset_type, asset_id=asset_id, metric=metric,
+                                       recorded_at=recorded_at, value=round(value)))
+    if not samples:
+        raise InvalidSample("No metrics in reading.")
+    return samples
+
+
+def existing_assets(keys):
+    """The ``(asset_type, asset_id)`` pairs of ``keys`` that exist, with one query per asset type."""
+    by_type = {}
+    for asset_type, asset_id in keys:
+        by_type.setdefault(asset_type, set()).add(asset_id)
+    return {
+        (asset_type, asset_id)
+        for asset_type, ids in by_type.items()
+        for asset_id in ASSET_MODELS[asset_type].objects.filter(pk__in=ids).values_list('pk', flat=True)
+    }
+
+
+def parse_readings(readings, now=None):
+    """Turn posted readings into samples; returns ``(samples, errors)``.
+
+    A reading looks like ``{"asset_type": "server", "asset_id": "...",
+    "recorded_at": "...", "cpu_utilization": 42}``; ``recorded_at`` defaults
+    to now. Invalid readings and readings of unknown assets are reported by
+    index and skipped.
+    """
+    now = now or timezone.now()
+    parsed, errors = [], []
+    for index, reading in enumerate(readings):
+        try:
+            parsed.append((index, _parse_reading(reading, now)))
+        except InvalidSample as exc:
+            errors.append({'index': index, 'error': str(exc)})
+    known = existing_assets({(found[0].asset_type, found[0].asset_id) for _, found in parsed})
+    samples = []
+    for index, found in parsed:
+        if (found[0].asset_type, found[0].asset_id) in known:
+            samples.extend(found)
+        else:
+            errors.append({'index': index, 'error': f"No {found[0].asset_type} with id {found[0].asset_id}."})
+    errors.sort(key=lambda error: error['index'])
+    return samples, errors
+
+
+def rollup_buckets(samples):
+    """``{ROLLUP_KEY values: (count, sum, min, max)}`` for every bucket the samples touch."""
+    buckets = {}
+    starts = {}
+    for sample in samples:
+        if sample.recorded_at not in starts:
+            starts[sample.recorded_at] = bucket_starts(sample.recorded_at)
+        for resolution, start in starts[sample.recorded_at]:
+            key = (sample.asset_type, sample.asset_id, sample.metric, resolution, start)
+            count, total, low, high = buckets.get(key, (0, 0, sample.value, sample.value))
+            buckets[key] = (count + 1, total + sample.value, min(low, sample.value), max(high, sample.value))
+    return buckets
+
+
+def upsert_rollups(buckets):
+    """Add ``buckets`` to the stored rollups with chunked multi-row ``INSERT ... ON CONFLICT`` statements."""
+    if not buckets:
+        return
+    connection = transaction.get_connection()
+    quote = connection.ops.quote_name
+    table = quote(TelemetryRollup._meta.db_table)
+    least, greatest = ('LEAST', 'GREATEST') if connection.vendor == 'postgresql' else ('MIN', 'MAX')
+    columns = ROLLUP_KEY + ROLLUP_VALUES
+    row = f"({', '.join(['%s'] * len(columns))})"
+    # Only the UUID and datetime columns need converting for the database.
+    prepare_id = TelemetryRollup._meta.get_field('asset_id').get_db_prep_value
+    prepare_start = TelemetryRollup._meta.get_field('bucket_start').get_db_prep_value
+    # A stable order keeps concurrent writers from deadlocking on the same buckets.
+    rows = [
+        (asset_type, prepare_id(asset_id, connection), metric, resolution, prepare_start(start, connection), *values)
+        for (asset_type, asset_id, metric, resolution, start), values
+        in sorted(buckets.items(), key=lambda item: tuple(map(str, item[0])))
+    ]
+    fields = [TelemetryRollup._meta.get_field(name) for name in columns]
+    chunk_size = min(UPSERT_CHUNK_SIZE, connection.ops.bulk_batch_size(fields, rows))
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(quote(name) for name in columns)}) "
+                f"VALUES {', '.join([row] * len(chunk))} "
+                f"ON CONFLICT ({', '.join(quote(name) for name in ROLLUP_KEY)}) DO UPDATE SET "
+                f"sample_count = {table}.sample_count + EXCLUDED.sample_count, "
+                f"value_sum = {table}.value_sum + EXCLUDED.value_sum, "
+                f"value_min = {least}({table}.value_min, EXCLUDED.value_min), "
+                f"value_max = {greatest}({table}.value_max, EXCLUDED.value_max)",
+                [value for values in chunk for value in values],
+            )
+
+
+def _not_older(time):
+    return Q(utilization_recorded_at__isnull=True) | Q(utilization_recorded_at__lte=time)
+
+
+def _current_values(assets):
+    """``CASE`` expressions writing the readings of ``assets`` ({asset_id: {metric: sample}}).
+
+    A reading is only written when it is at least as new as the asset's stored
+    ``utilization_recorded_at``, which moves forward to the newest one.
+    """
+    readings = defaultdict(lambda: defaultdict(list))
+    newest = defaultdict(list)
+    for pk, metrics in assets.items():
+        for metric, sample in metrics.items():
+            readings[metric][(sample.recorded_at, sample.value)].append(pk)
+        newest[max(sample.recorded_at for sample in metrics.values())].append(pk)
+    changes = {
+        metric: Case(
+            *(When(Q(pk__in=ids) & _not_older(time), then=Value(value)) for (time, value), ids in groups.items()),
+            default=F(metric),
+        )
+        for metric, groups in readings.items()
+    }
+    # Assigned last: MySQL evaluates SET clauses in order, and the metrics
+    # above must be compared with the stored time, not the new one.
+    changes['utilization_recorded_at'] = Case(
+        *(When(Q(pk__in=ids) & _not_older(time), then=Value(time)) for time, ids in newest.items()),
+        default=F('utilization_recorded_at'),
+    )
+    return changes
+
+
+def refresh_current(samples):
+    """Copy the newest reading of each asset and metric onto the asset row.
+
+    One ``UPDATE`` per asset type and chunk of assets. Readings older than the
+    ones already stored are skipped, so a batch flushed late never overwrites
+    the values of a batch that was written before it.
+    """
+    latest = {}
+    for sample in samples:
+        key = (sample.asset_type, sample.asset_id, sample.metric)
+        if key not in latest or latest[key].recorded_at <= sample.recorded_at:
+            latest[key] = sample
+    by_type = defaultdict(lambda: defaultdict(dict))
+    for (asset_type, asset_id, metric), sample in latest.items():
+        by_type[asset_type][asset_id][metric] = sample
+    updated = 0
+    for asset_type, assets in by_type.items():
+        model = ASSET_MODELS[asset_type]
+        ids = list(assets)
+        for start in range(0, len(ids), UPDATE_CHUNK_SIZE):
+            chunk = {pk: assets[pk] for pk in ids[start:start + UPDATE_CHUNK_SIZE]}
+            updated += model.objects.filter(pk__in=list(chunk)).update(**_current_values(chunk))
+        versions.bump(model, versions.READINGS)
+    return updated
+
+
+def write_samples(samples):
+    with transaction.atomic():
+        TelemetrySample.objects.bulk_create(samples, batch_size=2000)
+        upsert_rollups(rollup_buckets(samples))
+        refresh_current(samples)
+
+
+buffer = BackgroundBatcher(
+    write_samples,
+    max_size=getattr(settings, 'ASSET_TELEMETRY_BATCH_SIZE', 5000),
+    interval=getattr(settings, 'ASSET_TELEMETRY_FLUSH_INTERVAL', 5.0),
+    name='asset-telemetry',
+)
+
+
+def ingest(samples):
+    """Queue ``samples`` for writing (or write them now when buffering is off)."""
+    if not samples:
+        return
+    if getattr(settings, 'ASSET_TELEMETRY_BUFFERED', True):
+        buffer.extend(samples)
+    else:
+        write_samples(samples)
+
+
+def history(asset_type, asset_id, metric, resolution=Resolution.HOUR, since=None, until=None):
+    """Rollup buckets of one asset and metric, oldest first."""
+    rollups = TelemetryRollup.objects.filter(
+        asset_type=asset_type, asset_id=asset_id, metric=metric, resolution=resolution,
+    )
+    if since is not None:
+        rollups = rollups.filter(bucket_start__gte=since)
+    if until is not None:
+        rollups = rollups.filter(bucket_start__lt=until)
+    return rollups.order_by('bucket_start')
+
+
+def prune_telemetry(retention_days=None, now=None):
+    """Delete raw samples and fine-grained rollups past their retention; daily rollups are kept.
+
+    Returns ``{'raw' or resolution: rows deleted}``.
+    """
+    retention_days = retention_days or getattr(settings, 'ASSET_TELEMETRY_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    now = now or timezone.now()
+    deleted = {}
+    for kind, days in retention_days.items():
+        cutoff = now - timedelta(days=days)
+        if kind == 'raw':
+            deleted[kind] = TelemetrySample.objects.filter(recorded_at__lt=cutoff).delete()[0]
+        else:
+            deleted[kind] = TelemetryRollup.objects.filter(resolution=kind, bucket_start__lt=cutoff).delete()[0]
+    return deleted
@@ -0,0 +1,19 @@
+from asset.models import CapacityRollup, Server
+
+
+def make_server(tag, **fields):
+    """Create a ``Server`` with the required choice fields filled in."""
+    fields.setdefault('name', f'Server {tag}')
+    fields.setdefault('server_type', 'PHYSICAL')
+    fields.setdefault('operating_system', 'UBUNTU')
+    fields.setdefault('server_role', 'WEB')
+    return Server.objects.create(asset_tag=tag, **fields)
+
+
+def rollup_totals():
+    """Non-empty ``CapacityRollup`` rows as ``{(dimension, key): (count, cores, ram, storage, used)}``."""
+    rows = CapacityRollup.objects.values_list(
+        'dimension', 'key', 'server_count', 'total_cores', 'total_ram_gb',
+        'total_storage_capacity_gb', 'total_storage_used_gb',
+    )
+    return {(dimension, key): tuple(totals) for dimension, key, *totals in rows if any(totals)}
@@ -0,0 +1,135 @@
+import json
+import uuid
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.api import fetch_batch, iter_list, parse_filters
+from asset.models import AssetChangeLog, NetworkDevice, Server
+from asset.tests.helpers import make_server
+
+
+async def read_json(response):
+    return json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+
+
+class ParseFiltersTests(TestCase):
+    def test_lookups(self):
+        filters = parse_filters(Server, {'status': 'ACTIVE', 'environment__in': 'PROD,DR', 'ram_gb__gte': '16',
+                                         'notes__isnull': 'true', 'fields': 'name', 'limit': '5'})
+        self.assertEqual(filters, {'status__exact': 'ACTIVE', 'environment__in': ['PROD', 'DR'],
+                                   'ram_gb__gte': 16, 'notes__isnull': True})
+
+    def test_invalid(self):
+        for params in ({'password': 'x'}, {'name__regex': 'x'}, {'ram_gb': 'lots'},
+                       {'configuration_items': 'x'}):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                parse_filters(Server, params)
+
+
+class IterListTests(TestCase):
+    def test_paged_on_primary_key(self):
+        servers = sorted((make_server(f'SRV-{index}') for index in range(3)), key=lambda server: server.pk)
+        data = json.loads(''.join(iter_list(Server.objects.all(), ['asset_tag'], limit=2, chunk_size=1)))
+        self.assertEqual(data['results'], [{'asset_tag': server.asset_tag} for server in servers[:2]])
+        self.assertEqual((data['count'], data['next']), (2, str(servers[1].pk)))
+        rest = json.loads(''.join(iter_list(Server.objects.filter(pk__gt=servers[1].pk), ['asset_tag'], limit=2)))
+        self.assertEqual((rest['count'], rest['next']), (1, None))
+
+
+class ApiViewTests(TestCase):
+    def setUp(self):
+        self.async_client.force_login(User.objects.create_user('alice'))
+        self.web = make_server('SRV-WEB', environment='PROD', ram_gb=32, purchase_date=date(2026, 1, 2))
+        self.db = make_server('SRV-DB', environment='DR', ram_gb=8)
+
+    async def test_list(self):
+        response = await self.async_client.get(reverse('api_list', args=['server']),
+                                               {'fields': 'asset_tag,ram_gb', 'ram_gb__gt': '10'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = await read_json(response)
+        self.assertEqual(data['results'], [{'asset_tag': 'SRV-WEB', 'ram_gb': 32}])
+
+    async def test_list_after(self):
+        first, second = sorted([self.web.pk, self.db.pk])
+        data = await read_json(await self.async_client.get(reverse('api_list', args=['server']),
+                                                           {'fields': 'id', 'after': str(first)}))
+        self.assertEqual(data['results'], [{'id': str(second)}])
+
+    async def test_detail(self):
+        response = await self.async_client.get(reverse('api_detail', args=['server', self.web.pk]),
+                                               {'fields': 'id,purchase_date,ram_gb'})
+        self.assertEqual(response.json(), {'id': str(self.web.pk), 'purchase_date': '2026-01-02', 'ram_gb': 32})
+
+    async def test_changelog_resource(self):
+        await AssetChangeLog.objects.acreate(asset_type='server', asset_id=self.web.pk, asset_name='web',
+                                             change_type='Updated', changed_fields={'ram_gb': [16, 32]})
+        response = await self.async_client.get(reverse('api_list', args=['changelog']),
+                                               {'fields': 'asset_id,changed_fields', 'change_type': 'Updated'})
+        self.assertEqual((await read_json(response))['results'],
+                         [{'asset_id': str(self.web.pk), 'changed_fields': {'ram_gb': [16, 32]}}])
+
+    async def test_bad_requests(self):
+        url = reverse('api_list', args=['server'])
+        self.assertEqual((await self.async_client.get(url, {'limit': '0'})).status_code, 400)
+        self.assertEqual((await self.async_client.get(url, {'after': 'nope'})).status_code, 400)
+        self.assertEqual((await self.async_client.get(url, {'fields': 'password'})).status_code, 400)
+        self.assertEqual((await self.async_client.get(reverse('api_list', args=['car']))).status_code, 404)
+        self.assertEqual((await self.async_client.get(reverse('api_detail', args=['server', 'x']))).status_code, 404)
+
+
+class FetchBatchTests(TestCase):
+    def setUp(self):
+        self.server = make_server('SRV-1')
+        self.device = NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER')
+
+    def test_results_follow_input_order(self):
+        results, missing_ids, missing_tags = fetch_batch(
+            ids=[str(self.device.pk), 'not-a-uuid', str(uuid.uuid4())],
+            asset_tags=['SRV-1', 'NET-1', 'NOPE'],
+        )
+        self.assertEqual([(r['asset_type'], r['id']) for r in results],
+                         [('networkdevice', str(self.device.pk)), ('server', str(self.server.pk))])
+        self.assertEqual(results[1]['asset_tag'], 'SRV-1')
+        self.assertEqual(len(missing_ids), 2)
+        self.assertEqual(missing_ids[0], 'not-a-uuid')
+        self.assertEqual(missing_tags, ['NOPE'])
+
+    def test_requested_fields_only(self):
+        results, _, _ = fetch_batch(asset_tags=['SRV-1'], fields=['name'])
+        self.assertEqual(results, [{'asset_type': 'server', 'id': str(self.server.pk), 'name': 'Server SRV-1'}])
+
+    def test_restricted_to_asset_types(self):
+        results, _, missing_tags = fetch_batch(asset_tags=['SRV-1', 'NET-1'], asset_types=['server'])
+        self.assertEqual([r['asset_tag'] for r in results], ['SRV-1'])
+        self.assertEqual(missing_tags, ['NET-1'])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            fetch_batch(asset_tags=['SRV-1'], fields=['no_such_column'])
+
+
+class ApiBatchViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-1')
+
+    def post(self, payload):
+        return self.client.post(reverse('api_batch'), json.dumps(payload), content_type='application/json')
+
+    def test_batch(self):
+        response = self.post({'ids': [str(self.server.pk)], 'asset_tags': ['NOPE'], 'fields': ['name']})
+        self.assertEqual(response.json(), {
+            'results': [{'asset_type': 'server', 'id': str(self.server.pk), 'name': 'Server SRV-1'}],
+            'missing': {'ids': [], 'asset_tags': ['NOPE']},
+        })
+
+    def test_bad_requests(self):
+        for payload in ([], {'ids': 'SRV-1'}, {'asset_tags': ['SRV-1'], 'fields': ['nope']},
+                        {'asset_tags': ['SRV-1'], 'types': ['car']},
+                        {'asset_tags': ['SRV-1'], 'fields': [1, {'a': 1}]},
+                        {'asset_tags': ['SRV-1'], 'types': [['server']]}):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
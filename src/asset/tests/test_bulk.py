@@ -0,0 +1,115 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from asset import bulk, capacity
+from asset.lookup import find_assets
+from asset.models import AssetChangeLog, AssetLookup, AssetSearchDocument, NetworkDevice, Server
+from asset.tests.helpers import make_server, rollup_totals
+
+
+class SelectTests(TestCase):
+    def test_needs_ids_or_filters(self):
+        with self.assertRaises(ValueError):
+            bulk.select(Server)
+        self.assertEqual(bulk.select(Server, ids=[]).count(), 0)
+
+    def test_clean_changes(self):
+        owner = User.objects.create_user('alice')
+        self.assertEqual(bulk.clean_changes(Server, {'status': 'RETIRED', 'owner': str(owner.pk), 'site': ''}),
+                         {'status': 'RETIRED', 'owner_id': owner.pk, 'site': None})
+        for changes in ({}, {'hostname': 'x'}, {'status': 'BROKEN'}, {'owner': 999}):
+            with self.subTest(changes=changes), self.assertRaises(ValueError):
+                bulk.clean_changes(Server, changes)
+
+
+@override_settings(ASSET_CHANGELOG_BUFFERED=False)
+class BulkUpdateTests(TestCase):
+    def setUp(self):
+        self.host = make_server('SRV-HOST', site='Main', number_of_cores=32, ram_gb=256)
+        self.vm = make_server('SRV-VM', site='Main', number_of_cores=4, ram_gb=16, hypervisor_host=self.host)
+        self.moved = make_server('SRV-MOVED', site='Branch', ram_gb=8)
+
+    def test_dry_run(self):
+        result = bulk.bulk_update(bulk.select(Server, filters={'site': 'Main'}), {'site': 'DR'}, dry_run=True)
+        self.assertEqual(result, {'matched': 2, 'updated': 0, 'dry_run': True})
+        self.assertFalse(Server.objects.filter(site='DR').exists())
+
+    def test_only_changed_rows_are_written_and_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk.bulk_update(Server.objects.all(), {'site': 'Branch'}, notes='Move')
+        self.assertEqual(result, {'matched': 3, 'updated': 2, 'dry_run': False})
+        self.assertEqual(Server.objects.filter(site='Branch').count(), 3)
+        entries = AssetChangeLog.objects.filter(change_type='Updated')
+        self.assertEqual(sorted(entry.asset_id for entry in entries), sorted([self.host.pk, self.vm.pk]))
+        self.assertEqual(entries[0].changed_fields, {'site': {'old': 'Main', 'new': 'Branch'}})
+        self.assertEqual(entries[0].notes, 'Move')
+
+    def test_capacity_rollups_follow(self):
+        bulk.bulk_update(bulk.select(Server, ids=[self.vm.pk]), {'site': 'Branch'})
+        totals = rollup_totals()
+        capacity.rebuild_rollups()
+        self.assertEqual(totals, rollup_totals())
+        self.assertEqual(totals[('site', 'Branch')][:3], (2, 4, 24))
+
+
+@override_settings(ASSET_CHANGELOG_BUFFERED=False)
+class BulkDeleteTests(TestCase):
+    def setUp(self):
+        self.host = make_server('SRV-HOST', hostname='host01', site='Main', number_of_cores=32, ram_gb=256)
+        self.vm = make_server('SRV-VM', site='Main', number_of_cores=4, ram_gb=16, hypervisor_host=self.host)
+        self.other = make_server('SRV-OTHER', site='Main', ram_gb=8)
+
+    def test_delete(self):
+        queryset = bulk.select(Server, ids=[self.host.pk, self.other.pk])
+        self.assertEqual(bulk.bulk_delete(queryset, dry_run=True), {'matched': 2, 'deleted': 0, 'dry_run': True})
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk.bulk_delete(queryset, notes='Decommissioned')
+        self.assertEqual(result, {'matched': 2, 'deleted': 2, 'dry_run': False})
+        self.assertQuerySetEqual(Server.objects.all(), [self.vm])
+        self.assertIsNone(Server.objects.get().hypervisor_host_id)
+        self.assertEqual(find_assets('host01'), [])
+        self.assertFalse(AssetLookup.objects.filter(asset_id=self.host.pk).exists())
+        self.assertFalse(AssetSearchDocument.objects.filter(asset_id=self.other.pk).exists())
+        deleted = AssetChangeLog.objects.filter(change_type='Deleted').values_list('asset_id', flat=True)
+        self.assertEqual(sorted(deleted), sorted([self.host.pk, self.other.pk]))
+
+    def test_capacity_rollups_follow(self):
+        bulk.bulk_delete(bulk.select(Server, ids=[self.host.pk]))
+        totals = rollup_totals()
+        capacity.rebuild_rollups()
+        self.assertEqual(totals, rollup_totals())
+        self.assertEqual(totals[('site', 'Main')][:3], (2, 4, 24))
+
+    def test_network_references_are_cleared(self):
+        core = NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER')
+        edge = NetworkDevice.objects.create(asset_tag='NET-2', name='edge', device_type='SWITCH',
+                                            uplink_device=core, failover_partner=core)
+        bulk.bulk_delete(bulk.select(NetworkDevice, ids=[core.pk]))
+        edge.refresh_from_db()
+        self.assertEqual((edge.uplink_device_id, edge.failover_partner_id), (None, None))
+
+
+class BulkViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-1', site='Main')
+
+    def post(self, name, payload, asset_type='server'):
+        return self.client.post(reverse(name, args=[asset_type]), json.dumps(payload),
+                                content_type='application/json')
+
+    def test_update_and_delete(self):
+        response = self.post('bulk_update_assets', {'filters': {'site': 'Main'}, 'changes': {'status': 'RETIRED'}})
+        self.assertEqual(response.json(), {'matched': 1, 'updated': 1, 'dry_run': False})
+        response = self.post('bulk_delete_assets', {'ids': [str(self.server.pk)]})
+        self.assertEqual(response.json(), {'matched': 1, 'deleted': 1, 'dry_run': False})
+
+    def test_bad_requests(self):
+        self.assertEqual(self.post('bulk_update_assets', {'ids': ['x'], 'changes': {}}).status_code, 400)
+        self.assertEqual(self.post('bulk_update_assets', {'ids': [], 'changes': 'RETIRED'}).status_code, 400)
+        self.assertEqual(self.post('bulk_delete_assets', {}).status_code, 400)
+        self.assertEqual(self.post('bulk_delete_assets', {'filters': {'limit': 1}}).status_code, 400)
+        self.assertEqual(self.post('bulk_delete_assets', {'ids': []}, asset_type='car').status_code, 404)
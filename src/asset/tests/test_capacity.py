@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset import capacity
+from asset.models import Server
+from asset.tests.helpers import make_server, rollup_totals
+
+
+class CapacityRollupTests(TestCase):
+    def setUp(self):
+        self.host = make_server('SRV-HOST', site='Main', cluster_name='c1', number_of_cores=32, ram_gb=256)
+        self.vm = make_server('SRV-VM', site='Main', cluster_name='c1', number_of_cores=4, ram_gb=16,
+                              storage_capacity_gb=100, storage_used_gb=40, hypervisor_host=self.host)
+
+    def assertMatchesRebuild(self):
+        totals = rollup_totals()
+        capacity.rebuild_rollups()
+        self.assertEqual(totals, rollup_totals())
+        return totals
+
+    def test_creates(self):
+        totals = self.assertMatchesRebuild()
+        self.assertEqual(totals[('site', 'Main')], (2, 36, 272, 100, 40))
+        self.assertEqual(totals[('hypervisor_host', str(self.host.pk))], (1, 4, 16, 100, 40))
+        self.assertEqual(capacity.capacity_for('cluster', 'c1').server_count, 2)
+
+    def test_moves_between_groups(self):
+        vm = Server.objects.get(pk=self.vm.pk)
+        vm.site = 'Branch'
+        vm.ram_gb = 32
+        vm.save()
+        totals = self.assertMatchesRebuild()
+        self.assertEqual(totals[('site', 'Branch')], (1, 4, 32, 100, 40))
+        self.assertEqual(totals[('site', 'Main')], (1, 32, 256, 0, 0))
+
+    def test_update_fields(self):
+        vm = Server.objects.get(pk=self.vm.pk)
+        vm.ram_gb = 64
+        vm.site = 'Branch'
+        vm.save(update_fields=['ram_gb'])
+        totals = self.assertMatchesRebuild()
+        self.assertNotIn(('site', 'Branch'), totals)
+
+    def test_deletes(self):
+        self.host.delete()
+        totals = self.assertMatchesRebuild()
+        self.assertNotIn(('hypervisor_host', str(self.host.pk)), totals)
+        self.assertEqual(totals[('site', 'Main')], (1, 4, 16, 100, 40))
+
+    def test_untracked_save_takes_no_lock(self):
+        vm = Server.objects.get(pk=self.vm.pk)
+        vm.hostname = 'vm01'
+        with mock.patch.object(capacity, 'stored_values', wraps=capacity.stored_values) as stored_values:
+            vm.save()
+            self.assertFalse(stored_values.called)
+            vm.ram_gb = 8
+            vm.save()
+            self.assertTrue(stored_values.called)
+        self.assertMatchesRebuild()
+
+    def test_stale_copy_does_not_revert_capacity(self):
+        stale = Server.objects.get(pk=self.vm.pk)
+        fresh = Server.objects.get(pk=self.vm.pk)
+        fresh.ram_gb = 32
+        fresh.save()
+        stale.hostname = 'vm01'
+        stale.save()
+        self.assertEqual(Server.objects.values_list('ram_gb', 'hostname').get(pk=self.vm.pk), (32, 'vm01'))
+        self.assertMatchesRebuild()
+
+    def test_stale_copy_changing_capacity(self):
+        stale = Server.objects.get(pk=self.vm.pk)
+        fresh = Server.objects.get(pk=self.vm.pk)
+        fresh.ram_gb = 32
+        fresh.save()
+        stale.ram_gb = 64
+        stale.save()
+        self.assertEqual(self.assertMatchesRebuild()[('site', 'Main')][2], 320)
+
+
+class CapacityViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('viewer'))
+        make_server('SRV-1', site='Main', ram_gb=64)
+
+    def test_one_key(self):
+        response = self.client.get(reverse('capacity_rollup', args=['site']), {'key': 'Main'})
+        self.assertEqual((response.json()['server_count'], response.json()['total_ram_gb']), (1, 64))
+        self.assertEqual(self.client.get(reverse('capacity_rollup', args=['site']), {'key': 'x'}).status_code, 404)
+
+    def test_largest(self):
+        response = self.client.get(reverse('capacity_rollup', args=['site']))
+        self.assertEqual([row['key'] for row in response.json()['results']], ['Main'])
+        self.assertEqual(self.client.get(reverse('capacity_rollup', args=['rack'])).status_code, 404)
@@ -0,0 +1,111 @@
+import uuid
+
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from asset import changelog, heartbeat
+from asset.batching import BackgroundBatcher, CoalescingBatcher
+from asset.models import AssetChangeLog, Server
+from asset.seeding import seed_assets
+from asset.tests.helpers import make_server
+
+
+@override_settings(ASSET_CHANGELOG_BUFFERED=False)
+class ChangeCaptureTests(TestCase):
+    def test_save_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            server = make_server('SRV-1', hostname='web01')
+        pk = server.pk
+        server = Server.objects.get(pk=pk)
+        server.hostname = 'web02'
+        server.ram_gb = 32
+        with self.captureOnCommitCallbacks(execute=True):
+            server.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            server.delete()
+        entries = list(AssetChangeLog.objects.for_asset('server', pk).order_by('changed_at', 'pk'))
+        self.assertEqual([entry.change_type for entry in entries], ['Created', 'Updated', 'Deleted'])
+        self.assertEqual(entries[1].changed_fields, {
+            'hostname': {'old': 'web01', 'new': 'web02'},
+            'ram_gb': {'old': None, 'new': 32},
+        })
+
+    def test_unchanged_save_is_not_logged(self):
+        server = make_server('SRV-1')
+        server = Server.objects.get(pk=server.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            server.save()
+        self.assertFalse(AssetChangeLog.objects.exists())
+
+    def test_machine_maintained_fields_are_not_logged(self):
+        server = Server.objects.get(pk=make_server('SRV-1').pk)
+        server.cpu_utilization = 90
+        with self.captureOnCommitCallbacks(execute=True):
+            server.save()
+        items, _ = heartbeat.parse_heartbeats(['SRV-1'])
+        with self.captureOnCommitCallbacks(execute=True):
+            heartbeat.write_heartbeats(items)
+        self.assertFalse(AssetChangeLog.objects.exists())
+        self.assertIsNotNone(Server.objects.get().last_seen)
+
+    def test_nothing_is_written_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            make_server('SRV-1')
+        self.assertFalse(AssetChangeLog.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(AssetChangeLog.objects.get().change_type, 'Created')
+
+
+class WriteEntriesTests(TestCase):
+    def entry(self, asset_id=None):
+        return changelog.build_entry('server', asset_id, 'name', changelog.CREATED, context={})
+
+    def test_bad_entry_only_loses_itself(self):
+        # asset_id is NOT NULL.
+        with self.assertLogs('asset.changelog', 'ERROR'):
+            changelog.write_entries([self.entry(uuid.uuid4()), self.entry(), self.entry(uuid.uuid4())])
+        self.assertEqual(AssetChangeLog.objects.count(), 2)
+
+    def test_raises_when_every_entry_fails(self):
+        with self.assertRaises(DatabaseError):
+            changelog.write_entries([self.entry(), self.entry()])
+
+
+class SeedingChangeLogTests(TestCase):
+    def test_opt_in(self):
+        seed_assets(Server, 3, seed=5, use_copy=False)
+        self.assertFalse(AssetChangeLog.objects.exists())
+        seed_assets(Server, 2, seed=5, start=3, use_copy=False, log_changes=True)
+        self.assertEqual(list(AssetChangeLog.objects.order_by().values_list('change_type', 'notes').distinct()),
+                         [('Created', 'Seeded')])
+        self.assertEqual(AssetChangeLog.objects.count(), 2)
+
+
+class BatcherTests(SimpleTestCase):
+    def test_failed_flush_is_retried_then_dropped(self):
+        calls = []
+
+        def flush(items):
+            calls.append(list(items))
+            raise DatabaseError("down")
+
+        batcher = BackgroundBatcher(flush, retries=1, name='test')
+        batcher._items.extend([1, 2])
+        with self.assertLogs('asset.batching', 'WARNING'):
+            self.assertEqual(batcher.flush(), 0)
+        self.assertEqual(len(batcher), 2)
+        batcher._items.append(3)
+        with self.assertLogs('asset.batching', 'ERROR'):
+            batcher.flush()
+        self.assertEqual(len(batcher), 0)
+        self.assertEqual(calls, [[1, 2], [1, 2, 3]])
+
+    def test_coalescing(self):
+        flushed = []
+        batcher = CoalescingBatcher(flushed.extend, key=lambda item: item[0],
+                                    combine=lambda old, new: (old[0], old[1] + new[1]))
+        batcher._merge(batcher._items, [('a', 1), ('b', 1), ('a', 2)])
+        self.assertEqual(batcher.flush(), 2)
+        self.assertEqual(sorted(flushed), [('a', 3), ('b', 1)])
+        self.assertEqual(batcher.merged, 1)
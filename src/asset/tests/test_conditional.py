@@ -0,0 +1,93 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from asset import heartbeat, telemetry
+from asset.models import Server
+from asset.tests.helpers import make_server
+
+SEEN = datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class DetailValidatorTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-1')
+        self.url = reverse('server_detail', args=[self.server.pk])
+
+    def validators(self):
+        # If-None-Match: * answers 304 for any existing asset, without rendering the page.
+        response = self.client.get(self.url, headers={'if-none-match': '*'})
+        self.assertEqual(response.status_code, 304)
+        return response.headers['ETag'], response.headers['Last-Modified']
+
+    def test_not_modified(self):
+        etag, last_modified = self.validators()
+        self.assertEqual(last_modified, http_date(Server.objects.get().updated_at.timestamp()))
+        self.assertEqual(self.client.get(self.url, headers={'if-none-match': etag}).status_code, 304)
+        response = self.client.get(self.url, headers={'if-modified-since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+
+    def test_heartbeat_changes_validators(self):
+        etag, _ = self.validators()
+        heartbeat.write_heartbeats(heartbeat.parse_heartbeats(['SRV-1'], seen_at=SEEN)[0])
+        new_etag, last_modified = self.validators()
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(last_modified, http_date(SEEN.timestamp()))
+
+    def test_etag_is_per_user(self):
+        etag, _ = self.validators()
+        self.client.force_login(User.objects.create_user('bob'))
+        self.assertNotEqual(self.validators()[0], etag)
+
+    def test_missing_asset(self):
+        url = reverse('server_detail', args=['00000000-0000-0000-0000-000000000000'])
+        self.assertEqual(self.client.get(url, headers={'if-none-match': '*'}).status_code, 404)
+
+
+@override_settings(ASSET_TELEMETRY_BUFFERED=False)
+class ListValidatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('alice'))
+        self.url = reverse('overview_servers')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.server = make_server('SRV-1')
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response.headers)
+        return response.headers['ETag']
+
+    def test_not_modified_without_querying_the_table(self):
+        etag = self.etag()
+        # Only the session and user lookups of login_required remain.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertNotEqual(self.client.get(self.url, {'page_size': 10}).headers['ETag'], etag)
+
+    def test_saves_and_deletes_change_the_etag(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.server.name = 'renamed'
+            self.server.save()
+        renamed = self.etag()
+        self.assertNotEqual(renamed, etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.server.delete()
+        self.assertNotEqual(self.etag(), renamed)
+
+    def test_telemetry_changes_the_etag(self):
+        etag = self.etag()
+        samples, _ = telemetry.parse_readings([{'asset_type': 'server', 'asset_id': str(self.server.pk),
+                                                'cpu_utilization': 50}])
+        with self.captureOnCommitCallbacks(execute=True):
+            telemetry.ingest(samples)
+        self.assertNotEqual(self.etag(), etag)
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.config import assets_with_config
+from asset.models import IoTDevice, Server
+from asset.tests.helpers import make_server
+
+
+class ConfigQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = make_server('SRV-A', configuration_items={'patch_group': 'A', 'os.name': 'ubuntu', 'replicas': 3})
+        cls.b = make_server('SRV-B', configuration_items={'patch_group': 'B', 'last_audit': '2026-01-01'})
+        cls.bare = make_server('SRV-C')
+        cls.sensor = IoTDevice.objects.create(asset_tag='IOT-1', name='sensor', device_type='SENSOR',
+                                              configuration_items={'patch_group': 'A'})
+
+    def test_promoted_key(self):
+        self.assertEqual(Server.objects.get(pk=self.a.pk).config_patch_group, 'A')
+        query = str(Server.objects.with_config(patch_group='A').query)
+        self.assertIn('config_patch_group', query)
+        self.assertQuerySetEqual(Server.objects.with_config(patch_group='A'), [self.a])
+
+    def test_other_keys(self):
+        self.assertQuerySetEqual(Server.objects.with_config({'os.name': 'ubuntu'}, replicas=3), [self.a])
+        self.assertFalse(Server.objects.with_config(patch_group='A', replicas=2).exists())
+
+    def test_non_string_value_of_promoted_key(self):
+        server = make_server('SRV-D', configuration_items={'patch_group': 7})
+        self.assertQuerySetEqual(Server.objects.with_config(patch_group=7), [server])
+
+    def test_with_config_keys(self):
+        self.assertQuerySetEqual(Server.objects.with_config_keys('last_audit'), [self.b])
+        self.assertQuerySetEqual(Server.objects.with_config_keys('patch_group').order_by('asset_tag'),
+                                 [self.a, self.b])
+        self.assertFalse(Server.objects.with_config_keys('patch_group', 'os.name', 'last_audit').exists())
+
+    def test_assets_with_config_across_types(self):
+        self.assertEqual(assets_with_config({'patch_group': 'A'}), [
+            ('server', self.a.pk, 'SRV-A'),
+            ('iotdevice', self.sensor.pk, 'IOT-1'),
+        ])
+        self.assertEqual(assets_with_config({'patch_group': 'A'}, limit=1), [('server', self.a.pk, 'SRV-A')])
+        self.assertEqual(assets_with_config(keys=['last_audit'], asset_types=['iotdevice']), [])
+
+
+class AssetsWithConfigViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-A', configuration_items={'patch_group': 'A', 'last_audit': '2026-01-01'})
+
+    def test_results(self):
+        response = self.client.get(reverse('assets_with_config'),
+                                   {'match': 'patch_group=A', 'has': 'last_audit', 'types': 'server'})
+        self.assertEqual(response.json()['results'], [
+            {'asset_type': 'server', 'asset_id': str(self.server.pk), 'asset_tag': 'SRV-A'},
+        ])
+
+    def test_bad_requests(self):
+        url = reverse('assets_with_config')
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'match': 'patch_group'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'has': 'x', 'types': 'toaster'}).status_code, 400)
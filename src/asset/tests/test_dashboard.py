@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from asset import bulk, dashboard, versions
+from asset.importer import import_assets
+from asset.models import NetworkDevice, Server
+from asset.tests.helpers import make_server
+
+
+class FleetSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.web = make_server('SRV-1', status='ACTIVE', environment='PRODUCTION', encrypted=False)
+        make_server('SRV-2', status='ACTIVE', environment='DEVELOPMENT', encrypted=True, compliance_status=False)
+        NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER', status='MAINTENANCE',
+                                     encrypted=True)
+
+    def test_counts(self):
+        summary = dashboard.fleet_summary()
+        self.assertEqual(summary['fleet']['total'], 3)
+        self.assertEqual(summary['by_type']['server']['status'], {'ACTIVE': 2})
+        self.assertEqual(summary['by_type']['server']['environment'], {'PRODUCTION': 1, 'DEVELOPMENT': 1})
+        self.assertEqual(summary['by_type']['networkdevice']['status'], {'MAINTENANCE': 1})
+        self.assertEqual((summary['fleet']['unencrypted'], summary['fleet']['non_compliant']), (1, 1))
+        self.assertIn(('Active', 2), dashboard.labelled_counts(summary['fleet'])['status'])
+
+    def test_cached_until_a_write(self):
+        dashboard.fleet_summary()
+        with self.assertNumQueries(0):
+            dashboard.fleet_summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.web.status = 'RETIRED'
+            self.web.save()
+        with self.assertNumQueries(1):
+            summary = dashboard.fleet_summary()
+        self.assertEqual(summary['by_type']['server']['status'], {'ACTIVE': 1, 'RETIRED': 1})
+
+    def test_other_writes_bump_the_version(self):
+        version = versions.get_version(Server)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.bulk_update(Server.objects.filter(pk=self.web.pk), {'status': 'RETIRED'})
+        self.assertGreater(versions.get_version(Server), version)
+        version = versions.get_version(Server)
+        with self.captureOnCommitCallbacks(execute=True):
+            import_assets(Server, [{'asset_tag': 'SRV-1', 'name': 'Renamed'}])
+        self.assertGreater(versions.get_version(Server), version)
+        version = versions.get_version(Server)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.web.delete()
+        self.assertGreater(versions.get_version(Server), version)
+        self.assertEqual(dashboard.fleet_summary()['by_type']['server']['total'], 1)
+
+    def test_unchanged_save_keeps_the_version(self):
+        version = versions.get_version(Server)
+        with self.captureOnCommitCallbacks(execute=True):
+            Server.objects.get(pk=self.web.pk).save()
+        self.assertEqual(versions.get_version(Server), version)
+
+    def test_evicted_counter_does_not_reuse_a_version(self):
+        version = versions.get_version(Server)
+        cache.delete(versions.cache_key(Server))
+        self.assertGreater(versions.get_version(Server), version)
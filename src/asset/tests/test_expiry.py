@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from asset import expiry
+from asset.models import ExpirySnapshot, Server
+from asset.tests.helpers import make_server
+
+TODAY = date(2026, 3, 1)
+
+
+class UpcomingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.web = make_server('SRV-WEB', warranty_expiration=TODAY + timedelta(days=20),
+                              support_expiration=TODAY + timedelta(days=5))
+        cls.db = make_server('SRV-DB', lease_expiration=TODAY + timedelta(days=10),
+                             end_of_life_date=TODAY - timedelta(days=3))
+        make_server('SRV-OLD', warranty_expiration=TODAY + timedelta(days=1), status=Server.Status.RETIRED)
+        make_server('SRV-LATER', warranty_expiration=TODAY + timedelta(days=60))
+
+    def test_merged_in_date_order(self):
+        items = expiry.upcoming(30, TODAY)
+        self.assertEqual([(item.asset_tag, item.field) for item in items], [
+            ('SRV-WEB', 'support_expiration'),
+            ('SRV-DB', 'lease_expiration'),
+            ('SRV-WEB', 'warranty_expiration'),
+        ])
+        self.assertEqual(items[0].asset_type, 'server')
+
+    def test_overdue_days(self):
+        items = expiry.upcoming(7, TODAY, overdue_days=7)
+        self.assertEqual([item.field for item in items], ['end_of_life_date', 'support_expiration'])
+
+    def test_snapshot(self):
+        self.assertIsNone(expiry.snapshot_expiries(30, TODAY))
+        self.assertEqual(expiry.build_snapshot(TODAY, days=30), 3)
+        live = expiry.upcoming(30, TODAY)
+        with self.assertNumQueries(2):
+            self.assertEqual(expiry.snapshot_expiries(30, TODAY), live)
+        self.assertEqual(len(expiry.snapshot_expiries(7, TODAY)), 1)
+        # A window wider than the snapshot's falls back to the live query.
+        self.assertIsNone(expiry.snapshot_expiries(90, TODAY))
+        self.assertEqual(len(expiry.expiries(90, TODAY)), 4)
+
+    def test_rebuilding_replaces_todays_snapshot(self):
+        ExpirySnapshot.objects.create(snapshot_date=TODAY - timedelta(days=40), asset_type='server',
+                                      asset_id=self.web.pk, asset_tag='SRV-WEB', asset_name='web',
+                                      field='warranty_expiration', expires_on=TODAY)
+        expiry.build_snapshot(TODAY, days=30)
+        expiry.build_snapshot(TODAY, days=30)
+        self.assertEqual(ExpirySnapshot.objects.count(), 3)
+
+
+class ExpiryCommandTests(TestCase):
+    def test_snapshot_and_email(self):
+        make_server('SRV-WEB', warranty_expiration=timezone.localdate() + timedelta(days=3))
+        out = StringIO()
+        call_command('expiry_snapshot', '--email', 'ops@example.com', stdout=out)
+        self.assertIn('1 expiries', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('SRV-WEB', mail.outbox[0].body)
+
+    @override_settings(ASSET_EXPIRY_ALERT_RECIPIENTS=[])
+    def test_email_needs_recipients(self):
+        with self.assertRaisesMessage(CommandError, 'No recipients'):
+            call_command('expiry_snapshot', '--email', stdout=StringIO())
+
+
+class ExpiryViewTests(TestCase):
+    def test_expiry_radar(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        make_server('SRV-WEB', warranty_expiration=timezone.localdate() + timedelta(days=3))
+        response = self.client.get(reverse('expiry_radar'), {'days': 7})
+        self.assertEqual(response.context['days'], 7)
+        self.assertEqual([item.asset_tag for item in response.context['expiries']], ['SRV-WEB'])
+        self.assertEqual(self.client.get(reverse('expiry_radar'), {'days': 'x'}).status_code, 400)
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.export import encode_header, encode_rows, export_queryset, iter_export, resolve_fields
+from asset.models import Server
+from asset.tests.helpers import make_server
+
+
+async def read_stream(response):
+    return b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+
+class ExportEncodingTests(TestCase):
+    def test_chunks(self):
+        for index in range(5):
+            make_server(f'SRV-{index}')
+        chunks = list(iter_export(export_queryset(Server, ['asset_tag']), 'csv', ['asset_tag'], chunk_size=2))
+        self.assertEqual(chunks[0], 'asset_tag\r\n')
+        self.assertEqual([chunk.count('\n') for chunk in chunks[1:]], [2, 2, 1])
+
+    def test_json_values_in_csv(self):
+        row = encode_rows('csv', ['configuration_items'], [({'a': [1, 2]},)])
+        self.assertEqual(next(csv.reader(io.StringIO(row))), ['{"a":[1,2]}'])
+
+    def test_ndjson(self):
+        self.assertEqual(encode_header('ndjson', ['name']), '')
+        self.assertEqual(encode_rows('ndjson', ['name', 'ram_gb'], [('a', 1), ('b', None)]),
+                         '{"name":"a","ram_gb":1}\n{"name":"b","ram_gb":null}\n')
+
+    def test_resolve_fields(self):
+        self.assertIn('asset_tag', resolve_fields(Server))
+        self.assertEqual(resolve_fields(Server, ['name', 'id']), ['name', 'id'])
+        with self.assertRaises(ValueError):
+            resolve_fields(Server, ['name', 'password'])
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        self.server = make_server('SRV-1', hostname='web01')
+        self.async_client.force_login(User.objects.create_user('viewer'))
+
+    async def test_csv(self):
+        response = await self.async_client.get(reverse('export_assets', args=['server']),
+                                               {'fields': 'asset_tag,hostname'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="server-', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(await read_stream(response))))
+        self.assertEqual(rows, [['asset_tag', 'hostname'], ['SRV-1', 'web01']])
+
+    async def test_ndjson(self):
+        response = await self.async_client.get(reverse('export_assets', args=['server']), {'format': 'ndjson'})
+        rows = [json.loads(line) for line in (await read_stream(response)).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]['id'], rows[0]['asset_tag']), (str(self.server.pk), 'SRV-1'))
+
+    async def test_bad_requests(self):
+        url = reverse('export_assets', args=['server'])
+        self.assertEqual((await self.async_client.get(url, {'format': 'xml'})).status_code, 400)
+        self.assertEqual((await self.async_client.get(url, {'fields': 'nope'})).status_code, 400)
+        self.assertEqual((await self.async_client.get(reverse('export_assets', args=['car']))).status_code, 404)
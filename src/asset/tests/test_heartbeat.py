@@ -0,0 +1,92 @@
+import json
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from asset import heartbeat
+from asset.models import Server
+from asset.tests.helpers import make_server
+
+
+class HeartbeatTests(TestCase):
+    def setUp(self):
+        self.web = make_server('SRV-WEB', hostname='web01')
+        self.db = make_server('SRV-DB', hostname='db01')
+        self.t1 = timezone.make_aware(datetime(2026, 3, 1, 10, 0))
+        self.t2 = timezone.make_aware(datetime(2026, 3, 1, 11, 0))
+
+    def test_each_asset_gets_its_own_seen_at(self):
+        items, errors = heartbeat.parse_heartbeats([
+            {'asset_tag': 'SRV-WEB', 'seen_at': self.t1.isoformat()},
+            {'hostname': 'db01', 'seen_at': self.t2.isoformat(), 'scanned': True},
+        ])
+        self.assertEqual(errors, [])
+        counts = heartbeat.write_heartbeats(items)
+        self.assertEqual(counts['rows_updated'], 2)
+        self.assertEqual(counts['unresolved'], 0)
+        self.web.refresh_from_db()
+        self.db.refresh_from_db()
+        self.assertEqual(self.web.last_seen, self.t1)
+        self.assertIsNone(self.web.last_scanned)
+        self.assertEqual(self.db.last_seen, self.t2)
+        self.assertEqual(self.db.last_scanned, self.t2)
+
+    def test_older_seen_at_does_not_move_back(self):
+        Server.objects.filter(pk=self.web.pk).update(last_seen=self.t2)
+        items, _ = heartbeat.parse_heartbeats([{'asset_tag': 'SRV-WEB', 'seen_at': self.t1.isoformat()}])
+        heartbeat.write_heartbeats(items)
+        self.web.refresh_from_db()
+        self.assertEqual(self.web.last_seen, self.t2)
+
+    def test_batch_default_seen_at(self):
+        items, _ = heartbeat.parse_heartbeats(['SRV-WEB'], seen_at=self.t1)
+        heartbeat.write_heartbeats(items)
+        self.web.refresh_from_db()
+        self.assertEqual(self.web.last_seen, self.t1)
+
+    def test_invalid_seen_at(self):
+        items, errors = heartbeat.parse_heartbeats([
+            {'asset_tag': 'SRV-WEB', 'seen_at': '2026-02-30T00:00:00'},
+            {'asset_tag': 'SRV-DB', 'seen_at': 'yesterday'},
+            {'asset_tag': 'SRV-DB'},
+        ])
+        self.assertEqual(len(items), 1)
+        self.assertEqual(errors, [{'index': 0, 'error': "Invalid seen_at."},
+                                  {'index': 1, 'error': "Invalid seen_at."}])
+
+    def test_unknown_identifier_is_unresolved(self):
+        items, _ = heartbeat.parse_heartbeats([{'hostname': 'nowhere'}])
+        counts = heartbeat.write_heartbeats(items)
+        self.assertEqual((counts['rows_updated'], counts['unresolved']), (0, 1))
+
+    def test_one_update_per_chunk(self):
+        items, _ = heartbeat.parse_heartbeats(['SRV-WEB', 'db01'], seen_at=self.t1)
+        # The lookup query, then one UPDATE of both servers (inside a savepoint in tests).
+        with self.assertNumQueries(4):
+            heartbeat.write_heartbeats(items)
+
+
+@override_settings(ASSET_HEARTBEAT_BUFFERED=False)
+class RecordHeartbeatsViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.web = make_server('SRV-WEB', hostname='web01')
+
+    def post(self, payload):
+        return self.client.post(reverse('record_heartbeats'), json.dumps(payload), content_type='application/json')
+
+    def test_repeats_are_merged(self):
+        response = self.post({'heartbeats': ['SRV-WEB', 'SRV-WEB', {'hostname': 'web01'}],
+                              'seen_at': '2026-03-01T10:00:00+00:00'})
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertEqual((data['accepted'], data['merged_in_batch']), (3, 1))
+        self.web.refresh_from_db()
+        self.assertEqual(self.web.last_seen.isoformat(), '2026-03-01T10:00:00+00:00')
+
+    def test_bad_requests(self):
+        self.assertEqual(self.post({'heartbeats': 'SRV-WEB'}).status_code, 400)
+        self.assertEqual(self.post({'heartbeats': [], 'seen_at': 'yesterday'}).status_code, 400)
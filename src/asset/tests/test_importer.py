@@ -0,0 +1,104 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from asset import capacity
+from asset.importer import import_assets, read_rows
+from asset.lookup import find_assets
+from asset.models import AssetChangeLog, Server
+from asset.tests.helpers import make_server, rollup_totals
+
+NEW_SERVER = {'name': 'New', 'server_type': 'VIRTUAL', 'operating_system': 'UBUNTU', 'server_role': 'DB'}
+
+
+class ImportAssetsTests(TestCase):
+    def test_creates_and_updates(self):
+        existing = make_server('SRV-1', hostname='old01', ram_gb=16, site='Main')
+        result = import_assets(Server, [
+            {'asset_tag': 'SRV-1', 'hostname': 'new01'},
+            {'asset_tag': 'SRV-2', **NEW_SERVER, 'ram_gb': '64', 'site': 'Main'},
+        ])
+        self.assertEqual((result.rows_read, result.rows_written, result.error_count), (2, 2, 0))
+        existing.refresh_from_db()
+        # Columns the row did not provide keep their stored values.
+        self.assertEqual((existing.hostname, existing.ram_gb, existing.name), ('new01', 16, 'Server SRV-1'))
+        self.assertEqual(Server.objects.get(asset_tag='SRV-2').ram_gb, 64)
+
+    def test_refreshes_derived_tables(self):
+        make_server('SRV-1', hostname='old01', ram_gb=16, site='Main')
+        capacity.rebuild_rollups()
+        import_assets(Server, [
+            {'asset_tag': 'SRV-1', 'hostname': 'new01', 'ram_gb': 32},
+            {'asset_tag': 'SRV-2', **NEW_SERVER, 'ram_gb': 8, 'site': 'Main'},
+        ])
+        self.assertEqual(find_assets('old01'), [])
+        self.assertEqual(len(find_assets('new01')), 1)
+        totals = rollup_totals()
+        capacity.rebuild_rollups()
+        self.assertEqual(totals, rollup_totals())
+        self.assertEqual(totals[('site', 'Main')][2], 40)
+
+    def test_invalid_rows_are_reported(self):
+        result = import_assets(Server, [
+            {'asset_tag': 'SRV-1', **NEW_SERVER},
+            {'asset_tag': 'SRV-2', **NEW_SERVER, 'server_type': 'MAINFRAME'},
+            {'asset_tag': 'SRV-3', **NEW_SERVER, 'id': 'x'},
+            ['SRV-4'],
+        ], chunk_size=2)
+        self.assertEqual((result.rows_written, result.error_count), (1, 3))
+        self.assertEqual([(error.row, error.asset_tag) for error in result.errors],
+                         [(2, 'SRV-2'), (3, 'SRV-3'), (4, None)])
+        self.assertIn('server_type', result.errors[0].errors)
+        self.assertEqual(list(Server.objects.values_list('asset_tag', flat=True)), ['SRV-1'])
+
+    def test_later_rows_win(self):
+        import_assets(Server, [
+            {'asset_tag': 'SRV-1', **NEW_SERVER},
+            {'asset_tag': 'SRV-1', **NEW_SERVER, 'name': 'Last'},
+        ])
+        self.assertEqual(Server.objects.get().name, 'Last')
+
+    @override_settings(ASSET_CHANGELOG_BUFFERED=False)
+    def test_change_log(self):
+        make_server('SRV-1', hostname='old01')
+        with self.captureOnCommitCallbacks(execute=True):
+            import_assets(Server, [
+                {'asset_tag': 'SRV-1', 'hostname': 'new01', 'name': 'Server SRV-1'},
+                {'asset_tag': 'SRV-2', **NEW_SERVER},
+            ])
+        entries = {entry.asset_name: entry for entry in AssetChangeLog.objects.filter(notes="Import")}
+        self.assertEqual(entries['New'].change_type, 'Created')
+        self.assertEqual(entries['Server SRV-1'].changed_fields, {'hostname': {'old': 'old01', 'new': 'new01'}})
+
+    def test_read_rows(self):
+        self.assertEqual(list(read_rows(io.StringIO('asset_tag,name\nA,B\n'), 'csv')),
+                         [{'asset_tag': 'A', 'name': 'B'}])
+        self.assertEqual(list(read_rows(io.StringIO('{"a": 1}\n\n{"a": 2}\n'), 'ndjson')), [{'a': 1}, {'a': 2}])
+        self.assertEqual(list(read_rows(io.StringIO('{"a": 1}'), 'json')), [{'a': 1}])
+        with self.assertRaises(ValueError):
+            list(read_rows(io.StringIO(''), 'xml'))
+
+
+class ImportViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('editor'))
+
+    def test_upload(self):
+        upload = SimpleUploadedFile('servers.csv', b'asset_tag,name,server_type,operating_system,server_role\n'
+                                                   b'SRV-1,Web,VIRTUAL,UBUNTU,WEB\nSRV-2,,VIRTUAL,UBUNTU,WEB\n')
+        response = self.client.post(reverse('import_assets', args=['server']), {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual((result['rows_read'], result['rows_written'], result['error_count']), (2, 1, 1))
+        self.assertEqual(result['errors'][0]['row'], 2)
+
+    def test_bad_upload(self):
+        url = reverse('import_assets', args=['server'])
+        self.assertEqual(self.client.post(url).status_code, 400)
+        upload = SimpleUploadedFile('servers.xml', b'<servers/>')
+        self.assertEqual(self.client.post(url, {'file': upload}).status_code, 400)
+        upload = SimpleUploadedFile('servers.json', b'{not json')
+        self.assertEqual(self.client.post(url, {'file': upload}).status_code, 400)
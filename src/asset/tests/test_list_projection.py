@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.models import BaseAsset, NetworkDevice, Server
+from asset.tests.helpers import make_server
+
+
+class ListRowsTests(TestCase):
+    def test_rows_hold_only_the_list_fields(self):
+        server = make_server('SRV-1', hostname='web01', cpu_utilization=42)
+        row = Server.objects.list_rows().get()
+        self.assertEqual(row._fields, Server.LIST_FIELDS)
+        self.assertEqual((row.id, row.hostname, row.cpu_utilization), (server.pk, 'web01', 42))
+
+    def test_fields_override(self):
+        make_server('SRV-1')
+        self.assertEqual(Server.objects.list_rows(['asset_tag']).get()._fields, ('asset_tag',))
+
+    def test_every_list_field_is_a_column(self):
+        for model in (Server, NetworkDevice):
+            names = {field.name for field in model._meta.concrete_fields}
+            self.assertLessEqual(set(model.LIST_FIELDS), names)
+        self.assertIn('created_at', BaseAsset.LIST_FIELDS)
+
+
+class OverviewServersTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('viewer'))
+
+    def test_pages_through_servers(self):
+        for index in range(3):
+            make_server(f'SRV-{index}')
+        response = self.client.get(reverse('overview_servers'), {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['servers']), 2)
+        next_cursor = response.context['next_cursor']
+        self.assertTrue(next_cursor)
+        response = self.client.get(reverse('overview_servers'), {'page_size': 2, 'cursor': next_cursor})
+        self.assertEqual(len(response.context['servers']), 1)
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('overview_servers'), {'cursor': '!!'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse('overview_servers'))
+        self.assertEqual(response.status_code, 302)
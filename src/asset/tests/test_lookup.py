@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.lookup import find_assets, rebuild_lookup
+from asset.models import AssetLookup, NetworkDevice, Server
+from asset.tests.helpers import make_server
+
+
+class FindAssetsTests(TestCase):
+    def setUp(self):
+        self.server = make_server('SRV-1', hostname='Web01', fqdn='web01.corp.internal.',
+                                  primary_ip_address='10.0.0.5', mac_address='AA-BB-CC-00-11-22')
+        self.device = NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER',
+                                                   management_ip='10.0.0.5')
+
+    def test_across_asset_types(self):
+        self.assertEqual(sorted(find_assets('10.0.0.5')), [
+            ('networkdevice', self.device.pk, 'management_ip'),
+            ('server', self.server.pk, 'primary_ip_address'),
+        ])
+
+    def test_normalized_identifiers(self):
+        self.assertEqual(find_assets('aa:bb:cc:00:11:22'), [('server', self.server.pk, 'mac_address')])
+        self.assertEqual(find_assets('WEB01.corp.internal'), [('server', self.server.pk, 'fqdn')])
+        self.assertEqual(find_assets('srv-1'), [('server', self.server.pk, 'asset_tag')])
+
+    def test_kinds(self):
+        self.assertEqual(find_assets('10.0.0.5', kinds=['management_ip']),
+                         [('networkdevice', self.device.pk, 'management_ip')])
+        self.assertEqual(find_assets('web01', kinds=['serial_number']), [])
+
+    def test_follows_saves_and_deletes(self):
+        self.server.hostname = 'web02'
+        self.server.save()
+        self.assertEqual(find_assets('web01'), [])
+        self.assertEqual(find_assets('web02'), [('server', self.server.pk, 'hostname')])
+        self.server.delete()
+        self.assertFalse(AssetLookup.objects.filter(asset_id=self.server.pk).exists())
+
+    def test_rebuild(self):
+        AssetLookup.objects.all().delete()
+        self.assertEqual(rebuild_lookup(Server), 1)
+        self.assertEqual(find_assets('web01'), [('server', self.server.pk, 'hostname')])
+        self.assertEqual(find_assets('NET-1'), [])
+
+
+class AssetLookupViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('viewer'))
+
+    def test_lookup(self):
+        server = make_server('SRV-1', hostname='web01')
+        response = self.client.get(reverse('asset_lookup'), {'q': 'WEB01'})
+        self.assertEqual(response.json(), {'results': [
+            {'asset_type': 'server', 'asset_id': str(server.pk), 'kind': 'hostname'},
+        ]})
+
+    def test_missing_query(self):
+        self.assertEqual(self.client.get(reverse('asset_lookup')).status_code, 400)
@@ -0,0 +1,67 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.lookup import assets_with, split_list
+from asset.models import AssetLookup, NetworkDevice, Server
+from asset.tests.helpers import make_server
+
+
+class SplitListTests(TestCase):
+    def test_members_are_normalized(self):
+        self.assertEqual(split_list('tags', ' PCI, web ,,pci'), ['pci', 'web'])
+        self.assertEqual(split_list('listening_ports', '443, 0080,ssh'), ['443', '80', 'ssh'])
+        self.assertEqual(split_list('dns_servers', '10.0.0.1, 2001:DB8::0:1'), ['10.0.0.1', '2001:db8::1'])
+        self.assertEqual(split_list('tags', None), [])
+
+
+class MembersTests(TestCase):
+    def setUp(self):
+        self.rdp = make_server('SRV-1', listening_ports='22, 3389', tags='Windows,PCI')
+        self.web = make_server('SRV-2', listening_ports='80,443', tags='web')
+        self.switch = NetworkDevice.objects.create(asset_tag='NET-1', name='sw', device_type='SWITCH',
+                                                   connected_vlans='10,20', tags='pci')
+
+    def test_with_members(self):
+        self.assertQuerySetEqual(Server.objects.with_members('listening_ports', '3389'), [self.rdp])
+        self.assertQuerySetEqual(Server.objects.with_members('listening_ports', 443, 22).order_by('asset_tag'),
+                                 [self.rdp, self.web])
+        self.assertQuerySetEqual(Server.objects.with_members('tags', 'pci'), [self.rdp])
+        self.assertQuerySetEqual(NetworkDevice.objects.with_members('connected_vlans', '020'), [self.switch])
+
+    def test_members_are_not_substrings(self):
+        self.assertFalse(Server.objects.with_members('listening_ports', '338').exists())
+
+    def test_assets_with_across_types(self):
+        self.assertEqual(sorted(assets_with('tags', 'PCI')), [
+            ('networkdevice', self.switch.pk, 'pci'),
+            ('server', self.rdp.pk, 'pci'),
+        ])
+
+    def test_not_a_list_field(self):
+        with self.assertRaisesMessage(ValueError, "'hostname' is not a list field"):
+            assets_with('hostname', 'web01')
+
+    def test_saving_reindexes_members(self):
+        self.web.listening_ports = '8080'
+        self.web.save()
+        self.assertEqual(list(AssetLookup.objects.filter(asset_id=self.web.pk, kind='listening_ports')
+                              .values_list('value', flat=True)), ['8080'])
+        self.assertFalse(Server.objects.with_members('listening_ports', 443).exists())
+
+
+class AssetsWithMembersViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-1', listening_ports='3389')
+
+    def test_results(self):
+        response = self.client.get(reverse('assets_with_members'), {'field': 'listening_ports', 'value': '3389'})
+        self.assertEqual(response.json()['results'], [
+            {'asset_type': 'server', 'asset_id': str(self.server.pk), 'value': '3389'},
+        ])
+
+    def test_bad_requests(self):
+        url = reverse('assets_with_members')
+        self.assertEqual(self.client.get(url, {'field': 'hostname', 'value': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'field': 'tags', 'limit': 'all'}).status_code, 400)
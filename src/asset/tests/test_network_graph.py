@@ -0,0 +1,92 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.models import NetworkDevice
+from asset.network_graph import NetworkGraph, get_graph
+
+
+class NetworkGraphTests(TestCase):
+    def setUp(self):
+        self.core, self.a1, self.a2, self.leaf1, self.leaf2, self.edge = (uuid.uuid4() for _ in range(6))
+        self.graph = NetworkGraph([
+            (self.core, 'core', None, None),
+            (self.a1, 'a1', self.core, self.a2),
+            (self.a2, 'a2', self.core, self.a1),
+            (self.leaf1, 'leaf1', self.a1, None),
+            (self.leaf2, 'leaf2', self.a2, None),
+            (self.edge, 'edge', self.leaf1, None),
+        ])
+
+    def test_failover_partner_keeps_dependents_connected(self):
+        self.assertEqual(self.graph.blast_radius([self.a1]), set())
+
+    def test_failing_both_partners(self):
+        self.assertEqual(self.graph.blast_radius([self.a1, self.a2]), {self.leaf1, self.leaf2, self.edge})
+
+    def test_blast_radius(self):
+        self.assertEqual(self.graph.blast_radius([self.core]),
+                         {self.a1, self.a2, self.leaf1, self.leaf2, self.edge})
+        self.assertEqual(self.graph.blast_radius([self.leaf1]), {self.edge})
+        self.assertEqual(self.graph.blast_radius([self.edge]), set())
+
+    def test_single_points_of_failure(self):
+        self.assertEqual(self.graph.single_points_of_failure(), [(self.core, 5), (self.leaf1, 1)])
+
+    def test_uplink_loop_is_disconnected(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        graph = NetworkGraph([(a, 'a', b, None), (b, 'b', a, None)])
+        self.assertEqual(graph.connected, set())
+        self.assertEqual(graph.single_points_of_failure(), [])
+
+
+class GetGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_follows_database_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            core = NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER')
+        self.assertEqual(len(get_graph()), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            leaf = NetworkDevice.objects.create(asset_tag='NET-2', name='leaf', device_type='SWITCH',
+                                                uplink_device=core)
+        self.assertEqual(get_graph().blast_radius([core.pk]), {leaf.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            leaf.delete()
+        self.assertEqual(get_graph().blast_radius([core.pk]), set())
+
+    def test_current_graph_costs_no_query(self):
+        NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER')
+        graph = get_graph()
+        with self.assertNumQueries(0):
+            self.assertIs(get_graph(), graph)
+
+
+class NetworkViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('alice'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.core = NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER')
+            self.leaf = NetworkDevice.objects.create(asset_tag='NET-2', name='leaf', device_type='SWITCH',
+                                                     uplink_device=self.core)
+
+    def test_blast_radius(self):
+        data = self.client.get(reverse('network_blast_radius', args=[self.core.pk])).json()
+        self.assertEqual(data['affected'], [{'id': str(self.leaf.pk), 'name': 'leaf'}])
+        self.assertEqual(data['downstream_count'], 1)
+
+    def test_blast_radius_of_unknown_device(self):
+        self.assertEqual(self.client.get(reverse('network_blast_radius', args=[uuid.uuid4()])).status_code, 404)
+
+    def test_blast_radius_invalid_also(self):
+        url = reverse('network_blast_radius', args=[self.core.pk])
+        self.assertEqual(self.client.get(url, {'also': 'nope'}).status_code, 400)
+
+    def test_single_points_of_failure(self):
+        data = self.client.get(reverse('network_single_points_of_failure')).json()
+        self.assertEqual(data['results'], [{'id': str(self.core.pk), 'name': 'core', 'affected_count': 1}])
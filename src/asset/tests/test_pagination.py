@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from asset.models import Server
+from asset.pagination import (
+    MAX_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor, keyset_page, page_size_from_request,
+)
+from asset.tests.helpers import make_server
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        for index in range(8):
+            make_server(f'SRV-{index}')
+        # Rows sharing a created_at must still be paged without gaps or repeats.
+        tied = list(Server.objects.order_by('asset_tag').values_list('pk', flat=True)[:3])
+        Server.objects.filter(pk__in=tied).update(created_at=timezone.now() - timedelta(days=1))
+
+    def test_pages_cover_every_row_in_order(self):
+        expected = list(Server.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = keyset_page(Server.objects.list_rows(), cursor, page_size=3)
+            seen.extend(row.id for row in page.items)
+            pages += 1
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+    def test_last_page_has_no_cursor(self):
+        page = keyset_page(Server.objects.list_rows(), page_size=8)
+        self.assertEqual(len(page.items), 8)
+        self.assertIsNone(page.next_cursor)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            keyset_page(Server.objects.list_rows(), 'not-a-cursor', page_size=3)
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        server = make_server('SRV-1')
+        self.assertEqual(decode_cursor(encode_cursor(server.created_at, server.pk)),
+                         (server.created_at, server.pk))
+
+    def test_page_size_is_clamped(self):
+        factory = RequestFactory()
+        self.assertEqual(page_size_from_request(factory.get('/', {'page_size': '0'})), 1)
+        self.assertEqual(page_size_from_request(factory.get('/', {'page_size': '1000000'})), MAX_PAGE_SIZE)
+        self.assertEqual(page_size_from_request(factory.get('/', {'page_size': 'x'}), default=7), 7)
@@ -0,0 +1,66 @@
+import csv
+import gzip
+import tempfile
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from asset import partitions
+from asset.models import AssetChangeLog
+
+
+def log_entry(changed_at):
+    return AssetChangeLog.objects.create(asset_type='server', asset_id=uuid.uuid4(), asset_name='web01',
+                                         change_type='Updated', changed_fields={}, changed_at=changed_at)
+
+
+class MonthTests(SimpleTestCase):
+    def test_add_months(self):
+        self.assertEqual(partitions.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(partitions.add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(partitions.month_start(datetime(2026, 5, 31, 23, 59)), date(2026, 5, 1))
+
+    def test_partition_name(self):
+        self.assertEqual(partitions.partition_name(date(2026, 3, 1)), 'asset_assetchangelog_p202603')
+
+
+class PruneChangelogTests(TestCase):
+    def setUp(self):
+        self.archive_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.old = log_entry(datetime(2024, 4, 30, 23, 0, tzinfo=dt_timezone.utc))
+        self.kept = log_entry(datetime(2024, 5, 1, tzinfo=dt_timezone.utc))
+
+    def read_archive(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as fh:
+            return list(csv.DictReader(fh))
+
+    def test_unpartitioned(self):
+        result = partitions.prune_changelog(24, self.archive_dir, today=date(2026, 5, 15))
+        self.assertEqual(result.rows, 1)
+        self.assertEqual(list(AssetChangeLog.objects.values_list('pk', flat=True)), [self.kept.pk])
+        [path] = result.archived
+        self.assertEqual(path.name, 'asset_assetchangelog_before_20240501.csv.gz')
+        self.assertEqual([row['id'] for row in self.read_archive(path)], [str(self.old.pk)])
+
+    def test_nothing_to_prune(self):
+        result = partitions.prune_changelog(36, self.archive_dir, today=date(2026, 5, 15))
+        self.assertEqual((result.archived, result.rows), ([], 0))
+        self.assertEqual(list(self.archive_dir.iterdir()), [])
+
+    def test_partitioned_also_prunes_the_default_partition(self):
+        dropped = self.archive_dir / 'asset_assetchangelog_p202403.csv.gz'
+        monthly = {date(2024, 3, 1): 'asset_assetchangelog_p202403', date(2024, 5, 1): 'asset_assetchangelog_p202405'}
+        with (
+            mock.patch.object(partitions, 'is_partitioned', return_value=True),
+            mock.patch.object(partitions, 'list_partitions', return_value=monthly),
+            mock.patch.object(partitions, 'archive_partition', return_value=(dropped, 7)) as archive,
+        ):
+            result = partitions.prune_changelog(24, self.archive_dir, today=date(2026, 5, 15))
+        archive.assert_called_once_with('asset_assetchangelog_p202403', self.archive_dir, 'default')
+        self.assertEqual(result.rows, 8)
+        self.assertEqual([path.name for path in result.archived],
+                         [dropped.name, 'asset_assetchangelog_default_before_20240501.csv.gz'])
+        self.assertFalse(AssetChangeLog.objects.filter(pk=self.old.pk).exists())
@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.models import Server, StaleAssetError
+from asset.tests.helpers import make_server
+
+
+class SaveChangesTests(TestCase):
+    def setUp(self):
+        self.server = make_server('SRV-1')
+
+    def test_unchanged_asset_writes_nothing(self):
+        self.assertEqual(Server.objects.get(pk=self.server.pk).save_changes(), [])
+
+    def test_writes_only_changed_fields(self):
+        server = Server.objects.get(pk=self.server.pk)
+        server.name = 'Renamed'
+        self.assertEqual(server.save_changes(), ['name'])
+        self.assertEqual(Server.objects.get(pk=self.server.pk).name, 'Renamed')
+
+    def test_concurrent_edit_conflicts(self):
+        first = Server.objects.get(pk=self.server.pk)
+        second = Server.objects.get(pk=self.server.pk)
+        first.name = 'First'
+        first.save_changes()
+        second.name = 'Second'
+        with self.assertRaises(StaleAssetError):
+            second.save_changes()
+        self.assertEqual(Server.objects.get(pk=self.server.pk).name, 'First')
+
+    def test_deleted_asset_conflicts(self):
+        server = Server.objects.get(pk=self.server.pk)
+        Server.objects.filter(pk=self.server.pk).delete()
+        server.name = 'Gone'
+        with self.assertRaises(StaleAssetError):
+            server.save_changes()
+
+
+class ServerFormViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-1', hostname='web01')
+        self.url = reverse('server_update', args=[self.server.pk])
+
+    def form_data(self, version, **changes):
+        return {'asset_tag': 'SRV-1', 'name': 'Server SRV-1', 'server_type': 'PHYSICAL', 'operating_system': 'UBUNTU',
+                'server_role': 'WEB', 'hostname': 'web01', 'status': 'ACTIVE', 'environment': 'PROD',
+                'version': version, **changes}
+
+    def test_form_carries_the_version(self):
+        response = self.client.get(self.url)
+        version = Server.objects.get().updated_at.isoformat()
+        self.assertContains(response, f'<input type="hidden" name="version" value="{version}">', html=True)
+        self.assertContains(response, '<option value="PHYSICAL" selected>Physical Server</option>', html=True)
+
+    def test_current_version_saves(self):
+        version = self.client.get(self.url).context['version']
+        response = self.client.post(self.url, self.form_data(version, hostname='web02'))
+        self.assertRedirects(response, reverse('server_detail', args=[self.server.pk]), fetch_redirect_response=False)
+        self.assertEqual(Server.objects.get().hostname, 'web02')
+
+    def test_stale_version_conflicts(self):
+        version = self.client.get(self.url).context['version']
+        server = Server.objects.get()
+        server.hostname = 'edited-elsewhere'
+        server.save_changes()
+        response = self.client.post(self.url, self.form_data(version, hostname='web02'))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Server.objects.get().hostname, 'edited-elsewhere')
+        # The form comes back with the stored values and their version, ready to retry.
+        self.assertEqual(response.context['server'].hostname, 'edited-elsewhere')
+        self.assertEqual(response.context['version'], Server.objects.get().updated_at.isoformat())
+        self.assertContains(response, 'was changed by someone else', status_code=409)
+
+    def test_invalid_version(self):
+        self.assertEqual(self.client.post(self.url, self.form_data('yesterday')).status_code, 400)
+
+    def test_create_form(self):
+        response = self.client.get(reverse('server_create'))
+        self.assertNotContains(response, 'name="version"')
+        self.assertContains(response, 'New server')
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset import search
+from asset.models import AssetSearchDocument, IoTDevice, Server
+from asset.tests.helpers import make_server
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.db = make_server('SRV-DB', name='Postgres primary', description='Billing database')
+        self.web = make_server('SRV-WEB', name='Web frontend', notes='Talks to the postgres primary')
+        self.bulk = make_server('SRV-BULK', name='Batch runner', installed_services='postgres client')
+
+    def assertRanked(self, query, expected, **kwargs):
+        results, total = search.search(query, **kwargs)
+        self.assertEqual([result.asset_tag for result in results], expected)
+        self.assertEqual(total, len(expected))
+
+    def test_name_outranks_body(self):
+        self.assertRanked('postgres primary', ['SRV-DB', 'SRV-WEB'])
+
+    def test_terms_are_anded(self):
+        self.assertRanked('billing postgres', ['SRV-DB'])
+
+    def test_query_syntax_is_not_injected(self):
+        self.assertRanked('"postgres" OR NEAR(', [])
+        self.assertEqual(search.search('   '), ([], 0))
+
+    def test_paging(self):
+        results, total = search.search('postgres', page=2, page_size=2)
+        self.assertEqual((len(results), total), (1, 3))
+        with self.assertRaises(ValueError):
+            search.search('postgres', page=search.MAX_PAGE + 1)
+
+    def test_asset_types(self):
+        IoTDevice.objects.create(asset_tag='IOT-1', name='Postgres sensor', device_type='SENSOR')
+        self.assertRanked('sensor', [], asset_types=['server'])
+        self.assertRanked('sensor', ['IOT-1'], asset_types=['iotdevice', 'server'])
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.web.notes = 'Static files only'
+        self.web.save()
+        self.assertRanked('postgres primary', ['SRV-DB'])
+        self.db.delete()
+        self.assertRanked('postgres', ['SRV-BULK'])
+        self.assertEqual(AssetSearchDocument.objects.count(), 2)
+
+    def test_fallback_backend(self):
+        with mock.patch.object(search.connection, 'vendor', 'mysql'):
+            self.assertRanked('POSTGRES primary', ['SRV-DB', 'SRV-WEB'])
+
+    def test_rebuild(self):
+        AssetSearchDocument.objects.all().delete()
+        self.assertEqual(search.rebuild_search(Server), 3)
+        self.assertRanked('billing', ['SRV-DB'])
+
+
+class SearchViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-DB', name='Postgres primary')
+
+    def test_results(self):
+        data = self.client.get(reverse('search_assets'), {'q': 'postgres', 'types': 'server'}).json()
+        self.assertEqual((data['total'], data['has_next']), (1, False))
+        self.assertEqual(data['results'][0]['asset_id'], str(self.server.pk))
+
+    def test_bad_requests(self):
+        url = reverse('search_assets')
+        self.assertEqual(self.client.get(url, {'q': 'x', 'types': 'toaster'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'q': 'x', 'page': '0'}).status_code, 400)
@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from asset import capacity
+from asset.models import AssetLookup, AssetSearchDocument, NetworkDevice, Server
+from asset.seeding import build_assets, rebuild_derived, seed_assets
+from asset.tests.helpers import rollup_totals
+
+
+class SeedAssetsTests(TestCase):
+    def test_seeds_in_chunks(self):
+        result = seed_assets(Server, 12, seed=1, batch_size=5, use_copy=False)
+        self.assertEqual(result.rows, 12)
+        self.assertEqual(Server.objects.count(), 12)
+
+    def test_same_seed_builds_the_same_rows(self):
+        now = timezone.now()
+        first = build_assets(Server, 10, 5, 3, now)
+        second = build_assets(Server, 10, 5, 3, now)
+        self.assertEqual([(obj.pk, obj.asset_tag, obj.name) for obj in first],
+                         [(obj.pk, obj.asset_tag, obj.name) for obj in second])
+        self.assertNotEqual([obj.pk for obj in build_assets(Server, 10, 5, 4, now)], [obj.pk for obj in first])
+
+    def test_appends_after_start(self):
+        seed_assets(NetworkDevice, 4, seed=1, use_copy=False)
+        seed_assets(NetworkDevice, 4, seed=1, start=4, use_copy=False)
+        self.assertEqual(NetworkDevice.objects.count(), 8)
+
+    def test_indexes_the_new_rows(self):
+        seed_assets(Server, 7, seed=2, batch_size=3, use_copy=False)
+        self.assertEqual(AssetLookup.objects.filter(asset_type='server', kind='asset_tag').count(), 7)
+        self.assertEqual(AssetSearchDocument.objects.filter(asset_type='server').count(), 7)
+        totals = rollup_totals()
+        capacity.rebuild_rollups()
+        self.assertEqual(totals, rollup_totals())
+
+    def test_without_derived_tables(self):
+        seed_assets(Server, 3, seed=2, use_copy=False, derived=False)
+        self.assertFalse(AssetLookup.objects.exists())
+        rebuild_derived(Server)
+        self.assertEqual(AssetSearchDocument.objects.count(), 3)
+        self.assertTrue(AssetLookup.objects.filter(asset_type='server').exists())
@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset.lookup import assets_in_subnet, ip_key, subnet_bounds
+from asset.models import NetworkDevice, Server
+from asset.tests.helpers import make_server
+
+
+class IpKeyTests(TestCase):
+    def test_order_is_numeric(self):
+        self.assertLess(ip_key('10.0.0.9'), ip_key('10.0.0.10'))
+        self.assertLess(ip_key('9.255.255.255'), ip_key('10.0.0.0'))
+        self.assertIsNone(ip_key('not-an-ip'))
+
+    def test_bounds(self):
+        self.assertEqual(subnet_bounds('10.0.0.7/30'), (ip_key('10.0.0.4'), ip_key('10.0.0.7')))
+        with self.assertRaises(ValueError):
+            subnet_bounds('10.0.0.0/33')
+
+
+class SubnetQueryTests(TestCase):
+    def setUp(self):
+        self.inside = make_server('SRV-1', primary_ip_address='10.1.2.3')
+        self.secondary = make_server('SRV-2', primary_ip_address='192.168.1.1', secondary_ip_address='10.1.200.1')
+        self.outside = make_server('SRV-3', primary_ip_address='10.2.0.1')
+        self.v6 = make_server('SRV-4', primary_ip_address='2001:db8::1')
+        self.device = NetworkDevice.objects.create(asset_tag='NET-1', name='core', device_type='ROUTER',
+                                                   management_ip='10.1.0.1')
+
+    def test_across_types(self):
+        self.assertEqual(assets_in_subnet('10.1.0.0/16'), [
+            ('networkdevice', self.device.pk, 'management_ip', '10.1.0.1'),
+            ('server', self.inside.pk, 'primary_ip_address', '10.1.2.3'),
+            ('server', self.secondary.pk, 'secondary_ip_address', '10.1.200.1'),
+        ])
+
+    def test_fields(self):
+        self.assertEqual([row[1] for row in assets_in_subnet('10.1.0.0/16', ['primary_ip_address'])],
+                         [self.inside.pk])
+
+    def test_ipv6(self):
+        self.assertEqual([row[1] for row in assets_in_subnet('2001:db8::/32')], [self.v6.pk])
+
+    def test_queryset(self):
+        self.assertEqual(set(Server.objects.in_subnet('10.1.0.0/16').values_list('pk', flat=True)),
+                         {self.inside.pk, self.secondary.pk})
+        self.assertFalse(NetworkDevice.objects.in_subnet('10.1.0.0/16', ['primary_ip_address']).exists())
+
+    def test_follows_saves(self):
+        self.outside.primary_ip_address = '10.1.9.9'
+        self.outside.save()
+        self.assertIn(self.outside.pk, Server.objects.in_subnet('10.1.0.0/16').values_list('pk', flat=True))
+
+
+class SubnetViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('viewer'))
+
+    def test_subnet(self):
+        server = make_server('SRV-1', primary_ip_address='10.1.2.3')
+        response = self.client.get(reverse('assets_in_subnet'), {'cidr': '10.1.0.0/16'})
+        self.assertEqual(response.json(), {'results': [
+            {'asset_type': 'server', 'asset_id': str(server.pk), 'field': 'primary_ip_address', 'address': '10.1.2.3'},
+        ]})
+
+    def test_invalid_cidr(self):
+        self.assertEqual(self.client.get(reverse('assets_in_subnet'), {'cidr': '10.1/99'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('assets_in_subnet')).status_code, 400)
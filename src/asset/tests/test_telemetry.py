@@ -0,0 +1,116 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from asset import telemetry
+from asset.models import TelemetryRollup, TelemetrySample
+from asset.tests.helpers import make_server
+
+T0 = datetime(2026, 1, 1, 12, 0, 30, tzinfo=dt_timezone.utc)
+
+
+def reading(server, recorded_at=T0, **metrics):
+    return {'asset_type': 'server', 'asset_id': str(server.pk), 'recorded_at': recorded_at.isoformat(), **metrics}
+
+
+class ParseReadingsTests(TestCase):
+    def setUp(self):
+        self.server = make_server('SRV-1')
+
+    def test_one_sample_per_metric(self):
+        samples, errors = telemetry.parse_readings([reading(self.server, cpu_utilization=40, disk_utilization=10)])
+        self.assertEqual(errors, [])
+        self.assertEqual({(sample.metric, sample.value) for sample in samples},
+                         {('cpu_utilization', 40), ('disk_utilization', 10)})
+        self.assertEqual({sample.recorded_at for sample in samples}, {T0})
+
+    def test_invalid_readings_are_reported_by_index(self):
+        samples, errors = telemetry.parse_readings([
+            reading(self.server, cpu_utilization=40),
+            reading(self.server, cpu_utilization=101),
+            reading(self.server, fan_speed=3),
+            {'asset_type': 'server', 'asset_id': str(uuid.uuid4()), 'cpu_utilization': 1},
+            'nope',
+        ])
+        self.assertEqual(len(samples), 1)
+        self.assertEqual([error['index'] for error in errors], [1, 2, 3, 4])
+
+
+@override_settings(ASSET_TELEMETRY_BUFFERED=False)
+class WriteSamplesTests(TestCase):
+    def setUp(self):
+        self.server = make_server('SRV-1')
+
+    def ingest(self, *readings):
+        samples, errors = telemetry.parse_readings(readings)
+        self.assertEqual(errors, [])
+        telemetry.ingest(samples)
+
+    def test_rollups(self):
+        self.ingest(reading(self.server, cpu_utilization=40), reading(self.server, T0 + timedelta(minutes=1),
+                                                                      cpu_utilization=60))
+        self.assertEqual(TelemetrySample.objects.count(), 2)
+        minutes = telemetry.history('server', self.server.pk, 'cpu_utilization', TelemetryRollup.Resolution.MINUTE)
+        self.assertEqual([(bucket.sample_count, bucket.value_sum) for bucket in minutes], [(1, 40), (1, 60)])
+        hour = telemetry.history('server', self.server.pk, 'cpu_utilization').get()
+        self.assertEqual((hour.sample_count, hour.value_sum, hour.value_min, hour.value_max), (2, 100, 40, 60))
+        self.ingest(reading(self.server, cpu_utilization=20))
+        hour.refresh_from_db()
+        self.assertEqual((hour.sample_count, hour.value_min), (3, 20))
+
+    def test_newest_reading_becomes_current(self):
+        self.ingest(reading(self.server, T0 + timedelta(minutes=1), cpu_utilization=60),
+                    reading(self.server, cpu_utilization=40, disk_utilization=5))
+        self.server.refresh_from_db()
+        self.assertEqual((self.server.cpu_utilization, self.server.disk_utilization), (60, 5))
+        self.assertEqual(self.server.utilization_recorded_at, T0 + timedelta(minutes=1))
+
+    def test_late_batch_does_not_overwrite_newer_values(self):
+        self.ingest(reading(self.server, T0 + timedelta(minutes=5), cpu_utilization=60))
+        self.ingest(reading(self.server, cpu_utilization=40, memory_utilization=30))
+        self.server.refresh_from_db()
+        self.assertEqual((self.server.cpu_utilization, self.server.memory_utilization), (60, None))
+        self.assertEqual(self.server.utilization_recorded_at, T0 + timedelta(minutes=5))
+        # The late readings still count towards the history.
+        self.assertEqual(telemetry.history('server', self.server.pk, 'cpu_utilization').get().sample_count, 2)
+
+    def test_other_assets_in_the_batch_are_written(self):
+        other = make_server('SRV-2')
+        self.ingest(reading(self.server, T0 + timedelta(minutes=5), cpu_utilization=60))
+        self.ingest(reading(self.server, cpu_utilization=40), reading(other, cpu_utilization=40))
+        other.refresh_from_db()
+        self.assertEqual((other.cpu_utilization, other.utilization_recorded_at), (40, T0))
+
+    def test_prune(self):
+        self.ingest(reading(self.server, cpu_utilization=40))
+        deleted = telemetry.prune_telemetry(now=T0 + timedelta(days=31))
+        self.assertEqual(deleted, {'raw': 1, TelemetryRollup.Resolution.MINUTE: 1, TelemetryRollup.Resolution.HOUR: 0})
+        self.assertEqual(TelemetryRollup.objects.count(), 2)
+
+
+@override_settings(ASSET_TELEMETRY_BUFFERED=False)
+class TelemetryViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.server = make_server('SRV-1')
+
+    def test_ingest_and_history(self):
+        response = self.client.post(reverse('ingest_telemetry'), json.dumps({'readings': [
+            reading(self.server, cpu_utilization=40), {'asset_type': 'switch'},
+        ]}), content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((response.json()['accepted'], response.json()['rejected']), (1, 1))
+        url = reverse('telemetry_history', args=['server', self.server.pk])
+        buckets = self.client.get(url, {'resolution': '1m'}).json()['buckets']
+        self.assertEqual([(bucket['count'], bucket['avg']) for bucket in buckets], [(1, 40)])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.post(reverse('ingest_telemetry'), 'nope',
+                                          content_type='application/json').status_code, 400)
+        url = reverse('telemetry_history', args=['server', self.server.pk])
+        self.assertEqual(self.client.get(url, {'metric': 'fan_speed'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, 400)
@@ -0,0 +1,65 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from asset import topology
+from asset.models import Server
+from asset.tests.helpers import make_server
+
+
+class TopologyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = make_server('ROOT', name='root')
+        cls.host = make_server('HOST', name='host', is_virtual=True, hypervisor_host=cls.root)
+        cls.vm_a = make_server('VM-A', name='vm-a', is_virtual=True, hypervisor_host=cls.host)
+        cls.vm_b = make_server('VM-B', name='vm-b', is_virtual=True, hypervisor_host=cls.host)
+        cls.other = make_server('OTHER', name='other')
+
+    def test_host_tree(self):
+        tree = topology.host_tree(self.root.pk)
+        self.assertEqual([(server.pk, server.depth) for server in tree], [
+            (self.root.pk, 0), (self.host.pk, 1), (self.vm_a.pk, 2), (self.vm_b.pk, 2),
+        ])
+
+    def test_host_tree_max_depth(self):
+        self.assertEqual([server.pk for server in topology.host_tree(self.root.pk, max_depth=1)],
+                         [self.root.pk, self.host.pk])
+
+    def test_ancestry(self):
+        self.assertEqual([server.pk for server in topology.ancestry(self.vm_a.pk)],
+                         [self.vm_a.pk, self.host.pk, self.root.pk])
+        self.assertEqual(topology.ancestry(uuid.uuid4()), [])
+
+    def test_root_hosts(self):
+        expected = {self.vm_a.pk: self.root.pk, self.host.pk: self.root.pk, self.other.pk: self.other.pk}
+        self.assertEqual(topology.root_hosts([self.vm_a.pk, self.host.pk, self.other.pk]), expected)
+        queryset = Server.objects.filter(pk__in=[self.vm_a.pk, self.host.pk, self.other.pk])
+        with self.assertNumQueries(1):
+            self.assertEqual(topology.root_hosts(queryset), expected)
+        self.assertEqual(topology.root_hosts([]), {})
+
+    def test_nest(self):
+        tree = topology.nest(topology.host_tree(self.host.pk))
+        self.assertEqual(tree['name'], 'host')
+        self.assertEqual([child['name'] for child in tree['children']], ['vm-a', 'vm-b'])
+        self.assertIsNone(topology.nest([]))
+
+
+class TopologyViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('alice'))
+        self.host = make_server('HOST', name='host')
+        self.vm = make_server('VM', name='vm', is_virtual=True, hypervisor_host=self.host)
+
+    def test_server_topology(self):
+        data = self.client.get(reverse('server_topology', args=[self.vm.pk])).json()
+        self.assertEqual(data['server']['name'], 'vm')
+        self.assertEqual([host['name'] for host in data['ancestry']], ['host'])
+        self.assertEqual(data['root_host'], str(self.host.pk))
+        self.assertEqual(data['tree']['children'], [])
+
+    def test_unknown_server(self):
+        self.assertEqual(self.client.get(reverse('server_topology', args=[uuid.uuid4()])).status_code, 404)
@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+
+class AuthViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='secret')
+
+    def test_login(self):
+        response = self.client.post(reverse('login'), {'username': 'alice', 'password': 'secret'})
+        self.assertRedirects(response, reverse('server_list'), fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
+    def test_login_redirects_to_next(self):
+        response = self.client.post(reverse('login') + '?next=/expiries/', {'username': 'alice', 'password': 'secret'})
+        self.assertRedirects(response, '/expiries/', fetch_redirect_response=False)
+
+    def test_wrong_password(self):
+        response = self.client.post(reverse('login'), {'username': 'alice', 'password': 'nope'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'asset/login.html')
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_logged_in_user_skips_login(self):
+        self.client.force_login(self.user)
+        self.assertRedirects(self.client.get(reverse('login')), reverse('server_list'), fetch_redirect_response=False)
+
+    def test_logout(self):
+        self.client.force_login(self.user)
+        self.assertRedirects(self.client.get(reverse('logout')), reverse('login'), fetch_redirect_response=False)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_anonymous_index_shows_login(self):
+        self.assertTemplateUsed(self.client.get(reverse('index')), 'asset/login.html')
+
+    def test_login_required(self):
+        response = self.client.get(reverse('expiry_radar'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith(reverse('login')))
+
@@ -0,0 +1,110 @@
+"""Hypervisor host / virtual machine topology of servers.
+
+``Server.hypervisor_host`` is a self-reference, so walking it with the ORM
+costs one query per level. The functions here walk it inside the database
+with a recursive CTE instead: a whole host tree, the chain of hosts above a
+VM, or the root host of any number of VMs is one query. Walks stop after
+``MAX_DEPTH`` levels, which also guards against accidental cycles.
+"""
+from django.db import connection
+from django.db.models import QuerySet
+
+from asset.models import Server
+
+MAX_DEPTH = 32
+NODE_FIELDS = ('id', 'name', 'hostname', 'server_type', 'status', 'is_virtual', 'hypervisor_host_id')
+
+_table = Server._meta.db_table
+_pk = Server._meta.pk
+
+
+def _columns(alias):
+    return ', '.join(f'{alias}.{connection.ops.quote_name(name)}' for name in NODE_FIELDS)
+
+
+def _db_id(value):
+    return _pk.get_db_prep_value(_pk.to_python(value), connection)
+
+
+def host_tree(host_id, max_depth=MAX_DEPTH):
+    """Every server running on ``host_id``, recursively, with its ``depth`` below it.
+
+    Returns ``Server`` instances limited to ``NODE_FIELDS``, ordered by depth;
+    the host itself comes first at depth 0.
+    """
+    return list(Server.objects.raw(f"""
+        WITH RECURSIVE tree (id, depth) AS (
+            SELECT id, 0 FROM {_table} WHERE id = %s
+            UNION ALL
+            SELECT s.id, tree.depth + 1 FROM {_table} s JOIN tree ON s.hypervisor_host_id = tree.id
+            WHERE tree.depth < %s
+        )
+        SELECT {_columns('s')}, tree.depth FROM tree JOIN {_table} s ON s.id = tree.id
+        ORDER BY tree.depth, s.name
+    """, [_db_id(host_id), max_depth]))
+
+
+def ancestry(server_id, max_depth=MAX_DEPTH):
+    """The server followed by each host above it, up to the physical root."""
+    return list(Server.objects.raw(f"""
+        WITH RECURSIVE chain (id, parent_id, depth) AS (
+            SELECT id, hypervisor_host_id, 0 FROM {_table} WHERE id = %s
+            UNION ALL
+            SELECT s.id, s.hypervisor_host_id, chain.depth + 1 FROM {_table} s JOIN chain ON s.id = chain.parent_id
+            WHERE chain.depth < %s
+        )
+        SELECT {_columns('s')}, chain.depth FROM chain JOIN {_table} s ON s.id = chain.id
+        ORDER BY chain.depth
+    """, [_db_id(server_id), max_depth]))
+
+
+def root_hosts(servers, max_depth=MAX_DEPTH):
+    """Map each server id to the id of the top-most host it ultimately runs on.
+
+    ``servers`` is a ``Server`` queryset or an iterable of ids; a queryset is
+    inlined as a subquery, so any number of servers is resolved in one query.
+    Servers without a host map to themselves.
+    """
+    if isinstance(servers, QuerySet):
+        subquery, params = servers.order_by().values('pk').query.sql_with_params()
+    else:
+        ids = [_db_id(value) for value in servers]
+        if not ids:
+            return {}
+        subquery, params = ', '.join(['%s'] * len(ids)), ids
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            WITH RECURSIVE chain (start_id, id, parent_id, depth) AS (
+                SELECT id, id, hypervisor_host_id, 0 FROM {_table} WHERE id IN ({subquery})
+                UNION ALL
+                SELECT chain.start_id, s.id, s.hypervisor_host_id, chain.depth + 1
+                FROM {_table} s JOIN chain ON s.id = chain.parent_id
+                WHERE chain.depth < %s
+            )
+            SELECT start_id, id FROM chain WHERE parent_id IS NULL
+        """, [*params, max_depth])
+        return {_pk.to_python(start): _pk.to_python(root) for start, root in cursor.fetchall()}
+
+
+def node(server):
+    return {
+        'id': str(server.pk),
+        'name': server.name,
+        'hostname': server.hostname,
+        'server_type': server.server_type,
+        'status': server.status,
+        'is_virtual': server.is_virtual,
+    }
+
+
+def nest(servers):
+    """Turn the flat result of :func:`host_tree` into nested ``children`` dicts."""
+    if not servers:
+        return None
+    nodes = {server.pk: {**node(server), 'children': []} for server in servers}
+    for server in servers[1:]:
+        parent = nodes.get(server.hypervisor_host_id)
+        if parent is not None:
+            parent['children'].append(nodes[server.pk])
+    return nodes[servers[0].pk]
+
@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.urls import path
 
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", views.index, name="index"),
@@ -28,4 +28,25 @@ urlpatterns = [
     path("servers/<uuid:pk>/", views.server_detail, name="server_detail"),
     path("servers/<uuid:pk>/update/", views.server_update, name="server_update"),
     path("servers/<uuid:pk>/delete/", views.server_delete, name="server_delete"),
+    path("servers/<uuid:pk>/topology/", views.server_topology, name="server_topology"),
+    path("capacity/<str:dimension>/", views.capacity_rollup, name="capacity_rollup"),
+    path("network/single-points-of-failure/", views.network_single_points_of_failure,
+         name="network_single_points_of_failure"),
+    path("network/<uuid:pk>/blast-radius/", views.network_blast_radius, name="network_blast_radius"),
+    path("expiries/", views.expiry_radar, name="expiry_radar"),
+    path("heartbeats/", views.record_heartbeats, name="record_heartbeats"),
+    path("telemetry/", views.ingest_telemetry, name="ingest_telemetry"),
+    path("assets/<str:asset_type>/<uuid:pk>/telemetry/", views.telemetry_history, name="telemetry_history"),
+    path("assets/members/", views.assets_with_members, name="assets_with_members"),
+    path("assets/config/", views.assets_with_config, name="assets_with_config"),
+    path("assets/search/", views.search_assets, name="search_assets"),
+    path("assets/lookup/", views.asset_lookup, name="asset_lookup"),
+    path("assets/subnet/", views.assets_in_subnet, name="assets_in_subnet"),
+    path("assets/<str:asset_type>/export/", views.export_assets, name="export_assets"),
+    path("assets/<str:asset_type>/import/", views.import_assets, name="import_assets"),
+    path("assets/<str:asset_type>/bulk-update/", views.bulk_update_assets, name="bulk_update_assets"),
+    path("assets/<str:asset_type>/bulk-delete/", views.bulk_delete_assets, name="bulk_delete_assets"),
+    path("api/batch/", api.api_batch, name="api_batch"),
+    path("api/<str:resource>/", api.api_list, name="api_list"),
+    path("api/<str:resource>/<str:pk>/", api.api_detail, name="api_detail"),
 ]
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Change counters of the asset tables, kept in the cache.
+
+Data derived from a whole asset table, such as the dashboard aggregates and
+the network graph, is cached under the table's counter, so checking whether
+it is still current costs one cache read instead of a scan of the table. The
+save and delete signals and the bulk, import and seeding paths bump the
+counter of every table they write once their transaction commits.
+
+Heartbeats and telemetry bump a second counter per table, ``READINGS``,
+instead: the columns they write change every few seconds and are not part
+of the dashboard or the network graph.
+
+A write is noticed by every process as long as the cache is shared between
+them (Redis, Memcached or the database cache); with the per-process
+``LocMemCache`` other processes only catch up when their cached data
+expires. A counter that is missing or evicted restarts from the current
+time in nanoseconds, never from a value an older entry may be keyed on.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = 'asset:version:'
+# Counter of the columns in changelog.UNTRACKED_FIELDS.
+READINGS = 'readings'
+
+
+def cache_key(model, counter=None):
+    key = f'{CACHE_PREFIX}{model._meta.model_name}'
+    return f'{key}:{counter}' if counter else key
+
+
+def get_versions(models, counter=None):
+    """``{model: counter}`` for every model in ``models``, with one cache read."""
+    keys = {model: cache_key(model, counter) for model in models}
+    stored = cache.get_many(keys.values())
+    versions = {}
+    for model, key in keys.items():
+        if key not in stored:
+            cache.add(key, time.time_ns(), timeout=None)
+            stored[key] = cache.get(key)
+        versions[model] = stored[key]
+    return versions
+
+
+def get_version(model, counter=None):
+    return get_versions([model], counter)[model]
+
+
+def _increment(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump(model, counter=None):
+    """Advance ``model``'s counter once the current transaction commits."""
+    key = cache_key(model, counter)
+    transaction.on_commit(lambda: _increment(key))
@@ -1,58 +1,89 @@
-from django.http import HttpResponse
-from django.shortcuts import render, get_object_or_404, redirect
+import io
+import json
+import uuid
+
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render, aget_object_or_404, redirect
 from django.contrib import messages
-from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
+from django.contrib.auth import aauthenticate, alogin, alogout
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from asgiref.sync import sync_to_async
 
-from asset.models import Server
-
-
-class AsyncUser:
-    """Wrapper for user data in async templates."""
-    def __init__(self, is_authenticated, username):
-        self.is_authenticated = is_authenticated
-        self.username = username
+from asset import bulk, config, dashboard, expiry, heartbeat, network_graph, search, telemetry, topology
+from asset.api import RESERVED_PARAMS, parse_filters
+from asset.conditional import asset_validators, conditional, list_validators
+from asset.export import EXPORT_FORMATS, aiter_export, export_queryset, parse_fields, resolve_fields
+from asset.importer import IMPORT_FORMATS, format_from_filename, import_assets as run_import, read_rows
+from asset.lookup import afind_assets, members_lookups, subnet_lookups
+from asset.models import ASSET_MODELS, CapacityRollup, Server, StaleAssetError
+from asset.pagination import InvalidCursor, akeyset_page, page_size_from_request
 
 
 async def get_user_context(request):
-    """Helper to get user context for templates in async views."""
-    user_data = await sync_to_async(lambda: (
-        request.user.is_authenticated,
-        getattr(request.user, 'username', '')
-    ))()
-    return {'user': AsyncUser(user_data[0], user_data[1])}
+    """Template context for the logged-in user.
+
+    ``request.auser()`` still loads a session-backed user through
+    ``sync_to_async``, but caches it on the request, so ``login_required``,
+    the ETag validators and the view share that one lookup.
+    """
+    return {'user': await request.auser()}
 
 
 async def index(request):
-    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
-    if not is_authenticated:
+    user = await request.auser()
+    if not user.is_authenticated:
         return render(request, "asset/login.html")
 
-    context = await get_user_context(request)
-    return render(request, "asset/index.html", context)
+    summary = await sync_to_async(dashboard.fleet_summary)()
+    return render(request, "asset/index.html", {
+        'user': user,
+        'summary': summary,
+        'fleet_counts': dashboard.labelled_counts(summary['fleet']),
+    })
+
+
+async def get_page_context(request, queryset):
+    """Fetch one keyset page of ``queryset`` for a list template."""
+    page = await akeyset_page(queryset, request.GET.get('cursor'), page_size_from_request(request))
+    return {'page': page, 'next_cursor': page.next_cursor}
+
+
+async def server_list_validators(request):
+    return await list_validators(request, Server.objects.all())
+
+
+async def server_validators(request, pk):
+    return await asset_validators(request, Server, pk)
+
 
 @login_required
+@conditional(server_list_validators)
 async def overview_servers(request):
-    servers = [server async for server in Server.objects.all()]
+    try:
+        page_context = await get_page_context(request, Server.objects.list_rows())
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor.")
     context = await get_user_context(request)
-    context['servers'] = servers
+    context.update(page_context, servers=page_context['page'].items)
     return render(request, "asset/overview_servers.html", context)
 
 
 # Authentication Views
 async def login_view(request):
-    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
-    if is_authenticated:
+    user = await request.auser()
+    if user.is_authenticated:
         return redirect('server_list')
 
     if request.method == "POST":
         username = request.POST.get('username')
         password = request.POST.get('password')
-        user = await sync_to_async(authenticate)(request, username=username, password=password)
+        user = await aauthenticate(request, username=username, password=password)
 
         if user is not None:
-            await sync_to_async(auth_login)(request, user)
+            await alogin(request, user)
             next_url = request.GET.get('next', 'server_list')
             return redirect(next_url)
         else:
@@ -62,26 +93,43 @@ async def login_view(request):
 
 
 async def logout_view(request):
-    await sync_to_async(auth_logout)(request)
+    await alogout(request)
     messages.success(request, "You have been logged out successfully.")
     return redirect('login')
 
 @login_required
+@conditional(server_list_validators)
 # CRUD Views for Server
 async def server_list(request):
-    servers = [server async for server in Server.objects.all().order_by('-created_at')]
+    try:
+        page_context = await get_page_context(request, Server.objects.list_rows())
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor.")
     context = await get_user_context(request)
-    context['servers'] = servers
+    context.update(page_context, servers=page_context['page'].items)
     return render(request, "asset/server_list.html", context)
 
 
+@conditional(server_validators)
 async def server_detail(request, pk):
-    server = await sync_to_async(get_object_or_404)(Server, pk=pk)
+    server = await aget_object_or_404(Server, pk=pk)
     context = await get_user_context(request)
     context['server'] = server
     return render(request, "asset/server_detail.html", context)
 
 
+# Choice fields of the server form, rendered as selects.
+SERVER_FORM_CHOICES = {
+    name: Server._meta.get_field(name).choices
+    for name in ('server_type', 'operating_system', 'server_role', 'status', 'environment')
+}
+
+
+def render_server_form(request, context, status=200):
+    context['choices'] = SERVER_FORM_CHOICES
+    return render(request, "asset/server_form.html", context, status=status)
+
+
 @login_required
 async def server_create(request):
     context = await get_user_context(request)
@@ -97,7 +145,7 @@ async def server_create(request):
         if not all([asset_tag, name, server_type, operating_system, server_role]):
             messages.error(request, "Please fill in all required fields.")
             context['server'] = None
-            return render(request, "asset/server_form.html", context)
+            return render_server_form(request, context)
 
         # Create server with all available fields from POST
         server = await Server.objects.acreate(
@@ -116,12 +164,12 @@ async def server_create(request):
         return redirect('server_detail', pk=server.pk)
 
     context['server'] = None
-    return render(request, "asset/server_form.html", context)
+    return render_server_form(request, context)
 
 
 @login_required
 async def server_update(request, pk):
-    server = await sync_to_async(get_object_or_404)(Server, pk=pk)
+    server = await aget_object_or_404(Server, pk=pk)
     context = await get_user_context(request)
 
     if request.method == "POST":
@@ -140,24 +188,405 @@ async def server_update(request, pk):
         ip_address = request.POST.get('primary_ip_address')
         server.primary_ip_address = ip_address if ip_address else None
 
-        await sync_to_async(server.save)()
+        # ``version`` is the updated_at the form was rendered with; only changed fields are written.
+        version = None
+        if request.POST.get('version'):
+            try:
+                version = parse_datetime(request.POST['version'])
+            except ValueError:
+                version = None
+            if version is None:
+                return HttpResponseBadRequest("Invalid 'version' timestamp.")
+        try:
+            await server.asave_changes(version)
+        except StaleAssetError:
+            messages.error(request, f"Server '{server.name}' was changed by someone else; review it and try again.")
+            context.update(server=await aget_object_or_404(Server, pk=pk))
+            context['version'] = context['server'].updated_at.isoformat()
+            return render_server_form(request, context, status=409)
         messages.success(request, f"Server '{server.name}' updated successfully.")
         return redirect('server_detail', pk=server.pk)
 
-    context['server'] = server
-    return render(request, "asset/server_form.html", context)
+    context.update(server=server, version=server.updated_at.isoformat())
+    return render_server_form(request, context)
 
 
 @login_required
 async def server_delete(request, pk):
-    server = await sync_to_async(get_object_or_404)(Server, pk=pk)
+    server = await aget_object_or_404(Server, pk=pk)
     context = await get_user_context(request)
 
     if request.method == "POST":
         server_name = server.name
-        await sync_to_async(server.delete)()
+        await server.adelete()
         messages.success(request, f"Server '{server_name}' deleted successfully.")
         return redirect('server_list')
 
     context['server'] = server
     return render(request, "asset/server_confirm_delete.html", context)
+
+
+@login_required
+async def export_assets(request, asset_type):
+    """Stream every asset of one type as CSV or NDJSON."""
+    model = ASSET_MODELS.get(asset_type)
+    if model is None:
+        raise Http404(f"Unknown asset type '{asset_type}'.")
+
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"Unsupported format '{fmt}'.")
+    try:
+        fields = resolve_fields(model, parse_fields(request.GET.get('fields')))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    response = StreamingHttpResponse(
+        aiter_export(export_queryset(model, fields), fmt, fields),
+        content_type=EXPORT_FORMATS[fmt],
+    )
+    filename = f"{asset_type}-{timezone.now():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+@require_POST
+async def import_assets(request, asset_type):
+    """Upsert an uploaded CSV, JSON or NDJSON file of assets keyed on asset_tag."""
+    model = ASSET_MODELS.get(asset_type)
+    if model is None:
+        raise Http404(f"Unknown asset type '{asset_type}'.")
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return HttpResponseBadRequest("No file uploaded.")
+    fmt = request.POST.get('format') or format_from_filename(upload.name)
+    if fmt not in IMPORT_FORMATS:
+        return HttpResponseBadRequest(f"Unsupported format '{fmt}'.")
+
+    def run():
+        with io.TextIOWrapper(upload.file, encoding='utf-8', newline='') as fh:
+            return run_import(model, read_rows(fh, fmt))
+
+    try:
+        result = await sync_to_async(run)()
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse(result.as_dict())
+
+
+def parse_bulk_request(request, asset_type):
+    """``(queryset, payload)`` for a bulk change request; raises ``ValueError`` when invalid."""
+    model = ASSET_MODELS.get(asset_type)
+    if model is None:
+        raise Http404(f"Unknown asset type '{asset_type}'.")
+    payload = json.loads(request.body)
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object.")
+    ids, filters = payload.get('ids'), payload.get('filters') or {}
+    if ids is not None and not isinstance(ids, list) or not isinstance(filters, dict):
+        raise ValueError("'ids' must be a list and 'filters' an object.")
+    if RESERVED_PARAMS & set(filters):
+        raise ValueError(f"Unsupported filter(s): {', '.join(sorted(RESERVED_PARAMS & set(filters)))}")
+    filters = parse_filters(model, {key: str(value) for key, value in filters.items()})
+    if ids is not None:
+        ids = [to_uuid(value) for value in ids]
+    return bulk.select(model, ids, filters), payload
+
+
+def to_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ValueError(f"Invalid id '{value}'.")
+
+
+@login_required
+@require_POST
+async def bulk_update_assets(request, asset_type):
+    """Set status, environment, owner or location fields on many assets at once.
+
+    Body: ``{"ids": [...], "filters": {"site": "DC1"}, "changes": {"status": "RETIRED"}, "dry_run": false}``.
+    """
+    try:
+        queryset, payload = parse_bulk_request(request, asset_type)
+        changes = payload.get('changes')
+        if not isinstance(changes, dict):
+            raise ValueError("'changes' must be an object.")
+        result = await sync_to_async(bulk.bulk_update)(
+            queryset, changes, bool(payload.get('dry_run')), payload.get('notes'),
+        )
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse(result)
+
+
+@login_required
+@require_POST
+async def bulk_delete_assets(request, asset_type):
+    """Delete many assets at once: ``{"ids": [...], "filters": {...}, "dry_run": false}``."""
+    try:
+        queryset, payload = parse_bulk_request(request, asset_type)
+        result = await sync_to_async(bulk.bulk_delete)(queryset, bool(payload.get('dry_run')), payload.get('notes'))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse(result)
+
+
+@login_required
+async def asset_lookup(request):
+    """Find which assets carry an identifier (hostname, IP, MAC, serial, tag) across all types."""
+    value = request.GET.get('q', '').strip()
+    if not value:
+        return HttpResponseBadRequest("Missing 'q' parameter.")
+    kinds = parse_fields(request.GET.get('kinds')) or None
+    matches = await afind_assets(value, kinds)
+    return JsonResponse({'results': [
+        {'asset_type': asset_type, 'asset_id': str(asset_id), 'kind': kind}
+        for asset_type, asset_id, kind in matches
+    ]})
+
+
+@login_required
+async def assets_in_subnet(request):
+    """List the addresses of all asset types that fall inside a CIDR block."""
+    try:
+        lookups = subnet_lookups(request.GET.get('cidr', ''), parse_fields(request.GET.get('fields')) or None)
+        limit = min(int(request.GET.get('limit', 1000)), 10000)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    rows = lookups.order_by('ip_key').values_list('asset_type', 'asset_id', 'kind', 'value')[:limit]
+    return JsonResponse({'results': [
+        {'asset_type': asset_type, 'asset_id': str(asset_id), 'field': kind, 'address': address}
+        async for asset_type, asset_id, kind, address in rows
+    ]})
+
+
+@login_required
+async def assets_with_members(request):
+    """Assets of every type whose list field (``?field=tags``) holds any of the ``?value=`` entries."""
+    try:
+        lookups = members_lookups(request.GET.get('field', ''), request.GET.getlist('value'))
+        limit = min(int(request.GET.get('limit', 1000)), 10000)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    rows = lookups.order_by('asset_type', 'asset_id').values_list('asset_type', 'asset_id', 'value')[:limit]
+    return JsonResponse({'results': [
+        {'asset_type': asset_type, 'asset_id': str(asset_id), 'value': value}
+        async for asset_type, asset_id, value in rows
+    ]})
+
+
+@login_required
+async def assets_with_config(request):
+    """Assets of every type by configuration: ``?match=patch_group=A&has=last_audit&types=server``.
+
+    ``match`` and ``has`` may be repeated; all of them must hold.
+    """
+    pairs = {}
+    for item in request.GET.getlist('match'):
+        key, sep, value = item.partition('=')
+        if not sep or not key:
+            return HttpResponseBadRequest(f"Expected 'match=key=value', got '{item}'.")
+        pairs[key] = value
+    keys = request.GET.getlist('has')
+    if not pairs and not keys:
+        return HttpResponseBadRequest("Give at least one 'match' or 'has' parameter.")
+    asset_types = parse_fields(request.GET.get('types'))
+    unknown = [name for name in asset_types if name not in ASSET_MODELS]
+    if unknown:
+        return HttpResponseBadRequest(f"Unknown asset type(s): {', '.join(unknown)}")
+    try:
+        limit = min(int(request.GET.get('limit', 1000)), 10000)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    matches = await sync_to_async(config.assets_with_config)(pairs, keys, asset_types, limit)
+    return JsonResponse({'results': [
+        {'asset_type': asset_type, 'asset_id': str(asset_id), 'asset_tag': asset_tag}
+        for asset_type, asset_id, asset_tag in matches
+    ]})
+
+
+@login_required
+async def search_assets(request):
+    """Ranked full-text search across asset types: ``?q=&types=server,iotdevice&page=&page_size=``."""
+    asset_types = parse_fields(request.GET.get('types'))
+    unknown = [name for name in asset_types if name not in ASSET_MODELS]
+    if unknown:
+        return HttpResponseBadRequest(f"Unknown asset type(s): {', '.join(unknown)}")
+    page_size = page_size_from_request(request)
+    try:
+        page = int(request.GET.get('page', 1))
+        results, total = await sync_to_async(search.search)(request.GET.get('q', ''), page, page_size, asset_types)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse({
+        'total': total,
+        'page': page,
+        'page_size': page_size,
+        'has_next': page * page_size < total,
+        'results': [
+            {'asset_type': result.asset_type, 'asset_id': str(result.asset_id), 'asset_tag': result.asset_tag,
+             'name': result.name, 'rank': round(result.rank, 4)}
+            for result in results
+        ],
+    })
+
+
+CAPACITY_COLUMNS = ('dimension', 'key', 'server_count', 'total_cores', 'total_ram_gb',
+                    'total_storage_capacity_gb', 'total_storage_used_gb', 'updated_at')
+
+
+@login_required
+async def capacity_rollup(request, dimension):
+    """Capacity totals of one site, cluster or hypervisor host (``?key=``), or the largest ones."""
+    if dimension not in CapacityRollup.Dimension.values:
+        raise Http404(f"Unknown capacity dimension '{dimension}'.")
+    rows = CapacityRollup.objects.filter(dimension=dimension).values(*CAPACITY_COLUMNS)
+    key = request.GET.get('key')
+    if key is not None:
+        row = await rows.filter(key=key).afirst()
+        if row is None:
+            raise Http404(f"No capacity rollup for {dimension} '{key}'.")
+        return JsonResponse(row)
+    try:
+        limit = min(int(request.GET.get('limit', 100)), 1000)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse({'results': [row async for row in rows.order_by('-total_ram_gb', 'key')[:limit]]})
+
+
+@login_required
+async def server_topology(request, pk):
+    """A server's chain of hypervisor hosts and the tree of VMs running on it, as JSON."""
+    chain = await sync_to_async(topology.ancestry)(pk)
+    if not chain:
+        raise Http404("No Server matches the given query.")
+    tree = await sync_to_async(topology.host_tree)(pk)
+    return JsonResponse({
+        'server': topology.node(chain[0]),
+        'ancestry': [topology.node(host) for host in chain[1:]],
+        'root_host': str(chain[-1].pk),
+        'tree': topology.nest(tree),
+    })
+
+
+def _device_list(graph, device_ids):
+    return [{'id': str(pk), 'name': graph.names[pk]} for pk in sorted(device_ids, key=str)]
+
+
+@login_required
+async def network_blast_radius(request, pk):
+    """Network devices that lose connectivity if this device (and any ``?also=`` ids) fails."""
+    graph = await sync_to_async(network_graph.get_graph)()
+    if pk not in graph.names:
+        raise Http404("No NetworkDevice matches the given query.")
+    try:
+        failed = {pk, *(uuid.UUID(value) for value in parse_fields(request.GET.get('also')))}
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    affected = graph.blast_radius(failed)
+    return JsonResponse({
+        'failed': _device_list(graph, failed & graph.names.keys()),
+        'affected_count': len(affected),
+        'affected': _device_list(graph, affected),
+        'downstream_count': len(graph.downstream(pk)),
+    })
+
+
+@login_required
+async def network_single_points_of_failure(request):
+    """Network devices whose failure alone disconnects other devices, worst first."""
+    graph = await sync_to_async(network_graph.get_graph)()
+    spofs = await sync_to_async(graph.single_points_of_failure)()
+    return JsonResponse({'results': [
+        {'id': str(pk), 'name': graph.names[pk], 'affected_count': count} for pk, count in spofs
+    ]})
+
+
+@login_required
+@require_POST
+async def ingest_telemetry(request):
+    """Accept a batch of utilization readings; they are written in bulk in the background."""
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest("Request body must be JSON.")
+    readings = payload.get('readings') if isinstance(payload, dict) else payload
+    if not isinstance(readings, list):
+        return HttpResponseBadRequest("Expected a list of readings.")
+    samples, errors = await sync_to_async(telemetry.parse_readings)(readings)
+    await sync_to_async(telemetry.ingest)(samples)
+    return JsonResponse({'accepted': len(samples), 'rejected': len(errors), 'errors': errors[:100]}, status=202)
+
+
+@login_required
+async def telemetry_history(request, asset_type, pk):
+    """Downsampled utilization of one asset: ``?metric=&resolution=1m|1h|1d&since=&until=``."""
+    metrics = telemetry.TELEMETRY_FIELDS.get(asset_type)
+    if metrics is None:
+        raise Http404(f"No telemetry for asset type '{asset_type}'.")
+    metric = request.GET.get('metric', metrics[0])
+    resolution = request.GET.get('resolution', telemetry.Resolution.HOUR)
+    if metric not in metrics or resolution not in telemetry.Resolution.values:
+        return HttpResponseBadRequest("Unsupported metric or resolution.")
+    bounds = {}
+    for name in ('since', 'until'):
+        if request.GET.get(name):
+            try:
+                bounds[name] = parse_datetime(request.GET[name])
+            except ValueError:
+                bounds[name] = None
+            if bounds[name] is None:
+                return HttpResponseBadRequest(f"Invalid '{name}' timestamp.")
+    buckets = telemetry.history(asset_type, pk, metric, resolution, **bounds)
+    return JsonResponse({'metric': metric, 'resolution': resolution, 'buckets': [
+        {'start': bucket.bucket_start, 'count': bucket.sample_count, 'avg': round(bucket.value_avg, 2),
+         'min': bucket.value_min, 'max': bucket.value_max}
+        async for bucket in buckets
+    ]})
+
+
+@login_required
+@require_POST
+async def record_heartbeats(request):
+    """Accept a batch of scanner heartbeats: ``{"heartbeats": [...], "seen_at": ..., "scanned": bool}``."""
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest("Request body must be JSON.")
+    if isinstance(payload, list):
+        payload = {'heartbeats': payload}
+    if not isinstance(payload, dict) or not isinstance(payload.get('heartbeats'), list):
+        return HttpResponseBadRequest("Expected a list of heartbeats.")
+    seen_at = None
+    if payload.get('seen_at'):
+        try:
+            seen_at = parse_datetime(str(payload['seen_at']))
+        except ValueError:
+            seen_at = None
+        if seen_at is None:
+            return HttpResponseBadRequest("Invalid 'seen_at' timestamp.")
+    items, errors = heartbeat.parse_heartbeats(payload['heartbeats'], seen_at, bool(payload.get('scanned')))
+    await sync_to_async(heartbeat.record)(items)
+    return JsonResponse({
+        'accepted': len(items),
+        'rejected': len(errors),
+        'errors': errors[:100],
+        'merged_in_batch': len(items) - len({item[:2] for item in items}),
+        'totals': heartbeat.stats(),
+    }, status=202)
+
+
+@login_required
+async def expiry_radar(request):
+    """Lifecycle dates expiring in the next ``?days=`` days (30 by default), soonest first."""
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 0), 365)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    items = await sync_to_async(expiry.expiries)(days)
+    context = await get_user_context(request)
+    context.update(days=days, expiries=items)
+    return render(request, "asset/expiry.html", context)
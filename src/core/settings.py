@@ -49,6 +49,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'asset.middleware.change_context_middleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -77,6 +78,29 @@ LOGIN_URL = 'login'
 #LOGIN_REDIRECT_URL = 'asset_inventory:dashboard'
 LOGOUT_REDIRECT_URL = 'login'
 
+# Asset change log: entries are buffered and written in bulk off the request path
+ASSET_CHANGELOG_BUFFERED = True
+ASSET_CHANGELOG_BATCH_SIZE = 500
+ASSET_CHANGELOG_FLUSH_INTERVAL = 1.0  # seconds
+ASSET_CHANGELOG_RETENTION_MONTHS = 24
+ASSET_CHANGELOG_ARCHIVE_DIR = BASE_DIR / 'archive' / 'changelog'
+ASSET_CHANGELOG_PARTITION_MONTHS_AHEAD = 3
+
+# Utilization telemetry (asset.telemetry)
+ASSET_TELEMETRY_BUFFERED = True
+ASSET_TELEMETRY_BATCH_SIZE = 5000
+ASSET_TELEMETRY_FLUSH_INTERVAL = 5.0  # seconds
+ASSET_TELEMETRY_RETENTION_DAYS = {'raw': 7, '1m': 30, '1h': 400}  # daily rollups are kept
+
+# Scanner heartbeats (asset.heartbeat): last_seen/last_scanned are written once per window
+ASSET_HEARTBEAT_BUFFERED = True
+ASSET_HEARTBEAT_BATCH_SIZE = 50000  # distinct identifiers
+ASSET_HEARTBEAT_FLUSH_INTERVAL = 5.0  # seconds
+
+# Expiry radar (asset.expiry): `manage.py expiry_snapshot --email` is meant to run daily
+ASSET_EXPIRY_WINDOW_DAYS = 90
+ASSET_EXPIRY_ALERT_RECIPIENTS = []
+
 # Email Backend (for password reset)
 # For development - emails print to console
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'